@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""이벤트 루프 기반 애니메이션 스케줄러
+
+time.sleep 으로 멈추지 않고 Tk 의 root.after 나 turtle 의 screen.ontimer 로
+다음 프레임을 예약한다. 진행률은 실제 경과 시간으로 계산하므로, 컴퓨터가
+느리면 중간 프레임을 건너뛰고 전체 길이는 그대로 유지된다.
+"""
+
+import math
+import time
+
+import instrumentation
+
+DEFAULT_FPS = 60
+
+
+def tk_scheduler(root):
+    """Tk 위젯의 after 를 스케줄러 형식 (지연 ms, 콜백) 으로 감싸기"""
+    return lambda ms, callback: root.after(ms, callback)
+
+
+def turtle_scheduler(screen):
+    """turtle 화면의 ontimer 를 스케줄러 형식 (지연 ms, 콜백) 으로 감싸기"""
+    return lambda ms, callback: screen.ontimer(callback, ms)
+
+
+class FrameScheduler:
+    """경과 시간에 따라 on_frame(진행률 0~1) 을 호출하는 애니메이션 타이머
+
+    schedule(ms, callback) 으로 다음 프레임을 예약한다. 일시정지, 탐색(seek),
+    재생 속도 변경을 지원한다.
+    """
+
+    def __init__(self, schedule, duration, on_frame, on_finish=None, fps=DEFAULT_FPS,
+                 clock=time.perf_counter):
+        self.schedule = schedule
+        self.duration = max(float(duration), 1e-6)
+        self.on_frame = on_frame
+        self.on_finish = on_finish
+        self.frame_interval = 1.0 / fps
+        self.clock = clock
+        self.speed = 1.0
+
+        # 재생 위치 = _base + (현재 시각 - _started_at) * speed
+        self._base = 0.0
+        self._started_at = None
+        self._running = False
+        self._finished = False
+        self._generation = 0  # stop/seek 후 남은 예약 콜백을 무시하기 위한 번호
+        self.frames = 0
+
+    @property
+    def position(self):
+        """현재 재생 위치 (초)"""
+        if self._started_at is None:
+            return self._base
+        elapsed = (self.clock() - self._started_at) * self.speed
+        return min(self.duration, self._base + elapsed)
+
+    @property
+    def progress(self):
+        return self.position / self.duration
+
+    @property
+    def paused(self):
+        return not self._running and not self._finished
+
+    @property
+    def finished(self):
+        return self._finished
+
+    def start(self):
+        self._base = 0.0
+        self._finished = False
+        self.resume()
+
+    def resume(self):
+        if self._running or self._finished:
+            return
+        self._running = True
+        self._started_at = self.clock()
+        self._generation += 1
+        self._tick(self._generation)
+
+    def pause(self):
+        if not self._running:
+            return
+        self._base = self.position
+        self._started_at = None
+        self._running = False
+        self._generation += 1
+
+    def toggle_pause(self):
+        if self._running:
+            self.pause()
+        else:
+            self.resume()
+
+    def stop(self):
+        """예약된 프레임을 모두 취소 (on_finish 는 호출하지 않음)"""
+        self.pause()
+        self._finished = True
+
+    def seek(self, position):
+        """재생 위치를 position 초로 옮기고 바로 그 프레임을 그림"""
+        position = min(max(0.0, position), self.duration)
+        self._base = position
+        if self._running:
+            self._started_at = self.clock()
+        self._finished = False
+        if position >= self.duration or not self._running:
+            self._render(position)
+            if position >= self.duration:
+                self._finish()
+
+    def seek_by(self, seconds):
+        self.seek(self.position + seconds)
+
+    def set_speed(self, speed):
+        """재생 속도 배율 변경 (현재 위치는 유지)"""
+        if self._started_at is not None:
+            self._base = self.position
+            self._started_at = self.clock()
+        self.speed = max(0.05, float(speed))
+
+    def _render(self, position):
+        self.frames += 1
+        instrumentation.count("frames")
+        with instrumentation.span("frame"):
+            self.on_frame(position / self.duration)
+
+    def _finish(self):
+        self._base = self.duration
+        self._started_at = None
+        self._running = False
+        self._finished = True
+        self._generation += 1
+        if self.on_finish:
+            self.on_finish()
+
+    def _tick(self, generation):
+        if generation != self._generation:
+            return
+        tick_started = self.clock()
+        position = self.position
+        self._render(position)
+        if position >= self.duration:
+            self._finish()
+            return
+        # 그리는 데 걸린 시간만큼 다음 예약을 당겨서 목표 FPS 를 유지
+        spent = self.clock() - tick_started
+        delay_ms = max(1, int(math.ceil((self.frame_interval - spent) * 1000)))
+        self.schedule(delay_ms, lambda: self._tick(generation))
+
+
+class TurtleReveal:
+    """폴리라인 목록을 진행률에 맞춰 turtle 로 조금씩 그리기
+
+    polylines 는 획마다 점 목록이다. 앞으로 진행할 때는 새로 드러난 부분만
+    그리고, 뒤로 탐색하면 지우고 다시 그린다.
+    """
+
+    def __init__(self, pen, polylines, on_stroke=None):
+        self.pen = pen
+        self.polylines = polylines
+        self.on_stroke = on_stroke
+        self._reset()
+
+    def _reset(self):
+        self.pen.clear()
+        self.pen.penup()
+        self._stroke = 0  # 그리는 중인 획 번호
+        self._position = 0.0  # 그 획 안에서의 위치 (점 번호 단위)
+        self._current = -1  # on_stroke 로 알린 마지막 획 번호
+
+    def show(self, progress):
+        """전체 진행률(0~1)까지 그리기"""
+        count = len(self.polylines)
+        if count == 0:
+            return
+        target = min(max(progress, 0.0), 1.0) * count
+        stroke = min(int(target), count - 1)
+        points = self.polylines[stroke]
+        position = (target - stroke) * (len(points) - 1) if target < count else len(points) - 1
+
+        if (stroke, position) < (self._stroke, self._position):
+            self._reset()
+        while self._stroke < stroke:
+            self._draw_to(self._stroke, len(self.polylines[self._stroke]) - 1)
+            self._stroke += 1
+            self._position = 0.0
+            self.pen.penup()
+        self._draw_to(stroke, position)
+
+    def _draw_to(self, stroke, position):
+        points = self.polylines[stroke]
+        if stroke != self._current:
+            self._current = stroke
+            if self.on_stroke:
+                self.on_stroke(stroke)
+        if not self.pen.isdown():
+            self.pen.goto(points[0])
+            self.pen.pendown()
+
+        end = int(position)
+        start = int(self._position) + 1
+        instrumentation.count("turtle_segments", max(0, end + 1 - start))
+        for i in range(start, end + 1):
+            self.pen.goto(points[i])
+        # 점 사이의 남은 부분은 보간해서 그리기
+        if end < len(points) - 1 and position > end:
+            frac = position - end
+            (x0, y0), (x1, y1) = points[end], points[end + 1]
+            self.pen.goto(x0 + (x1 - x0) * frac, y0 + (y1 - y0) * frac)
+        self._position = position
+
+
+class TurtleFillReveal:
+    """획 외곽선(StrokeOutline) 목록을 진행률에 맞춰 채운 다각형으로 그리기
+
+    다 그린 획은 done_pen 으로 한 번만 채우고, 그리는 중인 획은 프레임마다
+    active_pen 을 지우고 미리 계산한 외곽선의 앞부분을 다시 채운다.
+    """
+
+    def __init__(self, done_pen, active_pen, outlines, on_stroke=None):
+        self.done_pen = done_pen
+        self.active_pen = active_pen
+        self.outlines = outlines
+        self.on_stroke = on_stroke
+        self._reset()
+
+    def _reset(self):
+        self.done_pen.clear()
+        self.active_pen.clear()
+        self._done = 0  # done_pen 으로 채운 획 수
+        self._current = -1
+
+    @staticmethod
+    def _fill(pen, polygon):
+        if len(polygon) < 3:
+            return
+        instrumentation.count("turtle_fills")
+        instrumentation.count("turtle_segments", len(polygon))
+        pen.penup()
+        pen.goto(polygon[0])
+        pen.begin_fill()
+        for point in polygon[1:]:
+            pen.goto(point)
+        pen.end_fill()
+
+    def show(self, progress):
+        """전체 진행률(0~1)까지 그리기"""
+        count = len(self.outlines)
+        if count == 0:
+            return
+        target = min(max(progress, 0.0), 1.0) * count
+        stroke = min(int(target), count - 1)
+        finished = int(target) if target < count else count
+
+        if finished < self._done:
+            self._reset()
+        while self._done < finished:
+            self._fill(self.done_pen, self.outlines[self._done].polygon().tolist())
+            self._done += 1
+
+        if stroke != self._current:
+            self._current = stroke
+            if self.on_stroke:
+                self.on_stroke(stroke)
+        self.active_pen.clear()
+        if finished < count:
+            outline = self.outlines[stroke]
+            visible = 1 + int(round((target - stroke) * (len(outline) - 1)))
+            self._fill(self.active_pen, outline.polygon(visible).tolist())
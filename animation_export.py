@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""획순 애니메이션을 SVG 와 스프라이트 시트로 내보내기
+
+한 글자마다 두 파일을 만든다.
+- <한자>.<해시>.svg: 획마다 stroke-dasharray/stroke-dashoffset 을 CSS 애니메이션으로
+  줄여 가며 그리는 독립 SVG (외부 파일이나 스크립트 없음)
+- <한자>.<해시>.png: 획순 프레임을 격자로 모은 스프라이트 시트 (headless_renderer)
+
+해시는 획 데이터와 내보내기 설정으로 만든다. 출력 디렉터리의 manifest.json 에
+글자별 해시와 파일 이름, 스프라이트 배치를 기록해 두고, 해시가 같으면 다시
+만들지 않는다.
+
+사용 예:
+    python animation_export.py hanja_strokes.json data/all_strokes.json -o build/animations
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from xml.sax.saxutils import escape, quoteattr
+
+# 출력 형식이 바뀌면 올려서 기존 결과를 모두 다시 만든다
+EXPORT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+DEFAULT_STROKE_DURATION = 0.8
+DEFAULT_STROKE_GAP = 0.2
+# 반복 재생할 때 완성된 모습을 보여 주는 시간 (초)
+DEFAULT_HOLD = 1.5
+
+
+def _grid_markup():
+    lines = []
+    for i in range(11):
+        pos = i * 10
+        lines.append(f'<line x1="{pos}" y1="0" x2="{pos}" y2="100"/>')
+        lines.append(f'<line x1="0" y1="{pos}" x2="100" y2="{pos}"/>')
+    return ('<g stroke="#E0E0E0" stroke-width="0.3">' + "".join(lines) + "</g>"
+            '<g stroke="#C0C0C0" stroke-width="0.5">'
+            '<line x1="50" y1="0" x2="50" y2="100"/><line x1="0" y1="50" x2="100" y2="50"/></g>')
+
+
+def animated_svg(strokes, size=256, stroke_duration=DEFAULT_STROKE_DURATION,
+                 gap=DEFAULT_STROKE_GAP, color="black", grid=True, loop=True, hold=DEFAULT_HOLD,
+                 title=None):
+    """획 목록({"path", "strokeWidth", "strokeLinecap"})으로 애니메이션 SVG 문자열 만들기
+
+    각 획은 pathLength="1" 로 길이를 맞춰 stroke-dasharray 1, stroke-dashoffset 1 에서
+    0 으로 줄어들며 나타난다. loop 가 참이면 완성 모습을 hold 초 보여 준 뒤 반복한다.
+    """
+    count = len(strokes)
+    step = stroke_duration + gap
+    cycle = count * step + hold
+    styles = [".s{fill:none;stroke-dasharray:1;stroke-dashoffset:1}"]
+    paths = []
+    for i, stroke in enumerate(strokes):
+        start = i * step
+        if loop:
+            # 한 주기 안에서 이 획이 그려지는 구간만 움직이는 키프레임
+            begin = start / cycle * 100
+            end = (start + stroke_duration) / cycle * 100
+            styles.append(f"@keyframes k{i}{{0%,{begin:.3f}%{{stroke-dashoffset:1}}"
+                          f"{end:.3f}%,100%{{stroke-dashoffset:0}}}}")
+            styles.append(f".s{i}{{animation:k{i} {cycle:.3f}s linear infinite}}")
+        else:
+            styles.append(f".s{i}{{animation:d {stroke_duration:.3f}s linear {start:.3f}s forwards}}")
+        width = float(stroke.get("strokeWidth", 2.5))
+        linecap = stroke.get("strokeLinecap", "round")
+        desc = f"<title>{escape(stroke['desc'])}</title>" if stroke.get("desc") else ""
+        paths.append(f'<path class="s s{i}" d={quoteattr(stroke["path"])} pathLength="1" '
+                     f'stroke-width="{width:g}" stroke-linecap={quoteattr(linecap)} '
+                     f'stroke-linejoin="round">{desc}</path>')
+    if not loop:
+        styles.append("@keyframes d{to{stroke-dashoffset:0}}")
+
+    return "".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100" width="{size}" height="{size}">',
+        f"<title>{escape(title)}</title>" if title else "",
+        "<style>", "".join(styles), "</style>",
+        '<rect width="100" height="100" fill="white"/>',
+        _grid_markup() if grid else "",
+        f'<g stroke={quoteattr(color)}>', "".join(paths), "</g>",
+        "</svg>\n",
+    ])
+
+
+def frame_svg(strokes, count=None, size=256, color="black", highlight="#D03030", grid=True,
+              title=None):
+    """획순 프레임 한 장의 정적 SVG (count 번째 획까지, 마지막 획은 강조색)
+
+    count 가 None 이면 모든 획을 color 로 그린 완성 모습.
+    """
+    shown = strokes if count is None else strokes[:count]
+    paths = []
+    for i, stroke in enumerate(shown):
+        stroke_color = highlight if count is not None and i == len(shown) - 1 else color
+        width = float(stroke.get("strokeWidth", 2.5))
+        linecap = stroke.get("strokeLinecap", "round")
+        paths.append(f'<path d={quoteattr(stroke["path"])} stroke={quoteattr(stroke_color)} '
+                     f'stroke-width="{width:g}" stroke-linecap={quoteattr(linecap)} '
+                     f'stroke-linejoin="round"/>')
+    return "".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100" width="{size}" height="{size}">',
+        f"<title>{escape(title)}</title>" if title else "",
+        '<rect width="100" height="100" fill="white"/>',
+        _grid_markup() if grid else "",
+        '<g fill="none">', "".join(paths), "</g>",
+        "</svg>\n",
+    ])
+
+
+def sprite_layout(count):
+    """프레임 count 개를 담는 거의 정사각형인 격자의 열 수"""
+    return max(1, math.ceil(math.sqrt(count)))
+
+
+def content_hash(character, strokes, options):
+    """획 데이터와 설정으로 만든 짧은 해시 (같으면 다시 만들 필요 없음)"""
+    payload = json.dumps({"version": EXPORT_VERSION, "character": character,
+                          "strokes": strokes, "options": options},
+                         ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class AnimationExporter:
+    """글자별 SVG/스프라이트를 만들고 manifest.json 으로 바뀐 글자만 다시 만듦"""
+
+    def __init__(self, output_dir, size=256, sprite=True, stroke_duration=DEFAULT_STROKE_DURATION,
+                 gap=DEFAULT_STROKE_GAP, loop=True, grid=True):
+        self.output_dir = output_dir
+        self.size = size
+        self.sprite = sprite
+        self.options = {"size": size, "sprite": sprite, "stroke_duration": stroke_duration,
+                        "gap": gap, "loop": loop, "grid": grid}
+        self._renderer = None
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f).get("characters", {})
+
+    @property
+    def renderer(self):
+        # PIL 은 스프라이트를 실제로 만들 때만 가져온다
+        if self._renderer is None:
+            from headless_renderer import HeadlessRenderer
+            self._renderer = HeadlessRenderer(size=self.size, grid=self.options["grid"])
+        return self._renderer
+
+    def _up_to_date(self, entry, digest):
+        if not entry or entry.get("hash") != digest:
+            return False
+        files = [entry["svg"]] + ([entry["sprite"]["file"]] if entry.get("sprite") else [])
+        return all(os.path.exists(os.path.join(self.output_dir, name)) for name in files)
+
+    def _remove_old(self, entry):
+        if not entry:
+            return
+        names = [entry.get("svg")] + ([entry["sprite"]["file"]] if entry.get("sprite") else [])
+        for name in names:
+            if name and os.path.exists(os.path.join(self.output_dir, name)):
+                os.remove(os.path.join(self.output_dir, name))
+
+    def export(self, character, strokes, force=False):
+        """한 글자 내보내기. 새로 만들었으면 True, 해시가 같아 건너뛰었으면 False"""
+        digest = content_hash(character, strokes, self.options)
+        entry = self.manifest.get(character)
+        if not force and self._up_to_date(entry, digest):
+            return False
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._remove_old(entry)
+        svg_name = f"{character}.{digest}.svg"
+        svg = animated_svg(strokes, self.size, self.options["stroke_duration"], self.options["gap"],
+                           loop=self.options["loop"], grid=self.options["grid"], title=character)
+        with open(os.path.join(self.output_dir, svg_name), "w", encoding="utf-8") as f:
+            f.write(svg)
+        entry = {"hash": digest, "svg": svg_name, "strokes": len(strokes)}
+
+        if self.sprite and strokes:
+            columns = sprite_layout(len(strokes))
+            sprite_name = f"{character}.{digest}.png"
+            self.renderer.render_strip(strokes, columns).save(
+                os.path.join(self.output_dir, sprite_name), optimize=True)
+            # 프레임 i 의 위치: ((i % columns) * frame, (i // columns) * frame)
+            entry["sprite"] = {"file": sprite_name, "frame": self.size, "columns": columns,
+                               "frames": len(strokes)}
+        self.manifest[character] = entry
+        return True
+
+    def save_manifest(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_file = self.manifest_path + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"version": EXPORT_VERSION, "options": self.options,
+                       "characters": dict(sorted(self.manifest.items()))},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.manifest_path)
+
+
+def main():
+    from headless_renderer import load_stroke_records
+
+    parser = argparse.ArgumentParser(description="획순 애니메이션 SVG / 스프라이트 시트 내보내기")
+    parser.add_argument("sources", nargs="+",
+                        help="획 데이터 파일 또는 디렉터리 (앞에 있는 소스의 글자가 우선)")
+    parser.add_argument("--output", "-o", default="build/animations", help="출력 디렉터리")
+    parser.add_argument("--size", type=int, default=256, help="SVG 표시 크기 / 스프라이트 프레임 크기")
+    parser.add_argument("--stroke-time", type=float, default=DEFAULT_STROKE_DURATION,
+                        help="획 하나를 그리는 시간 (초)")
+    parser.add_argument("--no-loop", action="store_true", help="한 번만 재생")
+    parser.add_argument("--no-grid", action="store_true", help="그리드 없이")
+    parser.add_argument("--no-sprite", action="store_true", help="SVG 만 만들기")
+    parser.add_argument("--force", action="store_true", help="해시가 같아도 다시 만들기")
+    args = parser.parse_args()
+
+    exporter = AnimationExporter(args.output, args.size, not args.no_sprite, args.stroke_time,
+                                 loop=not args.no_loop, grid=not args.no_grid)
+    seen = set()
+    written = skipped = 0
+    start = time.perf_counter()
+    for source in args.sources:
+        for character, strokes in load_stroke_records(source):
+            if character in seen:
+                continue
+            seen.add(character)
+            if exporter.export(character, strokes, args.force):
+                written += 1
+            else:
+                skipped += 1
+    exporter.save_manifest()
+    print(f"완료: {written}자 생성, {skipped}자 변경 없음 ({time.perf_counter() - start:.2f}초)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""드로어들이 함께 쓰는 정적 배경 (그리드, 중심선, 테두리) 이미지
+
+배경은 (크기, 색, 배치) 마다 한 번만 그려 메모리에 두고, turtle 처럼 파일이
+필요한 드로어를 위해 .cache/backgrounds/ 에 PNG 로도 저장한다. 드로어는 글자를
+바꿀 때 배경은 그대로 두고 획만 지운다.
+
+배치:
+- full: 캔버스 전체에 divisions 칸 그리드와 중심선 (HanjaDrawer, headless_renderer)
+- box: 가운데 box 픽셀 정사각형 안에 divisions 칸 그리드와 테두리 (turtle 드로어)
+- plain: 배경색만
+"""
+
+import hashlib
+import io
+import os
+from collections import namedtuple
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "backgrounds")
+
+Theme = namedtuple("Theme", ["background", "grid", "center", "border"])
+
+THEMES = {
+    "light": Theme("white", "#E0E0E0", "#C0C0C0", "gray"),
+    "dark": Theme("black", "#404040", "#606060", "gray"),
+}
+
+# 배경 하나의 모양을 정하는 값 (캐시 키)
+#   width, height: 픽셀 크기, layout: "full", "box", "plain", divisions: 그리드 칸 수 (0 이면 그리드 없음)
+#   box: box 배치의 정사각형 한 변 (픽셀), line: 선 굵기 배율, 나머지는 색
+BackgroundSpec = namedtuple("BackgroundSpec",
+                            ["width", "height", "layout", "divisions", "box", "line",
+                             "background", "grid", "center", "border"])
+
+_images = {}
+_png = {}
+
+
+def background_spec(width, height, theme="light", layout="full", divisions=10, box=None, line=1,
+                    background=None, border=None):
+    """테마 색에 background/border 를 덮어쓴 BackgroundSpec"""
+    if theme not in THEMES:
+        raise ValueError(f"알 수 없는 테마: {theme}")
+    colors = THEMES[theme]
+    return BackgroundSpec(int(width), int(height), layout, divisions,
+                          None if box is None else int(box), line,
+                          background or colors.background, colors.grid, colors.center,
+                          border or colors.border)
+
+
+def _draw(spec):
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (spec.width, spec.height), spec.background)
+    draw = ImageDraw.Draw(image)
+    w, h, n = spec.width, spec.height, spec.divisions
+
+    if spec.layout == "full":
+        for i in range(n + 1 if n else 0):
+            x = round(i * (w - 1) / n)
+            y = round(i * (h - 1) / n)
+            draw.line([(x, 0), (x, h)], fill=spec.grid, width=spec.line)
+            draw.line([(0, y), (w, y)], fill=spec.grid, width=spec.line)
+        draw.line([(w // 2, 0), (w // 2, h)], fill=spec.center, width=2 * spec.line)
+        draw.line([(0, h // 2), (w, h // 2)], fill=spec.center, width=2 * spec.line)
+    elif spec.layout == "plain":
+        pass
+    elif spec.layout == "box":
+        size = spec.box
+        x0, y0 = (w - size) // 2, (h - size) // 2
+        for i in range(n + 1 if n else 0):
+            offset = round(i * size / n)
+            draw.line([(x0 + offset, y0), (x0 + offset, y0 + size)], fill=spec.grid, width=spec.line)
+            draw.line([(x0, y0 + offset), (x0 + size, y0 + offset)], fill=spec.grid, width=spec.line)
+        draw.rectangle([x0, y0, x0 + size, y0 + size], outline=spec.border, width=2 * spec.line)
+    else:
+        raise ValueError(f"알 수 없는 배치: {spec.layout}")
+    return image
+
+
+def background_image(spec):
+    """배경 PIL 이미지 (캐시된 것을 공유하므로 그 위에 그리려면 copy() 할 것)"""
+    image = _images.get(spec)
+    if image is None:
+        image = _images[spec] = _draw(spec)
+    return image
+
+
+def background_png(spec):
+    """배경 PNG 바이트 (tk.PhotoImage(data=...) 에 바로 쓸 수 있음)"""
+    data = _png.get(spec)
+    if data is None:
+        buffer = io.BytesIO()
+        background_image(spec).save(buffer, format="PNG")
+        data = _png[spec] = buffer.getvalue()
+    return data
+
+
+def background_file(spec, cache_dir=DEFAULT_CACHE_DIR):
+    """배경 PNG 파일 경로 (없을 때만 만들므로 다음 실행에서도 재사용)"""
+    name = hashlib.sha1(repr(tuple(spec)).encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"{spec.layout}-{spec.width}x{spec.height}-{name}.png")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(background_png(spec))
+        os.replace(tmp_file, path)
+    return path
+
+
+def theme_for(color):
+    """배경색에 어울리는 테마 이름"""
+    return "dark" if color.lower() in ("black", "#000", "#000000") else "light"
+
+
+def _turtle_lines(grid, border, box, divisions):
+    """PIL 이 없을 때: 예전처럼 turtle 로 선을 그림"""
+    from turtle import Turtle
+
+    half = box // 2
+    pen = Turtle()
+    pen.hideturtle()
+    pen.speed(0)
+    if grid:
+        pen.pencolor("lightgray")
+        pen.pensize(1)
+        for i in range(divisions + 1):
+            pos = -half + round(i * box / divisions)
+            for start, end in (((pos, -half), (pos, half)), ((-half, pos), (half, pos))):
+                pen.penup()
+                pen.goto(start)
+                pen.pendown()
+                pen.goto(end)
+    pen.pencolor(border)
+    pen.pensize(2)
+    pen.penup()
+    pen.goto(-half, -half)
+    pen.pendown()
+    for _ in range(4):
+        pen.forward(box)
+        pen.left(90)
+
+
+def set_turtle_background(screen, width, height, grid=True, background="white", border=None,
+                          box=200, divisions=10):
+    """turtle 화면에 캐시된 배경 그림을 깔기 (선을 turtle 로 하나씩 그리지 않음)
+
+    turtle 은 배경 그림을 화면 가운데에 두므로 box 테두리가 (-box/2, -box/2) ~
+    (box/2, box/2) 좌표와 겹친다. 같은 파일 이름이면 turtle 이 이미지를 다시 읽지 않는다.
+    """
+    spec = background_spec(width, height, theme_for(background), "box", divisions if grid else 0,
+                           box, background=background, border=border)
+    screen.bgcolor(background)
+    try:
+        screen.bgpic(background_file(spec))
+    except ImportError:
+        _turtle_lines(grid, spec.border, box, divisions)
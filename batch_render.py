@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""여러 프로세스로 한자 획순 이미지를 일괄 생성
+
+글자 목록을 묶음(chunk) 단위로 나누어 프로세스 풀에 보내고, 동시에 처리 중인
+묶음 수를 제한한다. 각 작업 프로세스는 시작할 때 획 데이터를 한 번만 읽는다.
+실패한 글자는 건너뛰고 결과 보고서에 남긴다.
+
+사용 예:
+    python batch_render.py --workers 8 -o build/stroke-order
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from headless_renderer import HeadlessRenderer, load_stroke_records, render_to_files
+
+# 글자 목록을 만들 파일
+DEFAULT_CHARACTER_SOURCES = [
+    "data/all_strokes.json",
+    "data/new-structure/characters/hanja_characters.json",
+]
+
+# 획 데이터를 찾을 소스 (앞에 있을수록 우선)
+DEFAULT_STROKE_SOURCES = [
+    "hanja_strokes.json",
+    "data/strokes",
+    "data/stroke_data",
+    "data/all_strokes.json",
+]
+
+# 작업 프로세스마다 한 번 초기화되는 상태
+_worker_state = {}
+
+
+def load_character_list(sources):
+    """글자 목록 파일들에서 중복 없이 글자를 모아 코드포인트 순으로 정렬
+
+    {한자: {...}} 형식과 {"characters": [{"character": ...}]} 형식을 읽는다.
+    """
+    characters = set()
+    for source in sources:
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("characters"), list):
+            characters.update(item["character"] for item in data["characters"] if "character" in item)
+        elif isinstance(data, dict):
+            characters.update(data.keys())
+    return sorted(characters, key=lambda c: [ord(ch) for ch in c])
+
+
+def load_stroke_table(sources):
+    """여러 소스의 획 데이터를 {한자: 획 목록} 으로 합침 (앞선 소스 우선)"""
+    table = {}
+    for source in sources:
+        if not os.path.exists(source):
+            continue
+        for character, strokes in load_stroke_records(source):
+            if strokes and character not in table:
+                table[character] = strokes
+    return table
+
+
+def output_name(character):
+    """출력 파일 이름 (코드포인트 기반, 실행 순서나 프로세스와 무관하게 항상 같음)"""
+    return "-".join(f"U+{ord(ch):04X}" for ch in character)
+
+
+def _init_worker(stroke_sources, renderer_options, output_dir, mode):
+    """작업 프로세스 초기화: 획 데이터와 렌더러를 한 번만 준비"""
+    _worker_state["strokes"] = load_stroke_table(stroke_sources)
+    _worker_state["renderer"] = HeadlessRenderer(**renderer_options)
+    _worker_state["output_dir"] = output_dir
+    _worker_state["mode"] = mode
+
+
+def _render_chunk(characters):
+    """글자 묶음을 렌더링하고 글자별 결과 목록을 반환 (예외는 글자 단위로 기록)"""
+    table = _worker_state["strokes"]
+    renderer = _worker_state["renderer"]
+    results = []
+    for character in characters:
+        try:
+            strokes = table.get(character)
+            if not strokes:
+                raise LookupError("획 데이터가 없습니다")
+            files = render_to_files(renderer, character, strokes, _worker_state["output_dir"],
+                                    _worker_state["mode"], name=output_name(character))
+            results.append({"character": character, "ok": True, "files": files})
+        except Exception as e:
+            results.append({"character": character, "ok": False,
+                            "error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def render_all(characters, output_dir, workers=None, chunk_size=16, max_in_flight=None,
+               mode="strip", stroke_sources=DEFAULT_STROKE_SOURCES, renderer_options=None,
+               progress=None, worker=None):
+    """글자 목록 전체를 프로세스 풀로 렌더링하고 글자별 결과를 입력 순서대로 반환
+
+    max_in_flight 는 동시에 제출해 둘 묶음의 최대 수 (기본: 작업 프로세스 수의 2배).
+    worker 는 글자 묶음 → 글자별 결과 목록 함수 (기본 _render_chunk, 모듈 최상위 함수).
+    작업 프로세스가 죽어 풀이 깨지면, 결과를 받지 못한 묶음의 글자를 한 글자씩 따로
+    다시 렌더링해 원인 글자만 실패로 기록하고 새 풀로 나머지를 계속 처리한다.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    renderer_options = renderer_options or {}
+    os.makedirs(output_dir, exist_ok=True)
+    initargs = (stroke_sources, renderer_options, output_dir, mode)
+    worker = worker or _render_chunk
+
+    results = {}
+    chunks = chunked(list(characters), chunk_size)
+    while True:
+        lost = _run_pool(worker, chunks, workers, max_in_flight, initargs, results, progress)
+        if not lost:
+            break
+        _isolate(worker, [c for chunk in lost for c in chunk], initargs, results, progress)
+
+    return [results[c] for c in characters]
+
+
+def _run_pool(worker, chunks, workers, max_in_flight, initargs, results, progress):
+    """풀 하나로 묶음들을 처리. 풀이 깨지면 결과를 받지 못한 묶음 목록을 반환"""
+    pending = {}
+    chunk = None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=initargs) as pool:
+        try:
+            for chunk in chunks:
+                # 처리 중인 묶음이 한도에 차면 하나 이상 끝날 때까지 기다림
+                while len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done, pending, results, progress)
+                pending[pool.submit(worker, chunk)] = chunk
+                chunk = None
+            done, _ = wait(pending)
+            _collect(done, pending, results, progress)
+        except BrokenProcessPool:
+            return list(pending.values()) + ([chunk] if chunk else [])
+    return []
+
+
+def _isolate(worker, characters, initargs, results, progress):
+    """풀이 깨졌을 때 처리 중이던 글자들을 작업 프로세스 하나로 한 글자씩 렌더링
+
+    어느 글자가 프로세스를 죽였는지 모르므로, 다시 죽으면 그 글자만 실패로 남기고
+    풀을 새로 만들어 이어 간다.
+    """
+    queue = deque(characters)
+    while queue:
+        with ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            try:
+                while queue:
+                    chunk_results = pool.submit(worker, [queue[0]]).result()
+                    queue.popleft()
+                    _store(chunk_results, results, progress)
+            except BrokenProcessPool as e:
+                _store([_failure(queue.popleft(), e)], results, progress)
+
+
+def _collect(futures, pending, results, progress):
+    """끝난 묶음의 결과를 모음. 풀이 깨진 묶음은 pending 에 남기고 BrokenProcessPool"""
+    broken = None
+    for future in futures:
+        try:
+            chunk_results = future.result()
+        except BrokenProcessPool as e:
+            broken = e
+            continue
+        except Exception as e:
+            chunk_results = [_failure(c, e) for c in pending[future]]
+        del pending[future]
+        _store(chunk_results, results, progress)
+    if broken:
+        raise broken
+
+
+def _failure(character, error):
+    return {"character": character, "ok": False, "error": f"{type(error).__name__}: {error}"}
+
+
+def _store(chunk_results, results, progress):
+    for result in chunk_results:
+        results[result["character"]] = result
+        if progress:
+            progress(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한자 획순 이미지 병렬 일괄 생성")
+    parser.add_argument("--characters", nargs="+", default=DEFAULT_CHARACTER_SOURCES,
+                        help="글자 목록을 가져올 JSON 파일")
+    parser.add_argument("--strokes", nargs="+", default=DEFAULT_STROKE_SOURCES,
+                        help="획 데이터 파일 또는 디렉터리 (앞에 있을수록 우선)")
+    parser.add_argument("--output", "-o", default="build/stroke-order", help="출력 디렉터리")
+    parser.add_argument("--mode", choices=["strip", "frames", "final"], default="strip",
+                        help="출력 형식 (headless_renderer.py 와 같음)")
+    parser.add_argument("--size", type=int, default=256, help="프레임 한 장의 크기 (픽셀)")
+    parser.add_argument("--workers", "-j", type=int, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="한 번에 보내는 글자 수")
+    parser.add_argument("--max-in-flight", type=int, help="동시에 처리 중인 묶음의 최대 수")
+    parser.add_argument("--strict", action="store_true", help="실패한 글자가 있으면 종료 코드 1")
+
+    args = parser.parse_args()
+
+    characters = load_character_list(args.characters)
+    print(f"{len(characters)}자 렌더링 시작 (작업 프로세스 {args.workers or os.cpu_count()}개)")
+
+    def report(result):
+        if not result["ok"]:
+            print(f"  실패: {result['character']} - {result['error']}")
+
+    start = time.perf_counter()
+    results = render_all(characters, args.output, args.workers, args.chunk_size,
+                         args.max_in_flight, args.mode, args.strokes,
+                         {"size": args.size}, progress=report)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if not r["ok"]]
+    with open(os.path.join(args.output, "report.json"), "w", encoding="utf-8") as f:
+        json.dump({"rendered": len(results) - len(failed), "failed": len(failed),
+                   "results": results}, f, ensure_ascii=False, indent=2)
+
+    print(f"완료: {len(results) - len(failed)}자 성공, {len(failed)}자 실패 ({elapsed:.2f}초)")
+    if failed and args.strict:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
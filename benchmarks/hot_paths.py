@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""획 데이터 처리 주요 경로 벤치마크 (창 없이 실행 가능)
+
+전체 획 데이터(data/strokes/, data/stroke_data/, data/all_strokes.json,
+hanja_strokes.json)에 대해 단계별로 잰다.
+- load_hanja_data: 데이터 파일 읽기 (characters/s, 파일마다 지연)
+- parse_path: SVGPathParser.parse_path (paths/s, 경로마다 지연)
+- get_path_points: SVGPathParser.get_path_points 평탄화 (paths/s, points/s)
+- simplify_points: 평탄화 + RDP 단순화 (허용 오차 SIMPLIFY_TOLERANCE, 남은 points 수)
+- stroke_curve_points: enhanced_hanja_drawer 의 곡선 획 좌표 (paths/s, points/s)
+- render_stroke: HeadlessRenderer.draw_stroke (PIL, 경로 캐시를 비운 상태에서)
+- draw_stroke_path: HanjaDrawer.draw_stroke_path (Tk 캔버스, 화면이 있을 때만)
+
+지연은 호출 하나마다 잰 값의 백분위(µs), 처리량은 반복 전체의 중앙값이다.
+최대 메모리는 타이밍과 별도로 한 번 더 돌려 tracemalloc 으로 잰다.
+필요한 모듈(PIL, tkinter)이나 화면이 없으면 그 단계만 건너뛰고 이유를 남긴다.
+
+사용 예:
+    python benchmarks/hot_paths.py --json build/bench/$(git rev-parse --short HEAD).json
+    python benchmarks/hot_paths.py --compare build/bench/old.json --max-slowdown 1.2
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 앞에 있는 소스의 글자가 우선 (headless_renderer 와 같은 순서)
+DEFAULT_SOURCES = ["data/strokes", "data/stroke_data", "data/all_strokes.json", "hanja_strokes.json"]
+# simplify_points 단계의 RDP 허용 오차 (데이터 좌표)
+SIMPLIFY_TOLERANCE = 0.2
+
+
+class Skip(Exception):
+    """이 환경에서는 잴 수 없는 단계"""
+
+
+def percentiles(samples_ns):
+    """호출마다 잰 시간(ns) → µs 백분위"""
+    samples = sorted(samples_ns)
+    if not samples:
+        return {}
+
+    def at(q):
+        return round(samples[min(len(samples) - 1, int(q * len(samples)))] / 1000, 2)
+
+    return {"p50_us": at(0.50), "p90_us": at(0.90), "p99_us": at(0.99),
+            "max_us": round(samples[-1] / 1000, 2)}
+
+
+# 데이터
+
+def load_source(source):
+    """한 소스의 [(한자, 획 목록)] 와 파일마다 걸린 시간(ns) 목록"""
+    from character_store import normalize_strokes
+    from svg_hanja_drawer import HanjaDrawer
+
+    path = os.path.join(ROOT, source)
+    records, timings = [], []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.endswith(".json"):
+                continue
+            start = time.perf_counter_ns()
+            data = HanjaDrawer.load_hanja_data(os.path.join(path, name))
+            timings.append(time.perf_counter_ns() - start)
+            records.append((data["character"], normalize_strokes(data.get("strokes", []))))
+    else:
+        start = time.perf_counter_ns()
+        data = HanjaDrawer.load_hanja_data(path)
+        timings.append(time.perf_counter_ns() - start)
+        for character, record in data.items():
+            if isinstance(record, dict) and "strokes" in record:
+                records.append((character, normalize_strokes(record["strokes"])))
+    return records, timings
+
+
+def load_dataset(sources):
+    """[(한자, 획 목록)] (여러 소스에 있는 글자는 먼저 나온 것)"""
+    seen = set()
+    dataset = []
+    for source in sources:
+        for character, strokes in load_source(source)[0]:
+            if character not in seen and strokes:
+                seen.add(character)
+                dataset.append((character, strokes))
+    return dataset
+
+
+# 단계: 모두 반복 한 번을 도는 함수를 돌려준다. 그 함수는 호출마다 잰 시간(ns) 목록과
+# 처리한 단위 수 {"paths": .., "points": .., "characters": ..} 를 돌려준다.
+
+def stage_load(sources):
+    def run():
+        samples, characters = [], 0
+        for source in sources:
+            records, timings = load_source(source)
+            samples.extend(timings)
+            characters += len(records)
+        return samples, {"characters": characters, "files": len(samples)}
+    return run
+
+
+def stage_parse(paths):
+    from svg_hanja_drawer import SVGPathParser
+
+    parse = SVGPathParser.parse_path
+    clock = time.perf_counter_ns
+
+    def run():
+        samples = []
+        for path in paths:
+            start = clock()
+            parse(path)
+            samples.append(clock() - start)
+        return samples, {"paths": len(paths)}
+    return run
+
+
+def stage_points(paths, simplify=None):
+    from svg_hanja_drawer import SVGPathParser
+
+    get_points = SVGPathParser.get_path_points
+    clock = time.perf_counter_ns
+
+    def run():
+        samples, points = [], 0
+        for path in paths:
+            start = clock()
+            result = get_points(path, simplify=simplify)
+            samples.append(clock() - start)
+            points += len(result)
+        return samples, {"paths": len(paths), "points": points}
+    return run
+
+
+def stage_curve(paths):
+    from enhanced_hanja_drawer import stroke_curve_points
+    from svg_hanja_drawer import SVGPathParser
+
+    # 곡선 획은 경로의 시작점과 끝점으로 그린다 (turtle 좌표계)
+    ends = []
+    for path in paths:
+        points = SVGPathParser.get_path_points(path)
+        (x1, y1), (x2, y2) = points[0], points[-1]
+        ends.append((2 * x1 - 100, 100 - 2 * y1, 2 * x2 - 100, 100 - 2 * y2))
+    clock = time.perf_counter_ns
+
+    def run():
+        samples, points = [], 0
+        for x1, y1, x2, y2 in ends:
+            start = clock()
+            result = stroke_curve_points(x1, y1, x2, y2)
+            samples.append(clock() - start)
+            points += len(result)
+        return samples, {"paths": len(ends), "points": points}
+    return run
+
+
+def stage_render(dataset, size=256):
+    try:
+        from PIL import ImageDraw
+        from headless_renderer import HeadlessRenderer
+    except ImportError as e:
+        raise Skip(f"PIL 없음 ({e})")
+    from path_cache import PathCache
+
+    clock = time.perf_counter_ns
+
+    def run():
+        # 경로 캐시를 매번 새로 만들어 파싱/평탄화까지 포함해 잰다
+        renderer = HeadlessRenderer(size=size, path_cache=PathCache())
+        samples, paths = [], 0
+        for _, strokes in dataset:
+            draw = ImageDraw.Draw(renderer.new_canvas())
+            for stroke in strokes:
+                start = clock()
+                renderer.draw_stroke(draw, stroke, renderer.color)
+                samples.append(clock() - start)
+                paths += 1
+        return samples, {"paths": paths, "characters": len(dataset)}
+    return run
+
+
+def stage_tk_draw(dataset):
+    try:
+        import tkinter  # noqa: F401
+    except ImportError as e:
+        raise Skip(f"tkinter 없음 ({e})")
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        raise Skip("화면(DISPLAY) 없음")
+    from path_cache import PathCache
+    from svg_hanja_drawer import HanjaDrawer
+
+    drawer = HanjaDrawer(hanja_data={}, animate=False)
+    drawer.root.withdraw()
+    clock = time.perf_counter_ns
+
+    def run():
+        drawer.path_cache = PathCache()
+        drawer._band_cache.clear()
+        samples, paths = [], 0
+        for _, strokes in dataset:
+            drawer.clear_strokes()
+            for stroke in strokes:
+                start = clock()
+                drawer.draw_stroke_path(stroke)
+                samples.append(clock() - start)
+                paths += 1
+            drawer.root.update_idletasks()
+        return samples, {"paths": paths, "characters": len(dataset)}
+    return run
+
+
+def measure(run, repeat, warmup=0.3):
+    """반복 측정 → 지연 백분위, 처리량(중앙값), 최대 메모리
+
+    측정 전에 적어도 한 번, warmup 초가 지날 때까지 돌려 CPU 클럭과 캐시를 데운다.
+    """
+    deadline = time.perf_counter() + warmup
+    run()
+    while time.perf_counter() < deadline:
+        run()
+    walls, samples, counts = [], [], {}
+    gc.collect()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call_samples, counts = run()
+        walls.append(time.perf_counter() - start)
+        samples.extend(call_samples)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    wall = statistics.median(walls)
+    result = {"calls": len(samples) // repeat, "wall_ms": round(wall * 1000, 3),
+              "latency": percentiles(samples), "peak_memory_kb": round(peak / 1024, 1),
+              "throughput": {f"{unit}_per_s": round(count / wall, 1)
+                             for unit, count in counts.items() if wall > 0}}
+    result.update(counts)
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, max_slowdown):
+    """기준 결과보다 p50 지연이 max_slowdown 배 넘게 느려진 단계 목록"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = []
+    print(f"\n기준: {baseline_path} ({baseline.get('revision') or '?'})")
+    for name, stage in results.items():
+        old = baseline.get("stages", {}).get(name)
+        if not old or "latency" not in old or "latency" not in stage:
+            continue
+        ratio = stage["latency"]["p50_us"] / old["latency"]["p50_us"] if old["latency"]["p50_us"] else 1
+        mark = "  <- 느려짐" if ratio > max_slowdown else ""
+        print(f"{name:<20} p50 {old['latency']['p50_us']:9.2f} → {stage['latency']['p50_us']:9.2f} µs "
+              f"(x{ratio:.2f}){mark}")
+        if ratio > max_slowdown:
+            regressions.append(f"{name}: p50 x{ratio:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파싱/평탄화/렌더링/데이터 로드 벤치마크")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_SOURCES,
+                        help="획 데이터 파일 또는 디렉터리 (저장소 루트 기준)")
+    parser.add_argument("--repeat", "-n", type=int, default=5, help="단계마다 반복 횟수")
+    parser.add_argument("--stage", action="append", help="이 단계만 (여러 번 지정 가능)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="--compare 에서 p50 지연이 이 배수를 넘으면 실패")
+    args = parser.parse_args()
+
+    sources = [s for s in args.sources if os.path.exists(os.path.join(ROOT, s))]
+    dataset = load_dataset(sources)
+    paths = [stroke["path"] for _, strokes in dataset for stroke in strokes if "path" in stroke]
+    print(f"데이터: {len(dataset)}자, 경로 {len(paths)}개 ({', '.join(sources)})")
+
+    stages = {
+        "load_hanja_data": lambda: stage_load(sources),
+        "parse_path": lambda: stage_parse(paths),
+        "get_path_points": lambda: stage_points(paths),
+        "simplify_points": lambda: stage_points(paths, SIMPLIFY_TOLERANCE),
+        "stroke_curve_points": lambda: stage_curve(paths),
+        "render_stroke": lambda: stage_render(dataset),
+        "draw_stroke_path": lambda: stage_tk_draw(dataset),
+    }
+    results, skipped = {}, {}
+    for name, make in stages.items():
+        if args.stage and name not in args.stage:
+            continue
+        try:
+            result = results[name] = measure(make(), args.repeat)
+        except Skip as e:
+            skipped[name] = str(e)
+            print(f"{name:<20} 건너뜀: {e}")
+            continue
+        rates = ", ".join(f"{value:,.0f} {unit.replace('_per_s', '')}/s"
+                          for unit, value in result["throughput"].items())
+        latency = result["latency"]
+        print(f"{name:<20} {rates:<40} p50 {latency['p50_us']:.1f} µs, p99 {latency['p99_us']:.1f} µs, "
+              f"최대 메모리 {result['peak_memory_kb']:,.0f} KB")
+
+    report = {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "dataset": {"sources": sources, "characters": len(dataset), "paths": len(paths)},
+        "stages": results,
+        "skipped": skipped,
+    }
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.max_slowdown)
+        for regression in regressions:
+            print(f"실패: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""hanjaro 명령줄 도구의 시작 시간과 첫 렌더링 시간 측정
+
+하위 명령마다 새 인터프리터를 띄워 다음을 잰다.
+- import: `import hanjaro.cli` 에 걸린 시간 (python -X importtime 합계)
+- run: 프로세스 시작부터 종료까지의 전체 시간 (list/quiz/export)
+- first render: 데이터를 열고 첫 글자 하나를 PNG 로 저장하기까지의 시간
+
+창을 띄우지 않는 명령(list/quiz/export)이 tkinter/turtle 을 가져오면 실패로
+보고하고 종료 코드 1 을 돌려준다. --max-ms 를 주면 그보다 느린 항목도 실패다.
+
+사용 예:
+    python benchmarks/startup.py --repeat 10
+    python benchmarks/startup.py --json build/startup.json --max-ms 300
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 창을 띄우지 않는 명령이 가져오면 안 되는 모듈
+GUI_MODULES = ("tkinter", "_tkinter", "turtle")
+
+# 명령 실행 뒤 가져온 GUI 모듈을 표준 오류로 알려주는 래퍼
+_RUN_AND_REPORT = """
+import sys
+from hanjaro.cli import main
+try:
+    main(sys.argv[1:])
+finally:
+    loaded = [m for m in {gui!r} if m in sys.modules]
+    sys.stderr.write("\\nGUI_MODULES=" + ",".join(loaded) + "\\n")
+"""
+
+_FIRST_RENDER = """
+import sys, time
+start = time.perf_counter()
+from hanjaro.cli import load_data
+from headless_renderer import HeadlessRenderer, render_to_files
+data = load_data(sys.argv[1])
+char = next(iter(data))
+render_to_files(HeadlessRenderer(size=256), char, data[char]["strokes"], sys.argv[2])
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _python(args, stdin=None):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable] + args, cwd=ROOT, input=stdin, capture_output=True,
+                          text=True, encoding="utf-8")
+    return proc, (time.perf_counter() - start) * 1000
+
+
+def import_time_ms():
+    """-X importtime 의 누적 시간 중 hanjaro.cli 항목 (ms)"""
+    proc, _ = _python(["-X", "importtime", "-c", "import hanjaro.cli"])
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "hanjaro.cli":
+            return int(parts[1]) / 1000
+    raise RuntimeError(proc.stderr.strip() or "hanjaro.cli 의 import 시간을 찾을 수 없습니다")
+
+
+def run_command(argv, stdin=None):
+    """하위 명령 하나를 실행하고 (전체 시간 ms, 가져온 GUI 모듈 목록) 을 돌려줌"""
+    script = _RUN_AND_REPORT.format(gui=GUI_MODULES)
+    proc, elapsed = _python(["-c", script] + argv, stdin)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip())
+    loaded = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("GUI_MODULES="):
+            loaded = [m for m in line.split("=", 1)[1].split(",") if m]
+    return elapsed, loaded
+
+
+def first_render_ms(data_path, output_dir):
+    proc, _ = _python(["-c", _FIRST_RENDER, data_path, output_dir])
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip())
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "min_ms": round(samples[0], 2),
+        "median_ms": round(statistics.median(samples), 2),
+        "max_ms": round(samples[-1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hanjaro 시작 시간 / 첫 렌더링 시간 측정")
+    parser.add_argument("--data", "-d", default="hanja_strokes.json", help="측정에 쓸 한자 데이터")
+    parser.add_argument("--repeat", "-n", type=int, default=5, help="항목마다 반복 횟수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--max-ms", type=float, help="중앙값이 이보다 크면 실패 (ms)")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        benches = {
+            "import hanjaro.cli": import_time_ms,
+            "list": lambda: run_command(["--data", args.data, "list"]),
+            # 답을 틀리게 입력해도 퀴즈는 끝까지 진행된다
+            "quiz": lambda: run_command(["--data", args.data, "quiz", "-c", "1"], stdin="0\n"),
+            "export": lambda: run_command(["--data", args.data, "export", "永", "-o", output_dir,
+                                           "--mode", "final"]),
+            "first render": lambda: first_render_ms(args.data, output_dir),
+        }
+        for name, bench in benches.items():
+            samples = []
+            try:
+                for _ in range(args.repeat):
+                    value = bench()
+                    if isinstance(value, tuple):
+                        value, loaded = value
+                        if loaded:
+                            failures.append(f"{name}: GUI 모듈을 가져옴 ({', '.join(loaded)})")
+                    samples.append(value)
+            except RuntimeError as e:
+                # PIL 이 없는 환경 등: 해당 항목만 건너뛴다
+                print(f"{name:<20} 건너뜀: {str(e).splitlines()[-1]}")
+                continue
+            results[name] = summary = summarize(samples)
+            print(f"{name:<20} 중앙값 {summary['median_ms']:8.1f} ms "
+                  f"(최소 {summary['min_ms']:.1f}, 최대 {summary['max_ms']:.1f})")
+            if args.max_ms is not None and summary["median_ms"] > args.max_ms:
+                failures.append(f"{name}: {summary['median_ms']:.1f} ms > {args.max_ms} ms")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat,
+                       "results": results, "failures": failures}, f, ensure_ascii=False, indent=2)
+
+    for failure in sorted(set(failures)):
+        print(f"실패: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
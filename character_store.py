@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""여러 JSON 데이터에 흩어진 한자 정보를 하나로 묶는 저장소
+
+각 데이터 파일에서 한자 레코드가 있는 바이트 위치만 한 번 색인해 두고
+(.cache/character_index.json), 조회할 때는 그 구간만 읽어 파싱한다.
+파일이 바뀌면(mtime, 크기) 그 파일만 다시 색인한다.
+
+    store = CharacterStore()
+    store["學"]["strokes"]      # 획 경로
+    store["學"]["meaning"]      # 뜻
+"""
+
+import json
+import os
+from collections.abc import Mapping
+
+import instrumentation
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_FILE = os.path.join(".cache", "character_index.json")
+
+# (경로, 형식) - 앞에 있을수록 우선. 획 데이터와 메타데이터를 모두 이 순서로 찾는다.
+#   json: 파일 안의 "character" 필드를 가진 객체 또는 {한자: 객체} 항목
+#   char_dir: 한자.json 파일이 모인 디렉터리
+#   id_dir: HJ-..-<코드포인트>.json 파일이 모인 디렉터리
+DEFAULT_SOURCES = [
+    ("hanja_strokes.json", "json"),
+    ("data/strokes", "char_dir"),
+    ("data/stroke_data", "char_dir"),
+    ("data/all_strokes.json", "json"),
+    ("data/hanja_stroke_index.json", "json"),
+    ("data/new-structure/characters/hanja_characters.json", "json"),
+    ("data/new-structure/characters/hanja_extended.json", "json"),
+    ("data/new-structure/characters", "id_dir"),
+    ("data/hanja_database_main.json", "json"),
+    ("data/hanja_database.json", "json"),
+    ("data/hanja_database_fixed.json", "json"),
+    ("data/hanja_database_new.json", "json"),
+]
+
+# 획 경로를 담고 있는 소스
+STROKE_SOURCES = {
+    "hanja_strokes.json",
+    "data/strokes",
+    "data/stroke_data",
+    "data/all_strokes.json",
+    "data/hanja_stroke_index.json",
+}
+
+# 병합할 메타데이터 필드 (모두 채워지면 나머지 소스는 읽지 않는다)
+METADATA_FIELDS = ("meaning", "pronunciation", "stroke_count", "radical")
+
+
+def normalize_strokes(strokes):
+    """여러 데이터 형식의 획 목록을 {"path": ...} 사전 목록으로 통일
+
+    hanja_strokes.json 은 획마다 사전을, data/strokes/*.json 과
+    data/all_strokes.json 은 경로 문자열을 쓴다.
+    """
+    result = []
+    for stroke in strokes:
+        if isinstance(stroke, str):
+            result.append({"path": stroke})
+        elif isinstance(stroke, dict) and "path" in stroke:
+            result.append(stroke)
+    return result
+
+
+def open_hanja_data(path):
+    """드로어가 쓰는 한자 → 레코드 매핑 열기
+
+    - 디렉터리: 그 아래 데이터 전체를 묶은 CharacterStore (획이 있는 글자만)
+    - .hjsp 팩 파일: mmap 으로 여는 StrokePack
+    - 그 밖의 파일: hanja_strokes.json 형식의 JSON
+    파일이 없으면 FileNotFoundError, 형식이 잘못되면 ValueError 를 낸다.
+    """
+    with instrumentation.span("load_data", path=path):
+        if os.path.isdir(path):
+            return CharacterStore(path, require_strokes=True)
+        with open(path, "rb") as f:
+            magic = f.read(4)
+        # stroke_pack.MAGIC 과 같은 값. 팩이 아닐 때 numpy 를 가져오지 않도록 직접 비교한다
+        if magic == b"HJSP":
+            from stroke_pack import StrokePack
+            return StrokePack(path)
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _is_character(value):
+    return isinstance(value, str) and len(value) == 1
+
+
+class _SpanScanner:
+    """JSON 텍스트를 훑으며 한자 레코드 객체의 (시작, 끝) 바이트 위치를 찾기
+
+    "character" 필드가 있는 객체와, 키가 한자 한 글자인 객체 값을 레코드로 본다.
+    그 밖의 컨테이너는 안으로 들어가며 살핀다.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.decoder = json.JSONDecoder()
+        self.spans = {}
+        # 문자 위치 → 바이트 위치 변환 (위치가 늘어나는 순서로만 호출됨)
+        self._char_pos = 0
+        self._byte_pos = 0
+
+    def _byte_offset(self, pos):
+        self._byte_pos += len(self.text[self._char_pos:pos].encode("utf-8"))
+        self._char_pos = pos
+        return self._byte_pos
+
+    def _skip_ws(self, pos):
+        text = self.text
+        while pos < len(text) and text[pos] in " \t\r\n":
+            pos += 1
+        return pos
+
+    def scan(self):
+        self._value(self._skip_ws(0), None)
+        return self.spans
+
+    def _record(self, character, start, end):
+        if character not in self.spans:
+            self.spans[character] = (self._byte_offset(start), self._byte_offset(end))
+
+    def _value(self, pos, key):
+        """pos 에서 시작하는 값을 훑고 끝 위치를 반환 (key: 이 값이 속한 객체 키)"""
+        ch = self.text[pos]
+        if ch not in "{[":
+            return self.decoder.raw_decode(self.text, pos)[1]
+
+        # 통째로 파싱해 보고 레코드면 위치만 기록 (C 파서라 빠름)
+        value, end = self.decoder.raw_decode(self.text, pos)
+        if isinstance(value, dict):
+            if _is_character(value.get("character")):
+                self._record(value["character"], pos, end)
+                return end
+            if _is_character(key) and value:
+                self._record(key, pos, end)
+                return end
+        if not value:
+            return end
+        return self._container(pos)
+
+    def _container(self, pos):
+        text = self.text
+        is_object = text[pos] == "{"
+        closing = "}" if is_object else "]"
+        pos = self._skip_ws(pos + 1)
+        while text[pos] != closing:
+            key = None
+            if is_object:
+                key, pos = self.decoder.raw_decode(text, pos)
+                pos = self._skip_ws(pos)
+                pos = self._skip_ws(pos + 1)  # ':'
+            pos = self._skip_ws(self._value(pos, key))
+            if text[pos] == ",":
+                pos = self._skip_ws(pos + 1)
+        return pos + 1
+
+
+def index_source(path, kind):
+    """소스 하나를 색인: {한자: 위치} (json 은 [시작, 끝] 바이트, 디렉터리는 파일 이름)"""
+    if kind == "char_dir":
+        return {name[:-5]: name for name in sorted(os.listdir(path))
+                if name.endswith(".json") and len(name) == 6}
+    if kind == "id_dir":
+        entries = {}
+        for name in sorted(os.listdir(path)):
+            if name.startswith("HJ-") and name.endswith(".json"):
+                try:
+                    entries.setdefault(chr(int(name[:-5].rsplit("-", 1)[1], 16)), name)
+                except ValueError:
+                    continue
+        return entries
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return {char: list(span) for char, span in _SpanScanner(text).scan().items()}
+
+
+class CharacterStore(Mapping):
+    """한자 → 병합된 레코드 매핑 (필요한 레코드만 읽음)
+
+    레코드 형식은 hanja_strokes.json 과 같다: meaning, stroke_count, strokes
+    ([{"path", "desc", ...}]) 에 더해 pronunciation, radical, medians 가 있을 수 있다.
+    require_strokes 가 참이면 획 경로가 있는 한자만 키로 보인다.
+    """
+
+    def __init__(self, root=".", sources=DEFAULT_SOURCES, index_file=DEFAULT_INDEX_FILE,
+                 require_strokes=False):
+        self.root = root
+        self.sources = [(path, kind) for path, kind in sources
+                        if os.path.exists(os.path.join(root, path))]
+        self.index_file = os.path.join(root, index_file) if index_file else None
+        self.require_strokes = require_strokes
+        self._index = None
+        self._records = {}
+
+    # 색인
+
+    def _source_stamp(self, path):
+        full = os.path.join(self.root, path)
+        if os.path.isdir(full):
+            # 디렉터리는 파일 목록이 바뀌면 mtime 이 바뀐다
+            st = os.stat(full)
+            return [st.st_mtime_ns, len(os.listdir(full))]
+        st = os.stat(full)
+        return [st.st_mtime_ns, st.st_size]
+
+    def _load_index(self):
+        cached = {}
+        if self.index_file and os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    cached = data.get("sources", {})
+            except (OSError, json.JSONDecodeError):
+                cached = {}
+
+        sources = {}
+        changed = False
+        for path, kind in self.sources:
+            stamp = self._source_stamp(path)
+            entry = cached.get(path)
+            if not entry or entry.get("stamp") != stamp or entry.get("kind") != kind:
+                entry = {"kind": kind, "stamp": stamp,
+                         "entries": index_source(os.path.join(self.root, path), kind)}
+                changed = True
+            sources[path] = entry
+
+        if changed and self.index_file:
+            self._save_index(sources)
+
+        # 한자 → [(소스 번호, 위치), ...] (우선순위 순)
+        index = {}
+        geometry = set()
+        for i, (path, _) in enumerate(self.sources):
+            for char, location in sources[path]["entries"].items():
+                index.setdefault(char, []).append((i, location))
+        for char in index:
+            if self._has_strokes_source(index[char]):
+                geometry.add(char)
+        self._index = index
+        self._geometry = geometry
+
+    def _has_strokes_source(self, locations):
+        return any(self.sources[i][0] in STROKE_SOURCES for i, _ in locations)
+
+    def _save_index(self, sources):
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "sources": sources}, f, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._load_index()
+        return self._index
+
+    def _keys(self):
+        if self.require_strokes:
+            self.index  # 색인 준비
+            return self._geometry
+        return self.index
+
+    # 레코드 읽기
+
+    def _read(self, source, location):
+        path, kind = self.sources[source]
+        full = os.path.join(self.root, path)
+        if kind in ("char_dir", "id_dir"):
+            with open(os.path.join(full, location), "r", encoding="utf-8") as f:
+                return json.load(f)
+        start, end = location
+        with open(full, "rb") as f:
+            f.seek(start)
+            return json.loads(f.read(end - start).decode("utf-8"))
+
+    def raw_records(self, character):
+        """한자에 대한 각 소스의 원본 레코드를 우선순위 순으로 생성"""
+        for source, location in self.index.get(character, ()):
+            yield self.sources[source][0], self._read(source, location)
+
+    def _merge(self, character):
+        record = {"character": character}
+        for _, raw in self.raw_records(character):
+            strokes = raw.get("strokes")
+            if "strokes" not in record and isinstance(strokes, list):
+                normalized = normalize_strokes(strokes)
+                if normalized:
+                    record["strokes"] = normalized
+                    if raw.get("medians"):
+                        record["medians"] = raw["medians"]
+            # hanja_database_main.json 은 획수를 "strokes" 에 숫자로 둔다
+            if isinstance(strokes, int):
+                record.setdefault("stroke_count", strokes)
+            for field in METADATA_FIELDS:
+                if raw.get(field) not in (None, ""):
+                    record.setdefault(field, raw[field])
+            if "strokes" in record and all(f in record for f in METADATA_FIELDS):
+                break
+
+        record.setdefault("strokes", [])
+        record.setdefault("meaning", "")
+        record.setdefault("stroke_count", len(record["strokes"]))
+        for i, stroke in enumerate(record["strokes"], 1):
+            stroke.setdefault("desc", f"{i}번째 획")
+        return record
+
+    # Mapping 인터페이스
+
+    def __getitem__(self, character):
+        if character not in self._keys():
+            raise KeyError(character)
+        record = self._records.get(character)
+        if record is None:
+            record = self._records[character] = self._merge(character)
+        return record
+
+    def __contains__(self, character):
+        return character in self._keys()
+
+    def __iter__(self):
+        return iter(sorted(self._keys(), key=ord))
+
+    def __len__(self):
+        return len(self._keys())
+
+    def strokes(self, character):
+        """획 목록만 반환 (없으면 빈 목록)"""
+        return self[character]["strokes"] if character in self else []
+
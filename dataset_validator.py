@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""획/한자 데이터 파일 검사 (파일별 결과 캐시, 프로세스 병렬)
+
+렌더링할 때에야 드러나던 데이터 오류를 미리 찾는다.
+
+파일마다 (작업 프로세스에서):
+- 획 경로 문법: 렌더러와 같은 파서 (path_flattener.compile_path) 로 읽히는지,
+  지원하지 않는 명령 (S, T, A 는 그려지지 않음), 인자 개수, M 으로 시작하는지
+- 개수: stroke_count 와 획 수, medians 수와 획 수
+- 좌표 범위: 평탄화한 획과 medians 의 점이 BOUNDS 안에 있는지
+여러 파일에 걸쳐 (주 프로세스에서):
+- 같은 한자의 획수, 독음, 획 경로가 파일마다 다른지
+
+결과는 파일 내용의 해시와 함께 .cache/dataset_validation.json 에 저장하므로,
+파일 하나를 고친 뒤 다시 돌리면 그 파일만 다시 검사한다.
+
+사용 예:
+    python dataset_validator.py
+    python dataset_validator.py data/strokes/一.json --json
+    python dataset_validator.py --workers 4 --strict
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from itertools import repeat
+
+from character_store import DEFAULT_SOURCES, STROKE_SOURCES
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILE = os.path.join(".cache", "dataset_validation.json")
+# character_store 가 읽지 않지만 같은 레코드를 담은 파일들
+EXTRA_SOURCES = [
+    ("data/new-structure/characters/by-grade", "json_dir"),
+]
+# 획 좌표 범위 (데이터 좌표, 0~100)
+BOUNDS = (0.0, 100.0)
+# 범위 검사용 평탄화 허용 오차
+BOUNDS_TOLERANCE = 0.1
+
+ERROR, WARNING = "error", "warning"
+
+# level: error/warning, file: 파일 (root 기준), character: 한자 (파일 전체면 ""),
+# where: 레코드 안의 위치 (예: "strokes[2]"), message: 설명
+Issue = namedtuple("Issue", ["level", "file", "character", "where", "message"])
+
+_TOKEN_PATTERN = re.compile(r'\s*(?:([A-Za-z])|([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?))\s*,?')
+
+
+def dataset_files(root=".", sources=DEFAULT_SOURCES + EXTRA_SOURCES):
+    """검사할 파일 목록 (root 기준 경로, 있는 것만)"""
+    files = []
+    for path, kind in sources:
+        full = os.path.join(root, path)
+        if not os.path.exists(full):
+            continue
+        if os.path.isdir(full):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(full))
+                         if name.endswith(".json"))
+        else:
+            files.append(path)
+    return files
+
+
+def _is_stroke_file(path):
+    """획 경로를 기준으로 쓰는 소스의 파일인지 (교차 검사에서 획 경로를 비교할 대상)"""
+    path = path.replace(os.sep, "/")
+    return any(path == source or path.startswith(source + "/") for source in STROKE_SOURCES)
+
+
+def iter_records(value, where="", key=None):
+    """파싱한 JSON 에서 (한자, 레코드, 위치) 찾기
+
+    character_store 와 같은 규칙: "character" 필드가 한 글자인 객체, 키가 한자
+    한 글자인 객체 값을 레코드로 보고, 그 밖의 컨테이너는 안으로 들어간다.
+    """
+    if isinstance(value, dict):
+        char = value.get("character")
+        if isinstance(char, str) and len(char) == 1:
+            yield char, value, where
+            return
+        if isinstance(key, str) and len(key) == 1 and value:
+            yield key, value, where
+            return
+        for child_key, child in value.items():
+            yield from iter_records(child, f"{where}.{child_key}" if where else child_key, child_key)
+    elif isinstance(value, list):
+        for i, child in enumerate(value):
+            yield from iter_records(child, f"{where}[{i}]")
+
+
+def check_path_syntax(path_str):
+    """경로 문자열의 문법 오류 목록 (없으면 빈 목록)"""
+    from path_flattener import _ARITY
+
+    errors = []
+    commands = []
+    pos = 0
+    while pos < len(path_str):
+        match = _TOKEN_PATTERN.match(path_str, pos)
+        if not match or match.end() == pos:
+            if path_str[pos:].strip():
+                errors.append(f"{pos}번째 글자 '{path_str[pos]}' 를 읽을 수 없습니다")
+            break
+        if match.group(1):
+            commands.append([match.group(1), 0])
+        elif commands:
+            commands[-1][1] += 1
+        else:
+            errors.append("명령 없이 숫자로 시작합니다")
+            return errors
+        pos = match.end()
+
+    if not commands:
+        return errors + ["빈 경로입니다"]
+    if commands[0][0] not in "Mm":
+        errors.append(f"M 이 아닌 '{commands[0][0]}' 로 시작합니다")
+    for cmd, count in commands:
+        upper = cmd.upper()
+        if upper == "Z":
+            if count:
+                errors.append("Z 뒤에 숫자가 있습니다")
+        elif upper not in _ARITY:
+            errors.append(f"지원하지 않는 명령 '{cmd}' (그려지지 않음)")
+        elif count == 0 or count % _ARITY[upper]:
+            errors.append(f"'{cmd}' 의 인자 {count}개가 {_ARITY[upper]} 의 배수가 아닙니다")
+    return errors
+
+
+def _out_of_bounds(xs, ys, bounds):
+    low, high = bounds
+    return min(xs) < low or min(ys) < low or max(xs) > high or max(ys) > high
+
+
+def _check_strokes(strokes, bounds, issue):
+    """획 목록 검사, 교차 검사용 경로 목록 반환"""
+    from path_flattener import compile_path, flatten_compiled
+
+    paths = []
+    for i, stroke in enumerate(strokes):
+        where = f"strokes[{i}]"
+        path_str = stroke if isinstance(stroke, str) else stroke.get("path") if isinstance(stroke, dict) else None
+        if not isinstance(path_str, str):
+            issue(ERROR, where, "획이 경로 문자열이나 {\"path\": ...} 가 아닙니다")
+            continue
+        paths.append(path_str)
+        errors = check_path_syntax(path_str)
+        for message in errors:
+            issue(ERROR, where, message)
+        if errors:
+            continue
+        points = flatten_compiled(compile_path(path_str), tolerance=BOUNDS_TOLERANCE)
+        if len(points) < 2:
+            issue(ERROR, where, "점이 2개보다 적습니다")
+        elif _out_of_bounds(points[:, 0], points[:, 1], bounds):
+            issue(ERROR, where, f"좌표가 {bounds[0]:g}~{bounds[1]:g} 범위를 벗어납니다 "
+                                f"(x {points[:, 0].min():.1f}~{points[:, 0].max():.1f}, "
+                                f"y {points[:, 1].min():.1f}~{points[:, 1].max():.1f})")
+    return paths
+
+
+def _check_medians(medians, stroke_total, bounds, issue):
+    if not isinstance(medians, list):
+        issue(ERROR, "medians", "medians 가 목록이 아닙니다")
+        return
+    if stroke_total is not None and len(medians) != stroke_total:
+        issue(ERROR, "medians", f"medians {len(medians)}개, 획 {stroke_total}개")
+    for i, median in enumerate(medians):
+        where = f"medians[{i}]"
+        if not isinstance(median, list) or not all(
+                isinstance(p, list) and len(p) == 2 and all(isinstance(v, (int, float)) for v in p)
+                for p in median):
+            issue(ERROR, where, "[[x, y], ...] 형식이 아닙니다")
+        elif len(median) < 2:
+            issue(ERROR, where, "점이 2개보다 적습니다")
+        elif _out_of_bounds([p[0] for p in median], [p[1] for p in median], bounds):
+            issue(ERROR, where, f"좌표가 {bounds[0]:g}~{bounds[1]:g} 범위를 벗어납니다")
+
+
+def validate_record(record, issue, bounds=BOUNDS):
+    """레코드 하나 검사 → 교차 검사용 요약 {"stroke_count", "strokes", "pronunciation", "paths"}
+
+    문제는 issue(수준, 필드, 메시지) 로 알린다.
+    """
+    summary = {}
+    strokes = record.get("strokes")
+    declared = record.get("stroke_count")
+    # hanja_database_main.json 은 획수를 "strokes" 에 숫자로 둔다
+    if isinstance(strokes, int) and not isinstance(strokes, bool) and declared is None:
+        declared, strokes = strokes, None
+
+    if declared is not None:
+        if not isinstance(declared, int) or isinstance(declared, bool) or declared <= 0:
+            issue(ERROR, "stroke_count", f"획수 {declared!r} 가 양의 정수가 아닙니다")
+            declared = None
+        else:
+            summary["stroke_count"] = declared
+
+    stroke_total = None
+    if strokes is not None:
+        if not isinstance(strokes, list):
+            issue(ERROR, "strokes", "strokes 가 목록이 아닙니다")
+        elif strokes:
+            stroke_total = len(strokes)
+            summary["strokes"] = stroke_total
+            summary["paths"] = hashlib.sha1(
+                "\n".join(_check_strokes(strokes, bounds, issue)).encode("utf-8")).hexdigest()[:16]
+            if declared is not None and declared != stroke_total:
+                issue(ERROR, "stroke_count", f"stroke_count {declared}, 획 경로 {stroke_total}개")
+
+    if "medians" in record:
+        _check_medians(record["medians"], stroke_total, bounds, issue)
+    if record.get("pronunciation"):
+        summary["pronunciation"] = record["pronunciation"]
+    return summary
+
+
+def validate_file(path, display=None, bounds=BOUNDS):
+    """파일 하나 검사 (작업 프로세스에서 실행)
+
+    {"records": {한자: [위치, 요약], ...}, "issues": [Issue 필드 목록, ...]} 를 반환한다.
+    한 파일에 같은 한자가 여러 번 나오면 요약은 처음 것만 남긴다.
+    """
+    display = display or path
+    issues, records = [], {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        return {"records": {}, "issues": [list(Issue(ERROR, display, "", "", f"읽을 수 없습니다: {e}"))]}
+
+    for char, record, where in iter_records(data):
+        def issue(level, field, message, char=char, where=where):
+            issues.append(list(Issue(level, display, char, f"{where}.{field}" if where else field, message)))
+
+        summary = validate_record(record, issue, bounds)
+        records.setdefault(char, [where, summary])
+    return {"records": records, "issues": issues}
+
+
+def cross_check(results):
+    """파일별 요약 {파일: {한자: [위치, 요약]}} → 파일 사이의 불일치 Issue 목록"""
+    by_char = {}
+    for path, records in results.items():
+        for char, (_, summary) in records.items():
+            by_char.setdefault(char, []).append((path, summary))
+
+    issues = []
+    for char in sorted(by_char, key=ord):
+        entries = by_char[char]
+        # 필드 → 값 → 파일 목록 (획수는 선언한 값이 없으면 획 경로 수)
+        values = {"stroke_count": {}, "pronunciation": {}, "paths": {}}
+        for path, summary in entries:
+            count = summary.get("stroke_count", summary.get("strokes"))
+            if count is not None:
+                values["stroke_count"].setdefault(count, []).append(path)
+            if "pronunciation" in summary:
+                values["pronunciation"].setdefault(summary["pronunciation"], []).append(path)
+            if "paths" in summary and _is_stroke_file(path):
+                values["paths"].setdefault(summary["paths"], []).append(path)
+
+        for field, label, level in (("stroke_count", "획수가", ERROR),
+                                    ("pronunciation", "독음이", WARNING),
+                                    ("paths", "획 경로가", WARNING)):
+            found = values[field]
+            if len(found) < 2:
+                continue
+            # 가장 많은 파일이 쓰는 값을 기준으로 나머지를 보고한다
+            common = max(found, key=lambda value: (len(found[value]), str(value)))
+            for value, paths in sorted(found.items(), key=lambda kv: str(kv[0])):
+                if value == common:
+                    continue
+                shown = "" if field == "paths" else f" {value} (다수: {common})"
+                for path in paths:
+                    issues.append(Issue(level, path, char, field,
+                                        f"{label} 다른 파일과 다릅니다{shown}, "
+                                        f"기준 파일 예: {found[common][0]}"))
+    return issues
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_cache(cache_file, options):
+    if not cache_file or not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != CACHE_VERSION or data.get("options") != options:
+        return {}
+    return data.get("files", {})
+
+
+def _save_cache(cache_file, options, files):
+    os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "options": options, "files": files},
+                  f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_file, cache_file)
+
+
+def validate_dataset(root=".", files=None, workers=None, cache_file=DEFAULT_CACHE_FILE,
+                     bounds=BOUNDS):
+    """데이터 파일들을 검사해 (Issue 목록, 통계) 반환
+
+    files 는 root 기준 경로 목록 (없으면 dataset_files). 내용 해시가 캐시와 같은
+    파일은 다시 검사하지 않는다. 교차 검사는 캐시된 요약으로 매번 다시 한다.
+    workers 가 1 이면 프로세스 풀 없이 검사한다.
+    """
+    files = files if files is not None else dataset_files(root)
+    cache_file = os.path.join(root, cache_file) if cache_file else None
+    options = {"bounds": list(bounds)}
+    cached = _load_cache(cache_file, options)
+
+    hashes = {path: file_hash(os.path.join(root, path)) for path in files}
+    stale = [path for path in files
+             if cached.get(path, {}).get("hash") != hashes[path]]
+
+    fresh = {}
+    if stale:
+        full_paths = [os.path.join(root, path) for path in stale]
+        if workers == 1 or len(stale) == 1:
+            outputs = map(validate_file, full_paths, stale, repeat(bounds))
+            fresh = dict(zip(stale, outputs))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = min(workers or os.cpu_count() or 1, len(stale))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # 작은 파일이 많으므로 묶어서 보낸다
+                chunk = max(1, len(stale) // (workers * 4))
+                outputs = executor.map(validate_file, full_paths, stale, repeat(bounds),
+                                       chunksize=chunk)
+                fresh = dict(zip(stale, outputs))
+
+    entries = {}
+    for path in files:
+        entry = fresh.get(path) or cached[path]
+        entries[path] = dict(entry, hash=hashes[path])
+    if cache_file and fresh:
+        # 이번에 검사하지 않은 파일의 이전 결과도 남겨 둔다 (일부 파일만 검사할 때)
+        _save_cache(cache_file, options, dict(cached, **entries))
+
+    issues = [Issue(*issue) for path in files for issue in entries[path]["issues"]]
+    issues.extend(cross_check({path: entries[path]["records"] for path in files}))
+    stats = {
+        "files": len(files),
+        "checked": len(stale),
+        "cached": len(files) - len(stale),
+        "records": sum(len(entries[path]["records"]) for path in files),
+        "errors": sum(1 for issue in issues if issue.level == ERROR),
+        "warnings": sum(1 for issue in issues if issue.level == WARNING),
+    }
+    return issues, stats
+
+
+def format_issue(issue):
+    where = f" {issue.character}" if issue.character else ""
+    where += f" {issue.where}" if issue.where else ""
+    return f"{issue.level:<8}{issue.file}{where}: {issue.message}"
+
+
+def add_arguments(parser):
+    parser.add_argument("files", nargs="*", help="검사할 파일 (root 기준, 기본: 모든 데이터 파일)")
+    parser.add_argument("--root", default=".", help="데이터 위치")
+    parser.add_argument("--workers", "-j", type=int, help="작업 프로세스 수 (기본: CPU 수, 1 이면 풀 없음)")
+    parser.add_argument("--no-cache", action="store_true", help="캐시를 쓰지 않고 모두 검사")
+    parser.add_argument("--bounds", type=float, nargs=2, default=BOUNDS, metavar=("MIN", "MAX"),
+                        help="좌표 범위")
+    parser.add_argument("--json", action="store_true", help="문제를 JSON 줄로 출력")
+    parser.add_argument("--strict", action="store_true", help="경고가 있어도 실패로 끝냄")
+
+
+def run(args):
+    """명령줄 인자대로 검사하고 종료 코드 반환 (오류가 있으면 1)"""
+    start = time.perf_counter()
+    issues, stats = validate_dataset(args.root, args.files or None, args.workers,
+                                     None if args.no_cache else DEFAULT_CACHE_FILE,
+                                     tuple(args.bounds))
+    for issue in issues:
+        print(json.dumps(issue._asdict(), ensure_ascii=False) if args.json else format_issue(issue))
+    print(f"파일 {stats['files']}개 (검사 {stats['checked']}, 캐시 {stats['cached']}), "
+          f"레코드 {stats['records']}개, 오류 {stats['errors']}, 경고 {stats['warnings']} "
+          f"({time.perf_counter() - start:.2f}초)", file=sys.stderr)
+    return 1 if stats["errors"] or (args.strict and stats["warnings"]) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="획/한자 데이터 파일 검사")
+    add_arguments(parser)
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,39 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
-import time
 import sys
 import os
-import turtle
-from turtle import Screen, Turtle
 import argparse
-import random
+
+import instrumentation
+from animation import FrameScheduler, TurtleFillReveal, TurtleReveal, turtle_scheduler
+from character_store import open_hanja_data
+
+# turtle(Tk)과 numpy 는 실제로 그릴 때만 가져온다. 목록/퀴즈만 쓸 때는 창 모듈을 읽지 않는다.
 
 # 한자 획순 데이터 로드
 def load_hanja_data(file_path='hanja_strokes.json'):
+    # 디렉터리면 흩어진 데이터를 묶은 저장소, .hjsp 팩이면 mmap 으로 열어 필요한 글자만 읽음
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return open_hanja_data(file_path)
     except FileNotFoundError:
         print(f"Error: '{file_path}' 파일을 찾을 수 없습니다.")
         sys.exit(1)
-    except json.JSONDecodeError:
+    except ValueError:
         print(f"Error: '{file_path}' 파일의 JSON 형식이 올바르지 않습니다.")
         sys.exit(1)
 
-# 곡선으로 한자 획 그리기 (자연스러운 느낌의 붓 효과)
-def draw_stroke_curve(t, x1, y1, x2, y2, steps=20):
-    # 시작점으로 이동
-    t.penup()
-    t.goto(x1, y1)
-    t.pendown()
-    
+# SVG 경로 획의 좌표 (0~100 좌표계를 -100~100 turtle 좌표계로 변환)
+def stroke_points(stroke, path_cache=None):
+    from path_cache import get_default_cache
+
+    path_cache = path_cache or get_default_cache()
+    # 연습/퀴즈 모드에서 같은 한자를 반복해 그리므로 캐시된 좌표를 재사용
+    points = path_cache.get_points(stroke['path'], tolerance=0.25, scale=2.0)
+    return [(x - 100, 100 - y) for x, y in points.tolist()]
+
+# 곡선으로 한자 획 좌표 계산 (자연스러운 느낌의 붓 효과)
+def stroke_curve_points(x1, y1, x2, y2, steps=20):
     # 획의 방향 결정
     dx = x2 - x1
     dy = y2 - y1
@@ -36,38 +41,23 @@ def draw_stroke_curve(t, x1, y1, x2, y2, steps=20):
     # 획의 길이
     length = ((dx)**2 + (dy)**2)**0.5
     
-    # 붓의 압력 효과 (시작과 끝은 더 얇게, 중간은 더 굵게)
-    original_size = t.pensize()
-    
+    points = []
     for i in range(steps + 1):
         # 현재 위치 계산
-        t = i / steps
+        s = i / steps
         
         # 약간의 곡선 효과 추가 (길이가 긴 획에만)
+        curve_x = 0
+        curve_y = 0
         if length > 30:
             curve_factor = 0.1 * length
-            curve_x = 0
-            curve_y = curve_factor * (t - 0.5)**2 * (-1 if abs(dx) > abs(dy) else 1)
-            
             if abs(dx) > abs(dy):  # 가로 방향 획
-                curve_y = curve_factor * (t - 0.5)**2 * (-1)
+                curve_y = curve_factor * (s - 0.5)**2 * (-1)
             else:  # 세로 방향 획
-                curve_x = curve_factor * (t - 0.5)**2 * (-1 if dy > 0 else 1)
-        else:
-            curve_x = 0
-            curve_y = 0
-        
-        # 압력 효과 (붓의 굵기 변화)
-        pressure = 1 - 0.7 * (2*t - 1)**2  # 중간에 최대 압력
-        t.pensize(original_size * pressure)
-        
-        # 다음 점으로 이동
-        next_x = x1 + dx * t + curve_x
-        next_y = y1 + dy * t + curve_y
-        t.goto(next_x, next_y)
+                curve_x = curve_factor * (s - 0.5)**2 * (-1 if dy > 0 else 1)
+        points.append((x1 + dx * s + curve_x, y1 + dy * s + curve_y))
     
-    # 펜 크기 복원
-    t.pensize(original_size)
+    return points
 
 # 한자 그리기 함수 (향상된 버전)
 def draw_hanja_enhanced(hanja_char, hanja_data, delay=0.5, pen_size=5, grid=True, 
@@ -77,6 +67,10 @@ def draw_hanja_enhanced(hanja_char, hanja_data, delay=0.5, pen_size=5, grid=True
         print(f"사용 가능한 한자: {', '.join(hanja_data.keys())}")
         return
 
+    from turtle import Screen, Turtle
+    from background_layer import set_turtle_background
+    from stroke_tessellation import tessellate
+
     # 화면 설정
     screen = Screen()
     screen.title(f"한자 획순 - {hanja_char} ({hanja_data[hanja_char]['meaning']})")
@@ -86,40 +80,8 @@ def draw_hanja_enhanced(hanja_char, hanja_data, delay=0.5, pen_size=5, grid=True
     # 스크린 트래커 비활성화 (더 빠른 그리기)
     screen.tracer(0)
 
-    # 그리드 그리기 (옵션)
-    if grid:
-        grid_drawer = Turtle()
-        grid_drawer.hideturtle()
-        grid_drawer.speed(0)
-        grid_drawer.pencolor("lightgray")
-        grid_drawer.pensize(1)
-        
-        # 세로선
-        for x in range(-100, 101, 20):
-            grid_drawer.penup()
-            grid_drawer.goto(x, -100)
-            grid_drawer.pendown()
-            grid_drawer.goto(x, 100)
-        
-        # 가로선
-        for y in range(-100, 101, 20):
-            grid_drawer.penup()
-            grid_drawer.goto(-100, y)
-            grid_drawer.pendown()
-            grid_drawer.goto(100, y)
-
-    # 한자 테두리 그리기
-    border = Turtle()
-    border.hideturtle()
-    border.speed(0)
-    border.pencolor("gray")
-    border.pensize(2)
-    border.penup()
-    border.goto(-100, -100)
-    border.pendown()
-    for _ in range(4):
-        border.forward(200)
-        border.left(90)
+    # 그리드와 테두리는 캐시된 배경 그림 한 장으로 깐다
+    set_turtle_background(screen, 500, 500, grid, bg_color, border="gray")
 
     # 획순 번호 표시 준비
     number_turtles = []
@@ -148,100 +110,162 @@ def draw_hanja_enhanced(hanja_char, hanja_data, delay=0.5, pen_size=5, grid=True
     t.pensize(pen_size)
     t.pencolor(pen_color)
 
-    # 스크린 업데이트 함수
-    def update_screen():
-        screen.update()
-        screen.ontimer(lambda: None, int(delay * 1000))  # 지연 설정
-
-    # 획순대로 그리기
+    # 획마다 중심선 좌표 미리 계산
     strokes = hanja_data[hanja_char]['strokes']
-    for i, stroke in enumerate(strokes, 1):
-        # 획 정보 표시
-        info.clear()
-        info.write(f"{hanja_char} ({hanja_data[hanja_char]['meaning']}) - {i}/{hanja_data[hanja_char]['stroke_count']}획: {stroke['desc']}", 
-                  align="center", font=("Arial", 12, "bold"))
+    polylines = []
+    with instrumentation.span("stroke_points"):
+        for stroke in strokes:
+            if 'path' in stroke:
+                # SVG 경로 획은 경로를 따라 그리기
+                polylines.append(stroke_points(stroke))
+                continue
         
-        # 좌표 변환
-        x1, y1 = stroke['x1'] - 100, 100 - stroke['y1']
-        x2, y2 = stroke['x2'] - 100, 100 - stroke['y2']
+            # 좌표 변환
+            x1, y1 = stroke['x1'] - 100, 100 - stroke['y1']
+            x2, y2 = stroke['x2'] - 100, 100 - stroke['y2']
         
-        # 획 그리기 (곡선 또는 직선)
-        if curve:
-            draw_stroke_curve(t, x1, y1, x2, y2)
-        else:
-            t.penup()
-            t.goto(x1, y1)
-            t.pendown()
-            t.goto(x2, y2)
+            # 획 그리기 (곡선 또는 직선)
+            if curve:
+                polylines.append(stroke_curve_points(x1, y1, x2, y2))
+            else:
+                polylines.append([(x1, y1), (x2, y2)])
+    
+    # 새 획을 그리기 시작할 때 정보와 획 번호 갱신
+    def on_stroke(index):
+        i = index + 1
+        info.clear()
+        info.goto(0, -150)
+        info.color("blue")
+        info.write(f"{hanja_char} ({hanja_data[hanja_char]['meaning']}) - {i}/{hanja_data[hanja_char]['stroke_count']}획: {strokes[index]['desc']}", 
+                  align="center", font=("Arial", 12, "bold"))
         
-        # 획 번호 표시
         if show_stroke_order:
+            # 뒤로 탐색한 경우 이후 획의 번호는 지움
+            for num_turtle in number_turtles[index:]:
+                num_turtle.clear()
             # 획의 중간 위치에 번호 표시
-            num_turtle = number_turtles[i-1]
-            mid_x = (x1 + x2) / 2
-            mid_y = (y1 + y2) / 2
-            num_turtle.goto(mid_x, mid_y)
-            num_turtle.write(str(i), align="center", font=("Arial", 8, "bold"))
+            if index < len(number_turtles):
+                points = polylines[index]
+                (x1, y1), (x2, y2) = points[0], points[-1]
+                num_turtle = number_turtles[index]
+                num_turtle.goto((x1 + x2) / 2, (y1 + y2) / 2)
+                num_turtle.write(str(i), align="center", font=("Arial", 8, "bold"))
+    
+    if curve:
+        # 붓 효과: 굵기가 변하는 획 외곽선을 미리 계산해 다각형 하나로 채움
+        with instrumentation.span("tessellate"):
+            outlines = [tessellate(points, pen_size, "brush") for points in polylines]
+        active = t.clone()
+        t.fillcolor(pen_color)
+        active.fillcolor(pen_color)
+        reveal = TurtleFillReveal(t, active, outlines, on_stroke)
+    else:
+        reveal = TurtleReveal(t, polylines, on_stroke)
+    
+    def on_frame(progress):
+        reveal.show(progress)
+        with instrumentation.span("screen_update"):
+            screen.update()
+    
+    def on_finish():
+        # 최종 정보 표시
+        info.clear()
+        info.write(f"{hanja_char} ({hanja_data[hanja_char]['meaning']}) - 완성 (총 {hanja_data[hanja_char]['stroke_count']}획)", 
+                  align="center", font=("Arial", 12, "bold"))
         
-        # 화면 업데이트
-        update_screen()
-        time.sleep(delay)
-
-    # 최종 정보 표시
-    info.clear()
-    info.write(f"{hanja_char} ({hanja_data[hanja_char]['meaning']}) - 완성 (총 {hanja_data[hanja_char]['stroke_count']}획)", 
-              align="center", font=("Arial", 12, "bold"))
-
-    # 추가 정보 메시지
-    info.goto(0, -170)
-    info.color("darkgreen")
-    info.write("클릭하여 종료하세요", align="center", font=("Arial", 10, "normal"))
+        # 추가 정보 메시지
+        info.goto(0, -170)
+        info.color("darkgreen")
+        info.write("클릭하여 종료하세요", align="center", font=("Arial", 10, "normal"))
+        
+        # 마지막 화면 업데이트
+        screen.update()
+    
+    # 획마다 delay 초씩, 이벤트 루프의 타이머로 애니메이션 (time.sleep 없음)
+    scheduler = FrameScheduler(turtle_scheduler(screen), max(delay, 0.01) * len(polylines),
+                               on_frame, on_finish)
+    
+    # 애니메이션 제어: 스페이스 일시정지, 좌우 화살표 한 획씩 이동, +/- 속도
+    screen.onkey(scheduler.toggle_pause, "space")
+    screen.onkey(lambda: scheduler.seek_by(-delay), "Left")
+    screen.onkey(lambda: scheduler.seek_by(delay), "Right")
+    screen.onkey(lambda: scheduler.set_speed(scheduler.speed * 1.5), "plus")
+    screen.onkey(lambda: scheduler.set_speed(scheduler.speed / 1.5), "minus")
+    screen.listen()
     
-    # 마지막 화면 업데이트
-    screen.update()
+    scheduler.start()
     screen.exitonclick()
 
 # 연습 모드: 한자를 여러 번 반복해서 그리기
-def practice_mode(hanja_char, hanja_data, repetitions=3, delay=0.3):
+def practice_mode(hanja_char, hanja_data, repetitions=3, delay=0.3, scheduler=None):
     print(f"'{hanja_char}' 연습 모드를 시작합니다. {repetitions}회 반복합니다.")
     for i in range(repetitions):
         print(f"연습 {i+1}/{repetitions}...")
         draw_hanja_enhanced(hanja_char, hanja_data, delay=delay, curve=True)
+    # 채점 없이 획순을 보기만 했으므로 본 기록만 남기고 복습 일정은 바꾸지 않는다
+    if scheduler is not None:
+        scheduler.record_seen(hanja_char, kind="practice")
+
+# 퀴즈 모드: 무작위 한자에 대한 객관식 문제 (기본은 총 획수 맞추기)
+def quiz_mode(hanja_data, num_questions=3, show=True, kinds=("stroke_count",), generator=None,
+              scheduler=None):
+    from quiz_generator import QuizGenerator
 
-# 퀴즈 모드: 무작위 한자 선택 후 획순 맞추기
-def quiz_mode(hanja_data, num_questions=3):
     print(f"한자 획순 퀴즈 모드를 시작합니다. 총 {num_questions}문제입니다.")
     score = 0
     
-    # 한자 목록에서 무작위 선택
-    hanja_list = list(hanja_data.keys())
-    quiz_items = random.sample(hanja_list, min(num_questions, len(hanja_list)))
+    # 오답 후보 표는 저장된 것을 쓰고 (낡았으면 다시 만들어 저장), 문제마다 몇 개씩만 뽑는다
+    generator = generator or QuizGenerator.open(hanja_data)
+    # 학습자 상태가 있으면 복습할 때가 된 한자를 이른 순서로 한 번씩 먼저 내고,
+    # 남은 문제는 전체에서 출제
+    due = []
+    if scheduler is not None:
+        due = [char for char in scheduler.peek_due(limit=num_questions) if char in hanja_data]
+    questions = generator.questions(num_questions, kinds, characters=hanja_data.keys(), first=due)
+    # 한 세션에서 같은 한자의 결과는 처음 한 번만 기록 (복습 단계를 여러 번 올리지 않음)
+    recorded = set()
     
-    for i, hanja_char in enumerate(quiz_items, 1):
-        print(f"\n문제 {i}/{num_questions}: {hanja_char} ({hanja_data[hanja_char]['meaning']})")
-        correct_count = hanja_data[hanja_char]['stroke_count']
+    for i, question in enumerate(questions, 1):
+        hanja_char = question.character
+        print(f"\n문제 {i}/{num_questions}: {question.prompt}")
+        for n, choice in enumerate(question.choices, 1):
+            print(f"  {n}) {choice}")
+        correct = f"{question.answer + 1}) {question.choices[question.answer]}"
+        suffix = " 획순을 보여드립니다." if show else ""
         
+        is_correct = False
         try:
-            user_answer = int(input(f"이 한자의 총 획수는 몇 획인가요? "))
-            if user_answer == correct_count:
-                print("정답입니다! 획순을 보여드립니다.")
+            user_answer = int(input("번호를 입력하세요: "))
+            is_correct = user_answer == question.answer + 1
+            if is_correct:
+                print("정답입니다!" + suffix)
                 score += 1
             else:
-                print(f"틀렸습니다. 정답은 {correct_count}획입니다. 획순을 보여드립니다.")
-            
-            # 획순 보여주기
-            draw_hanja_enhanced(hanja_char, hanja_data, delay=0.5)
+                print(f"틀렸습니다. 정답은 {correct}입니다." + suffix)
             
         except ValueError:
             print("숫자를 입력해주세요.")
-            print(f"정답은 {correct_count}획입니다. 획순을 보여드립니다.")
+            print(f"정답은 {correct}입니다." + suffix)
+        
+        if scheduler is not None and hanja_char not in recorded:
+            recorded.add(hanja_char)
+            scheduler.record(hanja_char, is_correct, kind="quiz")
+        
+        # 획순 보여주기 (show=False 면 창을 띄우지 않는 텍스트 퀴즈)
+        if show:
             draw_hanja_enhanced(hanja_char, hanja_data, delay=0.5)
     
     print(f"\n퀴즈 결과: {num_questions}문제 중 {score}문제 정답")
     print(f"정답률: {score/num_questions*100:.1f}%")
 
-# 사용 가능한 한자 목록 출력
-def list_available_hanja(hanja_data):
+# 사용 가능한 한자 목록 출력 (query 가 있으면 독음/뜻/예시 단어로 찾은 한자만)
+def list_available_hanja(hanja_data, query=None):
+    if query:
+        from hanja_search import suggest
+        found = suggest(query, hanja_data)
+        if found:
+            print(f"\n'{query}' 로 찾은 한자: {', '.join(found)}")
+            return
     print("\n사용 가능한 한자:")
     for char, data in hanja_data.items():
         print(f"  {char} - {data['meaning']} ({data['stroke_count']}획)")
@@ -251,18 +275,41 @@ def main():
     # 명령줄 인자 파싱
     parser = argparse.ArgumentParser(description='한자 획순 학습 프로그램')
     parser.add_argument('hanja', nargs='?', help='표시할 한자 (예: 永)')
-    parser.add_argument('--data', '-d', default='hanja_strokes.json', help='한자 데이터 파일 경로')
+    parser.add_argument('--data', '-d', default='hanja_strokes.json', help='한자 데이터 파일 경로 (.json 또는 .hjsp 팩, 디렉터리면 전체 데이터 색인 사용)')
     parser.add_argument('--practice', '-p', action='store_true', help='연습 모드 활성화')
     parser.add_argument('--quiz', '-q', action='store_true', help='퀴즈 모드 활성화')
     parser.add_argument('--count', '-c', type=int, default=3, help='연습 횟수 또는 퀴즈 문제 수')
     parser.add_argument('--delay', type=float, default=0.5, help='획 사이의 지연 시간 (초)')
     parser.add_argument('--dark', action='store_true', help='다크 모드 활성화')
+    parser.add_argument('--cache-file', help='경로 캐시 파일 (.npz, 재시작 시 재사용)')
+    parser.add_argument('--learner', help='학습자 상태 파일 (예: data/learning/default_user.json, 결과를 기록하고 복습할 한자부터 출제)')
+    instrumentation.add_profile_argument(parser)
     
     args = parser.parse_args()
+    instrumentation.start(args)
     
     # 한자 데이터 로드
     hanja_data = load_hanja_data(args.data)
     
+    # 경로 캐시 설정 (파일을 지정하면 이전 실행의 결과로 미리 채움)
+    from path_cache import PathCache, get_default_cache, set_default_cache
+    if args.cache_file:
+        set_default_cache(PathCache(cache_file=args.cache_file))
+    # 학습자 상태 (결과는 이벤트 로그에 기록하고 끝날 때 요약을 저장)
+    scheduler = None
+    if args.learner:
+        from review_scheduler import ReviewScheduler
+        scheduler = ReviewScheduler(args.learner)
+    try:
+        run_mode(args, hanja_data, scheduler)
+    finally:
+        get_default_cache().save()
+        if scheduler is not None:
+            scheduler.close()
+        instrumentation.report(args)
+
+# 선택된 모드 실행
+def run_mode(args, hanja_data, scheduler=None):
     # 화면 스타일 설정
     bg_color = "black" if args.dark else "white"
     pen_color = "white" if args.dark else "black"
@@ -270,14 +317,14 @@ def main():
     # 모드 선택 및 실행
     if args.quiz:
         # 퀴즈 모드
-        quiz_mode(hanja_data, args.count)
+        quiz_mode(hanja_data, args.count, scheduler=scheduler)
     elif args.practice and args.hanja:
         # 연습 모드
         if args.hanja in hanja_data:
-            practice_mode(args.hanja, hanja_data, args.count, args.delay)
+            practice_mode(args.hanja, hanja_data, args.count, args.delay, scheduler)
         else:
             print(f"Error: '{args.hanja}' 한자의 데이터가 없습니다.")
-            list_available_hanja(hanja_data)
+            list_available_hanja(hanja_data, args.hanja)
     elif args.hanja:
         # 단일 한자 표시 모드
         if args.hanja in hanja_data:
@@ -285,7 +332,7 @@ def main():
                               bg_color=bg_color, pen_color=pen_color)
         else:
             print(f"Error: '{args.hanja}' 한자의 데이터가 없습니다.")
-            list_available_hanja(hanja_data)
+            list_available_hanja(hanja_data, args.hanja)
     else:
         # 인터랙티브 모드
         print("한자 획순 학습 프로그램에 오신 것을 환영합니다!")
@@ -311,6 +358,7 @@ def main():
                                           bg_color=bg_color, pen_color=pen_color)
                     else:
                         print(f"Error: '{hanja_char}' 한자의 데이터가 없습니다.")
+                        list_available_hanja(hanja_data, hanja_char)
             
             elif mode == 2:
                 # 연습 모드
@@ -318,21 +366,22 @@ def main():
                 if hanja_char in hanja_data:
                     try:
                         count = int(input("반복 횟수를 입력하세요 (기본값: 3): ") or "3")
-                        practice_mode(hanja_char, hanja_data, count, args.delay)
+                        practice_mode(hanja_char, hanja_data, count, args.delay, scheduler)
                     except ValueError:
                         print("유효한 숫자를 입력해주세요. 기본값 3으로 설정합니다.")
-                        practice_mode(hanja_char, hanja_data, 3, args.delay)
+                        practice_mode(hanja_char, hanja_data, 3, args.delay, scheduler)
                 else:
                     print(f"Error: '{hanja_char}' 한자의 데이터가 없습니다.")
+                    list_available_hanja(hanja_data, hanja_char)
             
             elif mode == 3:
                 # 퀴즈 모드
                 try:
                     count = int(input("문제 수를 입력하세요 (기본값: 3): ") or "3")
-                    quiz_mode(hanja_data, count)
+                    quiz_mode(hanja_data, count, scheduler=scheduler)
                 except ValueError:
                     print("유효한 숫자를 입력해주세요. 기본값 3으로 설정합니다.")
-                    quiz_mode(hanja_data, 3)
+                    quiz_mode(hanja_data, 3, scheduler=scheduler)
             
             else:
                 print("잘못된 선택입니다. 프로그램을 종료합니다.")
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""획 좌표 단순화 (Ramer–Douglas–Peucker)
+
+허용 오차는 데이터 좌표계 (0~100) 기준이다. 1.0 이면 500 픽셀 캔버스에서 5 픽셀.
+
+실행 중 (그리기 전):
+    평탄화한 획 좌표에서 거의 일직선인 점을 뺀다. HanjaDrawer(simplify=0.2) 나
+    드로어의 --simplify 로 켜면, 굵기 구간과 애니메이션 순서는 평탄화한 점 번호로
+    정한 뒤 캔버스에 넘길 좌표만 줄인다. 고정 steps 평탄화는 직선도 50 개 점으로
+    나누므로 효과가 크다.
+
+데이터 일괄 변환:
+    획 경로는 거의 곧은 곡선 (Q, C) 을 직선 L 로 바꾸고, 이어진 직선들의 중간
+    꼭짓점 가운데 빼도 되는 것을 뺀다. medians 는 점 목록에 RDP 를 적용한다.
+    파일마다 점 수와 바이트 절감, 실제로 잰 최대 오차를 보고한다.
+
+오차 한계: 일괄 변환은 곡선을 직선으로 바꾸는 단계와 꼭짓점을 빼는 단계에 허용
+오차를 절반씩 나누므로, 바뀐 획은 원래 획에서 허용 오차 이내에 있다 (베지어 곡선은
+제어점의 볼록 껍질 안에 있으므로 제어점과 현 사이의 거리가 곡선의 오차 한계다).
+실행 중 단순화도 허용 오차 이내이므로 둘을 함께 쓰면 두 허용 오차의 합 이내다.
+보고서의 최대 오차는 이 한계가 아니라 원래 획과 실제로 그려질 점을 비교해 잰 값이다.
+
+사용 예:
+    python geometry_simplify.py --tolerance 0.5             # 보고만
+    python geometry_simplify.py --tolerance 0.5 --write     # 파일 다시 쓰기
+    python geometry_simplify.py data/strokes/山.json --json
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+# 데이터 일괄 변환의 기본 허용 오차 (데이터 좌표)
+DEFAULT_TOLERANCE = 0.5
+# 오차를 잴 때 원래 획을 평탄화하는 허용 오차
+MEASURE_TOLERANCE = 0.01
+# 다시 쓰는 좌표의 소수 자리
+DECIMALS = 2
+
+# 파일 하나의 결과 (measure_records 참고)
+#   render_points: 그릴 때 만들어지는 획 점 수, data_points: 파일에 든 경로 선분 + medians 점 수
+#   max_error: 원래 획과 단순화 후 실제로 그려질 점 사이의 최대 거리 (데이터 좌표)
+FileReport = namedtuple("FileReport",
+                        ["file", "records", "render_points_before", "render_points_after",
+                         "data_points_before", "data_points_after", "bytes_before", "bytes_after",
+                         "max_error"])
+
+
+def segment_distances(points, start, end):
+    """점들 (N, 2) 과 선분 start-end 사이의 거리 (N,)"""
+    points = np.asarray(points, dtype=np.float64)
+    start = np.asarray(start, dtype=np.float64)
+    direction = np.asarray(end, dtype=np.float64) - start
+    length2 = float(direction @ direction)
+    if length2 == 0:
+        return np.hypot(*(points - start).T)
+    t = np.clip((points - start) @ direction / length2, 0.0, 1.0)
+    return np.hypot(*(points - start - t[:, None] * direction).T)
+
+
+def rdp_mask(points, tolerance):
+    """RDP 로 남길 점의 불리언 마스크 (양 끝은 항상 남김)"""
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    # 재귀 대신 구간 스택
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = segment_distances(points[first + 1:last], points[first], points[last])
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            split = first + 1 + i
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+def simplify_points(points, tolerance):
+    """(N, 2) 좌표 배열의 RDP 단순화 (tolerance 가 없거나 0 이면 그대로)"""
+    if not tolerance or len(points) < 3:
+        return points
+    return np.ascontiguousarray(np.asarray(points)[rdp_mask(points, tolerance)])
+
+
+def polyline_deviation(points, polyline):
+    """points 의 각 점에서 polyline 까지의 거리 가운데 최댓값"""
+    points = np.asarray(points, dtype=np.float64)
+    polyline = np.asarray(polyline, dtype=np.float64)
+    if not len(points):
+        return 0.0
+    if len(polyline) == 1:
+        return float(np.hypot(*(points - polyline[0]).T).max())
+    # (점, 선분) 거리 행렬에서 점마다 가장 가까운 선분
+    start = polyline[:-1][None]
+    direction = (polyline[1:] - polyline[:-1])[None]
+    length2 = np.maximum((direction ** 2).sum(axis=2), 1e-12)
+    offset = points[:, None] - start
+    t = np.clip((offset * direction).sum(axis=2) / length2, 0.0, 1.0)
+    distances = np.hypot(*(offset - t[..., None] * direction).transpose(2, 0, 1))
+    return float(distances.min(axis=1).max())
+
+
+def max_deviation(a, b):
+    """두 폴리라인 사이의 (대칭) 하우스도르프 거리"""
+    return max(polyline_deviation(a, b), polyline_deviation(b, a))
+
+
+# 획 경로
+
+def _format_number(value):
+    text = f"{value:.{DECIMALS}f}".rstrip("0").rstrip(".")
+    return "0" if text in ("-0", "") else text
+
+
+def _format_points(*points):
+    return " ".join(f"{_format_number(x)} {_format_number(y)}" for x, y in points)
+
+
+def simplify_path(path_str, tolerance):
+    """획 경로 문자열 단순화 → 새 경로 문자열 (바뀐 것이 없으면 원래 문자열)
+
+    곡선 가운데 제어점이 현에서 tolerance / 2 이내인 것은 직선으로 바꾸고,
+    이어진 직선의 꼭짓점은 RDP (tolerance / 2) 로 줄인다. 결과는 절대 좌표의
+    M / L / Q / C 명령이다.
+    """
+    from path_flattener import SEG_CUBIC, SEG_LINE, SEG_MOVE, SEG_QUAD, compile_path
+
+    segments, kinds = compile_path(path_str)
+    half = tolerance / 2
+    changed = False
+    # (명령, 점 목록). L 은 꼭짓점을 하나씩 두고 나중에 이어진 것끼리 줄인다
+    commands = []
+    for segment, kind in zip(segments, kinds):
+        p0, c1, c2, p3 = segment
+        if kind == SEG_MOVE:
+            commands.append(("M", [p0]))
+            continue
+        if kind != SEG_LINE and segment_distances(segment[1:3], p0, p3).max() <= half:
+            kind = SEG_LINE
+            changed = True
+        if kind == SEG_LINE:
+            commands.append(("L", [p3]))
+        elif kind == SEG_QUAD:
+            # compile_path 가 올린 차수를 되돌린다
+            commands.append(("Q", [(3 * c1 - p0) / 2, p3]))
+        else:
+            assert kind == SEG_CUBIC
+            commands.append(("C", [c1, c2, p3]))
+
+    parts = []
+    current = None
+    i = 0
+    while i < len(commands):
+        cmd, points = commands[i]
+        if cmd != "L":
+            parts.append(f"{cmd} {_format_points(*points)}")
+            current = points[-1]
+            i += 1
+            continue
+        # 이어진 직선 꼭짓점 묶음
+        run = [current]
+        while i < len(commands) and commands[i][0] == "L":
+            run.append(commands[i][1][0])
+            i += 1
+        mask = rdp_mask(np.array(run), half)
+        if not mask.all():
+            changed = True
+        parts.append(f"L {_format_points(*np.array(run)[mask][1:])}")
+        current = run[-1]
+
+    return " ".join(parts) if changed else path_str
+
+
+def simplify_median(median, tolerance):
+    """medians 의 획 하나 ([[x, y], ...]) 단순화 (정수 좌표는 정수로 둔다)"""
+    if len(median) < 3:
+        return median
+    mask = rdp_mask(np.array(median, dtype=np.float64), tolerance)
+    return [point for point, keep in zip(median, mask) if keep]
+
+
+# 레코드 / 파일
+
+def _stroke_path(stroke):
+    return stroke if isinstance(stroke, str) else stroke.get("path") if isinstance(stroke, dict) else None
+
+
+def simplify_record(record, tolerance):
+    """레코드의 strokes 와 medians 를 제자리에서 단순화 → 바뀐 값 [(원래 값, 새 값), ...]"""
+    replacements = []
+    strokes = record.get("strokes")
+    if isinstance(strokes, list):
+        for i, stroke in enumerate(strokes):
+            path_str = _stroke_path(stroke)
+            if not isinstance(path_str, str):
+                continue
+            new_path = simplify_path(path_str, tolerance)
+            if new_path != path_str:
+                replacements.append((path_str, new_path))
+                if isinstance(stroke, str):
+                    strokes[i] = new_path
+                else:
+                    stroke["path"] = new_path
+
+    medians = record.get("medians")
+    if isinstance(medians, list):
+        for i, median in enumerate(medians):
+            if isinstance(median, list):
+                new_median = simplify_median(median, tolerance)
+                if len(new_median) != len(median):
+                    replacements.append((median, new_median))
+                    medians[i] = new_median
+    return replacements
+
+
+def _dump(data, original_text):
+    """원래 파일과 같은 들여쓰기로 JSON 문자열 만들기"""
+    if original_text.startswith(("{\n", "[\n")):
+        line = original_text.split("\n", 2)[1]
+        indent = len(line) - len(line.lstrip(" "))
+        text = json.dumps(data, ensure_ascii=False, indent=indent or 2)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return text + ("\n" if original_text.endswith("\n") else "")
+
+
+def rewrite_text(text, data, replacements):
+    """바뀐 데이터를 원래 파일 모양을 살려 문자열로
+
+    다시 직렬화해도 원래 파일과 똑같이 나오는 파일은 통째로 다시 쓰고, 손으로
+    정리한 파일 (한 줄짜리 medians 등) 은 바뀐 값의 JSON 표기만 찾아 바꾼다.
+    표기를 찾지 못한 값은 바꾸지 않는다.
+    """
+    if _dump(json.loads(text), text) == text:
+        return _dump(data, text)
+    for old, new in replacements:
+        for separators in ((", ", ": "), (",", ":")):
+            text = text.replace(json.dumps(old, ensure_ascii=False, separators=separators),
+                                json.dumps(new, ensure_ascii=False, separators=separators))
+    return text
+
+
+def measure_records(before, after, tolerance):
+    """같은 구조의 원본/단순화 데이터 비교 → (레코드 수, 점 수 4개, 최대 오차)
+
+    점 수: 렌더 점 (기본 steps 평탄화) 전/후 (후는 실행 중 단순화까지 적용),
+    데이터 점 (경로 선분 + medians 점) 전/후. 최대 오차는 원래 획을 촘촘히
+    평탄화한 것과 실제로 그려질 점 사이의 하우스도르프 거리다.
+    """
+    from dataset_validator import iter_records
+    from path_flattener import compile_path, flatten_compiled, flatten_path
+
+    records = render_before = render_after = data_before = data_after = 0
+    error = 0.0
+    for (_, old, _), (_, new, _) in zip(iter_records(before), iter_records(after)):
+        records += 1
+        old_strokes = old.get("strokes") if isinstance(old.get("strokes"), list) else []
+        new_strokes = new.get("strokes") if isinstance(new.get("strokes"), list) else []
+        for old_stroke, new_stroke in zip(old_strokes, new_strokes):
+            old_path, new_path = _stroke_path(old_stroke), _stroke_path(new_stroke)
+            if not isinstance(old_path, str) or not isinstance(new_path, str):
+                continue
+            drawn = simplify_points(flatten_path(new_path), tolerance)
+            render_before += len(flatten_path(old_path))
+            render_after += len(drawn)
+            data_before += len(compile_path(old_path).kinds)
+            data_after += len(compile_path(new_path).kinds)
+            fine = flatten_compiled(compile_path(old_path), tolerance=MEASURE_TOLERANCE)
+            error = max(error, max_deviation(fine, drawn))
+        old_medians = old.get("medians") if isinstance(old.get("medians"), list) else []
+        new_medians = new.get("medians") if isinstance(new.get("medians"), list) else []
+        data_before += sum(len(m) for m in old_medians if isinstance(m, list))
+        data_after += sum(len(m) for m in new_medians if isinstance(m, list))
+        for old_median, new_median in zip(old_medians, new_medians):
+            if isinstance(old_median, list) and len(old_median) != len(new_median):
+                error = max(error, max_deviation(old_median, new_median))
+    return records, render_before, render_after, data_before, data_after, error
+
+
+def simplify_file(path, tolerance=DEFAULT_TOLERANCE, write=False, display=None):
+    """파일 하나의 레코드를 모두 단순화해 FileReport 반환 (write 면 파일을 다시 씀)"""
+    from dataset_validator import iter_records
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    data = json.loads(text)
+    replacements = []
+    for _, record, _ in iter_records(data):
+        replacements.extend(simplify_record(record, tolerance))
+    new_text = rewrite_text(text, data, replacements) if replacements else text
+
+    measured = measure_records(json.loads(text), json.loads(new_text), tolerance)
+    if write and new_text != text:
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(new_text)
+        os.replace(tmp_file, path)
+    return FileReport(display or path, *measured[:5], len(text.encode("utf-8")),
+                      len(new_text.encode("utf-8")), round(measured[5], 4))
+
+
+def stroke_files(root="."):
+    """획 경로/medians 를 담은 데이터 파일 목록 (root 기준)"""
+    from dataset_validator import _is_stroke_file, dataset_files
+
+    return [path for path in dataset_files(root) if _is_stroke_file(path)]
+
+
+def _percent(before, after):
+    return (before - after) / before * 100 if before else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="획 경로와 medians 좌표 단순화 (RDP)")
+    parser.add_argument("files", nargs="*", help="대상 파일 (root 기준, 기본: 모든 획 데이터 파일)")
+    parser.add_argument("--root", default=".", help="데이터 위치")
+    parser.add_argument("--tolerance", "-t", type=float, default=DEFAULT_TOLERANCE,
+                        help="허용 오차 (데이터 좌표 0~100 기준, 실행 중 단순화에도 같은 값으로 잼)")
+    parser.add_argument("--write", action="store_true", help="파일을 단순화한 내용으로 다시 쓰기")
+    parser.add_argument("--json", action="store_true", help="파일별 결과를 JSON 줄로 출력")
+    args = parser.parse_args()
+
+    if args.tolerance <= 0:
+        parser.error("--tolerance 는 0 보다 커야 합니다")
+    files = args.files or stroke_files(args.root)
+    totals = [0] * 7
+    worst = 0.0
+    if not args.json:
+        print(f"{'파일':<36}{'렌더 점 (전 → 후)':>22}{'데이터 점':>16}{'바이트 (전 → 후)':>22}{'최대 오차':>10}")
+    for path in files:
+        report = simplify_file(os.path.join(args.root, path), args.tolerance, args.write, path)
+        totals = [t + v for t, v in zip(totals, report[1:8])]
+        worst = max(worst, report.max_error)
+        if args.json:
+            print(json.dumps(report._asdict(), ensure_ascii=False))
+        else:
+            print(f"{report.file:<36}{report.render_points_before:>9} → {report.render_points_after:<6}"
+                  f"{_percent(report.render_points_before, report.render_points_after):>5.0f}%"
+                  f"{report.data_points_before:>7} → {report.data_points_after:<6}"
+                  f"{report.bytes_before:>9} → {report.bytes_after:<7}"
+                  f"{_percent(report.bytes_before, report.bytes_after):>5.1f}%{report.max_error:>10.3f}")
+
+    _, render_before, render_after, data_before, data_after, bytes_before, bytes_after = totals
+    action = "다시 씀" if args.write else "보고만 함 (--write 로 다시 쓰기)"
+    print(f"파일 {len(files)}개: 렌더 점 {render_before} → {render_after} "
+          f"({_percent(render_before, render_after):.1f}% 절감), 데이터 점 {data_before} → {data_after} "
+          f"({_percent(data_before, data_after):.1f}%), 바이트 {bytes_before} → {bytes_after} "
+          f"({_percent(bytes_before, bytes_after):.1f}%), 최대 오차 {worst:.3f} "
+          f"(한계 {2 * args.tolerance:g}), {action}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""한글 독음, 뜻, 예시 단어로 한자 찾기 (역색인)
+
+data/new-structure/characters/ 의 hanja_extended.json, hanja_characters.json 에서
+한자마다 음(pronunciation), 뜻(meaning), 예시 단어(common_words 의 한자어, 읽기,
+뜻)를 모아 역색인을 만들고 .cache/search_index.json 에 저장한다. 원본 파일의
+(mtime, 크기)가 바뀌었을 때만 다시 만든다. 검색할 때는 JSON 원본을 읽지 않는다.
+
+찾는 방법 (점수는 필드 가중치 × 일치 종류 가중치의 합):
+- 정확히 같은 낱말: "일" → 음이 "일" 인 한자, 뜻에 "일" 이 있는 한자
+- 앞부분 일치: 한글은 자모 단위로 비교하므로 입력 중인 "하" 나 "학ㄱ" 도 "학교" 에 맞음
+- 2-gram: 낱말 가운데의 두 글자 일치 ("교생" → "학교생활")
+- 한자: 한 글자면 그 한자, 여러 글자면 그 한자어와 각 글자
+
+    index = SearchIndex.open()
+    for result in index.search("물"):
+        result.character, result.meaning, result.score
+
+사용 예:
+    python hanja_search.py 일
+    python hanja_search.py 학교 --limit 5
+    python hanja_search.py --rebuild
+"""
+
+import argparse
+import bisect
+import json
+import os
+import sys
+import unicodedata
+from collections import namedtuple
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_FILE = os.path.join(".cache", "search_index.json")
+# 앞에 있는 파일의 뜻/음이 우선하고, 예시 단어는 모두 합친다
+DEFAULT_SOURCES = [
+    os.path.join("data", "new-structure", "characters", "hanja_extended.json"),
+    os.path.join("data", "new-structure", "characters", "hanja_characters.json"),
+]
+
+# 필드 → 가중치 (필드 번호는 이 순서)
+FIELDS = ("character", "pronunciation", "meaning", "word", "word_pronunciation", "word_meaning")
+FIELD_WEIGHTS = (10.0, 8.0, 6.0, 4.0, 3.0, 2.0)
+
+# 일치 종류 가중치
+EXACT, PREFIX, GRAM = 1.0, 0.5, 0.3
+# 한자어 검색에서 낱글자가 맞을 때 (character 필드 가중치에 곱함)
+HANJA_PART = 0.4
+
+SearchResult = namedtuple("SearchResult",
+                          ["character", "score", "meaning", "pronunciation", "stroke_count", "fields"])
+
+# 한글 음절 → 호환 자모 (입력기로 치는 자모와 같은 문자)
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+              "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+
+def jamo(text):
+    """한글 음절을 자모로 풀기 ("학교" → "ㅎㅏㄱㄱㅛ"), 나머지 문자는 그대로"""
+    result = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(_CHOSEONG[code // 588])
+            result.append(_JUNGSEONG[code % 588 // 28])
+            result.append(_JONGSEONG[code % 28])
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def is_hanja(char):
+    return ord(char) >= 0x3400 and unicodedata.category(char) == "Lo" and not 0xAC00 <= ord(char) < 0xD7A4
+
+
+def tokenize(text):
+    """공백과 문장 부호로 나눈 낱말 목록 (NFC, 소문자)"""
+    text = unicodedata.normalize("NFC", text or "").lower()
+    tokens, current = [], []
+    for char in text:
+        if char.isalnum():
+            current.append(char)
+        elif current:
+            tokens.append("".join(current))
+            current = []
+    if current:
+        tokens.append("".join(current))
+    return tokens
+
+
+def bigrams(token):
+    return {token[i:i + 2] for i in range(len(token) - 1)}
+
+
+def _source_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    records = data.get("characters", data) if isinstance(data, dict) else data
+    return records.values() if isinstance(records, dict) else records
+
+
+def collect_documents(paths):
+    """원본 파일들 → 한자별 {"character", "meaning", "pronunciation", "stroke_count", "grade", "words"}"""
+    documents = {}
+    for path in paths:
+        for record in _source_records(path):
+            char = record.get("character")
+            if not char or not record.get("meaning"):
+                continue
+            doc = documents.get(char)
+            if doc is None:
+                doc = documents[char] = {
+                    "character": char,
+                    "meaning": record["meaning"],
+                    "pronunciation": record.get("pronunciation") or "",
+                    "stroke_count": record.get("stroke_count") or 0,
+                    "grade": record.get("grade") or 0,
+                    "words": [],
+                }
+            seen = {word["word"] for word in doc["words"]}
+            for word in (record.get("extended_data") or {}).get("common_words") or []:
+                if word.get("word") and word["word"] not in seen:
+                    seen.add(word["word"])
+                    doc["words"].append({"word": word["word"],
+                                         "meaning": word.get("meaning") or "",
+                                         "pronunciation": word.get("pronunciation") or ""})
+    return sorted(documents.values(), key=lambda doc: (doc["grade"], doc["stroke_count"],
+                                                        ord(doc["character"])))
+
+
+def document_terms(doc):
+    """문서 하나의 (필드 번호, 낱말) 목록"""
+    terms = [(0, doc["character"])]
+    terms += [(1, token) for token in tokenize(doc["pronunciation"])]
+    terms += [(2, token) for token in tokenize(doc["meaning"])]
+    for word in doc["words"]:
+        terms += [(3, token) for token in tokenize(word["word"])]
+        terms += [(4, token) for token in tokenize(word["pronunciation"])]
+        terms += [(5, token) for token in tokenize(word["meaning"])]
+    return terms
+
+
+def build_index(documents):
+    """문서 목록 → 직렬화 가능한 역색인
+
+    terms 는 자모로 푼 낱말의 정렬된 목록이라 앞부분 일치를 이분 탐색으로 찾는다.
+    postings[i] 와 grams[g] 는 [문서 번호, 필드 번호] 를 이어 붙인 평평한 목록이다.
+    """
+    term_postings, gram_postings = {}, {}
+    for doc_id, doc in enumerate(documents):
+        for field, token in set(document_terms(doc)):
+            term_postings.setdefault(jamo(token), set()).add((doc_id, field))
+            for gram in bigrams(token):
+                gram_postings.setdefault(gram, set()).add((doc_id, field))
+
+    def flat(pairs):
+        return [value for pair in sorted(pairs) for value in pair]
+
+    terms = sorted(term_postings)
+    return {
+        "documents": [{key: doc[key] for key in ("character", "meaning", "pronunciation",
+                                                 "stroke_count")} for doc in documents],
+        "terms": terms,
+        "postings": [flat(term_postings[term]) for term in terms],
+        "grams": {gram: flat(pairs) for gram, pairs in sorted(gram_postings.items())},
+    }
+
+
+class SearchIndex:
+    """한자 역색인 (build_index 형식) 과 검색"""
+
+    def __init__(self, index, sources=None):
+        self.documents = index["documents"]
+        self.terms = index["terms"]
+        self.postings = index["postings"]
+        self.grams = index["grams"]
+        self.sources = sources or {}
+        self._by_character = {doc["character"]: i for i, doc in enumerate(self.documents)}
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, character):
+        return character in self._by_character
+
+    @staticmethod
+    def _stamps(paths):
+        stamps = {}
+        for path in paths:
+            st = os.stat(path)
+            stamps[path] = [st.st_mtime_ns, st.st_size]
+        return stamps
+
+    @classmethod
+    def build(cls, sources=DEFAULT_SOURCES):
+        """있는 원본 파일로 색인 만들기 (하나도 없으면 FileNotFoundError)"""
+        found = [path for path in sources if os.path.exists(path)]
+        if not found:
+            raise FileNotFoundError(f"검색할 한자 데이터가 없습니다: {', '.join(sources)}")
+        sources = found
+        return cls(build_index(collect_documents(sources)), cls._stamps(sources))
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"{path}: 지원하지 않는 검색 색인 버전입니다")
+        return cls(data["index"], data.get("sources"))
+
+    def save(self, path=DEFAULT_INDEX_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "sources": self.sources,
+                       "index": {"documents": self.documents, "terms": self.terms,
+                                 "postings": self.postings, "grams": self.grams}},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_file, path)
+
+    @classmethod
+    def open(cls, path=DEFAULT_INDEX_FILE, sources=DEFAULT_SOURCES, rebuild=False):
+        """저장된 색인을 열고, 없거나 원본이 바뀌었으면 다시 만들어 저장
+
+        원본 파일이 하나도 없으면 빈 색인을 저장하지 않고 FileNotFoundError.
+        """
+        current = cls._stamps([p for p in sources if os.path.exists(p)])
+        if not rebuild and os.path.exists(path):
+            try:
+                index = cls.load(path)
+            except (OSError, ValueError):
+                index = None
+            if index is not None and index.sources == current:
+                return index
+        index = cls.build(sources)
+        index.save(path)
+        return index
+
+    # 검색
+
+    def _add(self, scores, flat, weight):
+        """[문서, 필드, ...] 목록의 점수를 (문서, 필드) 마다 가장 높은 값으로"""
+        for i in range(0, len(flat), 2):
+            key = (flat[i], flat[i + 1])
+            value = FIELD_WEIGHTS[flat[i + 1]] * weight
+            if scores.get(key, 0) < value:
+                scores[key] = value
+
+    def _token_scores(self, token):
+        """낱말 하나 → {(문서, 필드): 점수}"""
+        scores = {}
+        key = jamo(token)
+        # 앞부분이 같은 낱말은 정렬된 목록에서 연속해 있다
+        start = bisect.bisect_left(self.terms, key)
+        for i in range(start, len(self.terms)):
+            term = self.terms[i]
+            if not term.startswith(key):
+                break
+            self._add(scores, self.postings[i], EXACT if term == key else PREFIX)
+
+        grams = bigrams(token)
+        if grams:
+            hits = {}
+            for gram in grams:
+                flat = self.grams.get(gram, ())
+                for j in range(0, len(flat), 2):
+                    pair = (flat[j], flat[j + 1])
+                    hits[pair] = hits.get(pair, 0) + 1
+            for (doc_id, field), count in hits.items():
+                value = FIELD_WEIGHTS[field] * GRAM * count / len(grams)
+                if scores.get((doc_id, field), 0) < value:
+                    scores[(doc_id, field)] = value
+
+        # 한자어는 낱글자로도 찾는다
+        if len(token) > 1:
+            for char in set(token):
+                doc_id = self._by_character.get(char)
+                if doc_id is not None and is_hanja(char):
+                    value = FIELD_WEIGHTS[0] * HANJA_PART
+                    if scores.get((doc_id, 0), 0) < value:
+                        scores[(doc_id, 0)] = value
+        return scores
+
+    def search(self, query, limit=10, characters=None):
+        """query 와 맞는 한자를 점수 순으로 (characters 를 주면 그 안에서만)
+
+        낱말마다 (문서, 필드) 별 최고 점수를 더하고, 맞은 낱말 수의 비율을 곱한다.
+        점수가 같으면 색인 순서 (급수, 획수) 대로.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        totals, matched, fields = {}, {}, {}
+        for token in tokens:
+            token_docs = set()
+            for (doc_id, field), value in self._token_scores(token).items():
+                totals[doc_id] = totals.get(doc_id, 0.0) + value
+                fields.setdefault(doc_id, set()).add(FIELDS[field])
+                token_docs.add(doc_id)
+            for doc_id in token_docs:
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+
+        ranked = []
+        for doc_id, total in totals.items():
+            doc = self.documents[doc_id]
+            if characters is not None and doc["character"] not in characters:
+                continue
+            ranked.append((-total * matched[doc_id] / len(tokens), doc_id))
+        ranked.sort()
+        results = []
+        for negative, doc_id in ranked[:limit]:
+            doc = self.documents[doc_id]
+            results.append(SearchResult(doc["character"], round(-negative, 3), doc["meaning"],
+                                        doc["pronunciation"], doc["stroke_count"],
+                                        tuple(f for f in FIELDS if f in fields[doc_id])))
+        return results
+
+
+def suggest(query, hanja_data, limit=5):
+    """hanja_data 에 있는 한자 가운데 query 로 찾은 것 ("한자 (뜻)" 목록, 색인이 없으면 빈 목록)"""
+    try:
+        index = SearchIndex.open()
+    except (OSError, ValueError):
+        return []
+    return [f"{r.character} ({r.meaning})" for r in index.search(query, limit, characters=hanja_data)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한글 독음/뜻/예시 단어로 한자 찾기")
+    parser.add_argument("query", nargs="*", help="검색어 (예: 일, 물, 학교, 一日)")
+    parser.add_argument("--limit", "-n", type=int, default=10, help="결과 수")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE, help="색인 파일")
+    parser.add_argument("--rebuild", action="store_true", help="색인을 다시 만들기")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 줄로 출력")
+    args = parser.parse_args()
+
+    try:
+        index = SearchIndex.open(args.index, rebuild=args.rebuild)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if args.rebuild:
+        print(f"색인 저장: {args.index} ({len(index)}자, 낱말 {len(index.terms)}개)", file=sys.stderr)
+    if not args.query:
+        return
+    results = index.search(" ".join(args.query), args.limit)
+    for result in results:
+        if args.json:
+            print(json.dumps(result._asdict(), ensure_ascii=False))
+        else:
+            print(f"{result.character}\t{result.meaning}\t{result.stroke_count}획\t"
+                  f"{result.score:.2f}\t{', '.join(result.fields)}")
+    if not results and not args.json:
+        print("찾은 한자가 없습니다.")
+
+
+if __name__ == "__main__":
+    main()
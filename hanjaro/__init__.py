@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""한자 획순 도구 모음 (python -m hanjaro)
+
+저장소 루트의 모듈들을 이름으로 바로 쓸 수 있게 묶는다. 각 모듈은 처음
+접근할 때 가져오므로 `import hanjaro` 자체는 거의 시간이 들지 않는다.
+
+    import hanjaro
+    store = hanjaro.CharacterStore()      # 이때 character_store 를 가져옴
+"""
+
+import importlib
+import os
+import sys
+
+# 모듈들은 저장소 루트에 있으므로, 다른 디렉터리에서 실행해도 찾을 수 있게 한다
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+# 이름 → 그 이름을 정의한 모듈
+_EXPORTS = {
+    "CharacterStore": "character_store",
+    "open_hanja_data": "character_store",
+    "StrokePack": "stroke_pack",
+    "write_pack": "stroke_pack",
+    "HeadlessRenderer": "headless_renderer",
+    "render_to_files": "headless_renderer",
+    "PathCache": "path_cache",
+    "flatten_path": "path_flattener",
+    "FrameScheduler": "animation",
+    "tessellate": "stroke_tessellation",
+    "render_all": "batch_render",
+    "UnihanIndex": "unihan_index",
+    "StrokeMatcher": "stroke_matcher",
+    "ShapeIndex": "shape_index",
+    "QuizGenerator": "quiz_generator",
+    "ReviewScheduler": "review_scheduler",
+    "LearningLog": "learning_log",
+    "AnimationExporter": "animation_export",
+    "RenderService": "render_service",
+    "SearchIndex": "hanja_search",
+    "RelationGraph": "relation_graph",
+    "validate_dataset": "dataset_validator",
+    "simplify_points": "geometry_simplify",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'hanjaro' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+from hanjaro.cli import main
+
+main()
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""hanjaro 명령줄 도구
+
+    python -m hanjaro list                  # 사용 가능한 한자 목록
+    python -m hanjaro search 물             # 독음/뜻/예시 단어로 한자 찾기
+    python -m hanjaro quiz -c 5             # 획수 퀴즈 (텍스트)
+    python -m hanjaro review                # 복습할 때가 된 한자
+    python -m hanjaro next 一二三           # 관계 그래프로 다음에 배울 한자 추천
+    python -m hanjaro export 永 -o out      # 획순 PNG 저장 (창 없음)
+    python -m hanjaro animate -o out        # 애니메이션 SVG + 스프라이트 시트
+    python -m hanjaro -d . serve            # 획순 프레임 HTTP 서버 (웹 앱용)
+    python -m hanjaro validate              # 데이터 파일 검사 (바뀐 파일만 다시)
+    python -m hanjaro draw 永               # Tk 창으로 그리기
+    python -m hanjaro turtle 永 --practice  # turtle 창으로 그리기
+
+하위 명령마다 필요한 모듈만 함수 안에서 가져온다. list/quiz/export 는
+tkinter 나 turtle 을 가져오지 않으며, list/quiz 는 numpy 도 가져오지 않는다.
+"""
+
+import argparse
+import sys
+
+import instrumentation
+
+DEFAULT_DATA = "hanja_strokes.json"
+
+
+def load_data(path):
+    from character_store import open_hanja_data
+
+    try:
+        return open_hanja_data(path)
+    except FileNotFoundError:
+        print(f"Error: '{path}' 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+    except ValueError:
+        print(f"Error: '{path}' 파일의 형식이 올바르지 않습니다.")
+        sys.exit(1)
+
+
+def require_characters(hanja_data, characters):
+    missing = [c for c in characters if c not in hanja_data]
+    if missing:
+        print(f"Error: '{''.join(missing)}' 한자에 대한 데이터가 없습니다.")
+        from hanja_search import suggest
+
+        found = suggest("".join(missing), hanja_data)
+        if found:
+            print(f"찾은 한자: {', '.join(found)}")
+        sys.exit(1)
+
+
+def cmd_list(args):
+    hanja_data = load_data(args.data)
+    for char in hanja_data:
+        data = hanja_data[char]
+        print(f"{char}\t{data['meaning']}\t{data['stroke_count']}획")
+
+
+def cmd_search(args):
+    from hanja_search import SearchIndex
+
+    hanja_data = load_data(args.data) if args.available else None
+    try:
+        index = SearchIndex.open(rebuild=args.rebuild)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    results = index.search(" ".join(args.query), args.limit, characters=hanja_data)
+    for result in results:
+        print(f"{result.character}\t{result.meaning}\t{result.stroke_count}획\t{result.score:.2f}")
+    if not results:
+        print("찾은 한자가 없습니다.")
+        sys.exit(1)
+
+
+def open_learner(path):
+    if not path:
+        return None
+    from review_scheduler import ReviewScheduler
+
+    try:
+        return ReviewScheduler(path)
+    except FileNotFoundError:
+        print(f"Error: '{path}' 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+
+
+def cmd_review(args):
+    from review_scheduler import parse_time, show_due
+
+    with open_learner(args.learner) as scheduler:
+        if args.compact:
+            print(f"이벤트 {scheduler.replayed}개를 {args.learner} 에 합쳤습니다.")
+            return
+        show_due(scheduler, parse_time(args.at) if args.at else None, args.limit)
+
+
+def cmd_next(args):
+    from relation_graph import RelationGraph
+
+    known = set(args.known or "")
+    if args.learner:
+        with open_learner(args.learner) as scheduler:
+            known.update(scheduler.characters)
+    if not known:
+        print("Error: 아는 한자나 --learner 를 주세요.")
+        sys.exit(1)
+    available = load_data(args.data) if args.available else None
+    graph = RelationGraph.open()
+    for char, score in graph.recommend(known, args.limit, args.kinds, available=available):
+        print(f"{char}\t{score:.1f}")
+
+
+def cmd_quiz(args):
+    from enhanced_hanja_drawer import quiz_mode
+
+    kinds = tuple(args.kind) if args.kind else ("stroke_count",)
+    scheduler = open_learner(args.learner)
+    try:
+        quiz_mode(load_data(args.data), args.count, show=False, kinds=kinds, scheduler=scheduler)
+    finally:
+        if scheduler is not None:
+            scheduler.close()
+
+
+def cmd_export(args):
+    from headless_renderer import HeadlessRenderer, render_to_files
+
+    hanja_data = load_data(args.data)
+    characters = list(args.characters) if args.characters else list(hanja_data)
+    require_characters(hanja_data, characters)
+
+    renderer = HeadlessRenderer(size=args.size, grid=not args.no_grid, brush=args.brush)
+    for char in characters:
+        for path in render_to_files(renderer, char, hanja_data[char]["strokes"], args.output,
+                                    args.mode):
+            print(path)
+
+
+def cmd_animate(args):
+    from animation_export import AnimationExporter
+
+    hanja_data = load_data(args.data)
+    characters = list(args.characters) if args.characters else list(hanja_data)
+    require_characters(hanja_data, characters)
+
+    exporter = AnimationExporter(args.output, args.size, sprite=not args.no_sprite)
+    for char in characters:
+        if exporter.export(char, hanja_data[char]["strokes"], args.force):
+            print(exporter.manifest[char]["svg"])
+    exporter.save_manifest()
+
+
+def cmd_serve(args):
+    from render_service import serve
+
+    try:
+        serve(args.data, args.host, args.port, memory_items=args.memory, verbose=args.verbose)
+    except FileNotFoundError:
+        print(f"Error: '{args.data}' 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+
+
+def cmd_validate(args):
+    from dataset_validator import run
+
+    sys.exit(run(args))
+
+
+def cmd_draw(args):
+    hanja_data = load_data(args.data)
+    if args.character:
+        require_characters(hanja_data, [args.character])
+
+    from path_cache import PathCache
+    from svg_hanja_drawer import HanjaDrawer
+
+    path_cache = PathCache(cache_file=args.cache_file) if args.cache_file else None
+    drawer = HanjaDrawer(scale=args.scale, path_cache=path_cache, animate=not args.nodelay,
+                         stroke_duration=args.stroke_time, brush=args.brush,
+                         hanja_data=hanja_data, practice=args.practice, simplify=args.simplify)
+    drawer.run(args.character)
+
+
+def cmd_turtle(args):
+    hanja_data = load_data(args.data)
+    require_characters(hanja_data, [args.character])
+
+    from enhanced_hanja_drawer import draw_hanja_enhanced, practice_mode
+
+    if args.practice:
+        practice_mode(args.character, hanja_data, args.count, args.delay)
+    else:
+        draw_hanja_enhanced(args.character, hanja_data, delay=args.delay,
+                            bg_color="black" if args.dark else "white",
+                            pen_color="white" if args.dark else "black")
+
+
+def build_parser():
+    # 인자 정의만 가져온다 (numpy, tkinter 를 가져오지 않음)
+    from dataset_validator import add_arguments as validate_arguments
+
+    parser = argparse.ArgumentParser(prog="hanjaro", description="한자 획순 도구")
+    parser.add_argument("--data", "-d", default=DEFAULT_DATA,
+                        help="한자 데이터 (.json, .hjsp 팩 또는 데이터 디렉터리)")
+    instrumentation.add_profile_argument(parser)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="사용 가능한 한자 목록")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("search", help="한글 독음/뜻/예시 단어로 한자 찾기")
+    p.add_argument("query", nargs="+", help="검색어 (예: 일, 물, 학교, 一日)")
+    p.add_argument("--limit", "-n", type=int, default=10, help="결과 수")
+    p.add_argument("--available", "-a", action="store_true",
+                   help="--data 에 획순 데이터가 있는 한자만")
+    p.add_argument("--rebuild", action="store_true", help="검색 색인을 다시 만들기")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("quiz", help="획수 맞추기 퀴즈 (창 없음)")
+    p.add_argument("--count", "-c", type=int, default=3, help="문제 수")
+    p.add_argument("--kind", choices=["stroke_count", "meaning", "character"], action="append",
+                   help="문제 종류 (여러 번 지정 가능, 기본: stroke_count)")
+    p.add_argument("--learner", "-l", help="학습자 상태 파일 (결과 기록, 복습할 한자부터 출제)")
+    p.set_defaults(func=cmd_quiz)
+
+    p = sub.add_parser("review", help="복습할 때가 된 한자 (간격 반복)")
+    p.add_argument("--learner", "-l", default="data/learning/default_user.json",
+                   help="학습자 상태 파일")
+    p.add_argument("--at", help="이 시각 기준 (예: 2025-04-03T00:00:00Z)")
+    p.add_argument("--limit", type=int, help="최대 개수")
+    p.add_argument("--compact", action="store_true", help="이벤트 로그를 상태 파일에 합치기")
+    p.set_defaults(func=cmd_review)
+
+    p = sub.add_parser("next", help="관계 그래프로 다음에 배울 한자 추천")
+    p.add_argument("known", nargs="?", help="이미 아는 한자들 (예: 一二三)")
+    p.add_argument("--learner", "-l", help="학습자 상태 파일 (공부한 한자를 아는 한자로)")
+    p.add_argument("--limit", "-n", type=int, default=10, help="추천 수")
+    p.add_argument("--kinds", nargs="+", choices=("radical", "shape", "pronunciation", "compound"),
+                   help="쓸 관계 종류 (기본: 모두)")
+    p.add_argument("--available", "-a", action="store_true",
+                   help="--data 에 획순 데이터가 있는 한자만")
+    p.set_defaults(func=cmd_next)
+
+    p = sub.add_parser("export", help="획순 PNG 저장 (창 없음)")
+    p.add_argument("characters", nargs="?", help="저장할 한자들 (생략하면 전체)")
+    p.add_argument("--output", "-o", default="build/stroke-order", help="출력 디렉터리")
+    p.add_argument("--mode", choices=["strip", "frames", "final"], default="strip",
+                   help="strip: 획순을 이어 붙인 한 장, frames: 획마다 한 장, final: 완성 모습")
+    p.add_argument("--size", type=int, default=256, help="프레임 한 장의 크기 (픽셀)")
+    p.add_argument("--no-grid", action="store_true", help="그리드 없이 그리기")
+    p.add_argument("--brush", choices=["brush", "taper", "uniform"],
+                   help="붓 압력 곡선으로 굵기가 변하는 획 그리기")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("animate", help="애니메이션 SVG / 스프라이트 시트 저장 (바뀐 글자만)")
+    p.add_argument("characters", nargs="?", help="저장할 한자들 (생략하면 전체)")
+    p.add_argument("--output", "-o", default="build/animations", help="출력 디렉터리")
+    p.add_argument("--size", type=int, default=256, help="SVG 크기 / 스프라이트 프레임 크기")
+    p.add_argument("--no-sprite", action="store_true", help="SVG 만 만들기")
+    p.add_argument("--force", action="store_true", help="바뀌지 않은 글자도 다시 만들기")
+    p.set_defaults(func=cmd_animate)
+
+    p = sub.add_parser("serve", help="획순 프레임 PNG/SVG HTTP 서버 (/render/<한자>?stroke=N&size=S)")
+    p.add_argument("--host", default="127.0.0.1", help="받을 주소")
+    p.add_argument("--port", "-p", type=int, default=8765, help="포트")
+    p.add_argument("--memory", type=int, default=512, help="메모리에 둘 이미지 수")
+    p.add_argument("--verbose", "-v", action="store_true", help="요청마다 로그 출력")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("validate", help="획/한자 데이터 파일 검사 (바뀐 파일만, 병렬)")
+    validate_arguments(p)
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("draw", help="Tk 창으로 획순 애니메이션")
+    p.add_argument("character", nargs="?", help="표시할 한자")
+    p.add_argument("--scale", type=float, default=3.0, help="획 크기 배율")
+    p.add_argument("--nodelay", action="store_true", help="획 애니메이션 없음")
+    p.add_argument("--stroke-time", type=float, default=1.0, help="획 하나를 그리는 시간 (초)")
+    p.add_argument("--brush", choices=["bands", "outline"], default="bands", help="붓 표현")
+    p.add_argument("--cache-file", help="경로 캐시 파일 (.npz)")
+    p.add_argument("--simplify", type=float, metavar="TOLERANCE",
+                   help="bands 붓의 선 좌표 단순화 (RDP 허용 오차, 0~100 좌표 기준)")
+    p.add_argument("--practice", "-p", action="store_true", help="마우스로 따라 그린 획을 채점")
+    p.set_defaults(func=cmd_draw)
+
+    p = sub.add_parser("turtle", help="turtle 창으로 획순 애니메이션")
+    p.add_argument("character", help="표시할 한자")
+    p.add_argument("--practice", "-p", action="store_true", help="연습 모드 (여러 번 반복)")
+    p.add_argument("--count", "-c", type=int, default=3, help="연습 횟수")
+    p.add_argument("--delay", type=float, default=0.5, help="획 하나를 그리는 시간 (초)")
+    p.add_argument("--dark", action="store_true", help="다크 모드")
+    p.set_defaults(func=cmd_turtle)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    instrumentation.start(args)
+    try:
+        args.func(args)
+    finally:
+        instrumentation.report(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""화면 없이 한자 획순 이미지를 만드는 렌더러 (PIL)
+
+Tk 나 turtle 창을 띄우지 않고 획 데이터에서 바로 PNG 를 만든다.
+획 하나는 선 하나로 한 번에 그리며, 애니메이션용 지연은 없다.
+
+사용 예:
+    python headless_renderer.py data/strokes data/stroke_data -o build/stroke-order
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+import instrumentation
+from background_layer import background_image, background_spec, theme_for
+from character_store import normalize_strokes
+from path_cache import get_default_cache
+from stroke_pack import StrokePack, is_pack_file
+from stroke_tessellation import PRESSURE_PROFILES, outline_for_path
+
+# 획 데이터 좌표계 (0~100)
+DATA_SIZE = 100
+
+
+def load_stroke_records(source):
+    """파일 또는 디렉터리에서 (한자, 획 목록) 쌍을 순서대로 생성
+
+    - 디렉터리: 안의 *.json 파일 하나가 한 글자 (data/strokes/, data/stroke_data/)
+    - {"character": ..., "strokes": [...]} 형식의 파일: 한 글자
+    - {한자: {"strokes": [...]}} 형식의 파일: 여러 글자 (hanja_strokes.json, data/all_strokes.json)
+    - .hjsp 팩 파일 (stroke_pack.py): 여러 글자
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith(".json"):
+                yield from load_stroke_records(os.path.join(source, name))
+        return
+
+    if is_pack_file(source):
+        with StrokePack(source) as pack:
+            for character in pack:
+                yield character, pack[character]["strokes"]
+        return
+
+    with open(source, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict) and "strokes" in data:
+        character = data.get("character") or os.path.splitext(os.path.basename(source))[0]
+        yield character, normalize_strokes(data["strokes"])
+    elif isinstance(data, dict):
+        for character, record in data.items():
+            if isinstance(record, dict) and "strokes" in record:
+                yield character, normalize_strokes(record["strokes"])
+
+
+class HeadlessRenderer:
+    def __init__(self, size=256, stroke_width=None, color="black", highlight="#D03030",
+                 background="white", grid=True, supersample=2, tolerance=0.25,
+                 path_cache=None, brush=None):
+        self.size = size
+        # 지정하지 않으면 획 데이터의 strokeWidth (기본 2.5) 를 그대로 사용
+        self.stroke_width = stroke_width
+        self.color = color
+        self.highlight = highlight
+        self.background = background
+        self.grid = grid
+        # 붓 압력 곡선 이름 (stroke_tessellation.PRESSURE_PROFILES). 지정하면 획을 외곽선 다각형으로 채움
+        self.brush = brush
+        self.supersample = max(1, int(supersample))
+        self.path_cache = path_cache if path_cache is not None else get_default_cache()
+
+        # 내부적으로는 supersample 배 크기로 그린 뒤 줄여서 가장자리를 부드럽게 한다
+        self.canvas_size = size * self.supersample
+        self.scale = self.canvas_size / DATA_SIZE
+        # 평탄화 허용 오차는 출력 픽셀 기준으로 받아 데이터 좌표계로 바꾼다
+        self.tolerance = tolerance * self.supersample / self.scale
+        # 배경은 background_layer 가 한 번만 그리고, 캔버스마다 복사해서 쓴다
+        self._background = background_spec(self.canvas_size, self.canvas_size, theme_for(background),
+                                           "full" if grid else "plain", line=self.supersample,
+                                           background=background)
+
+    def new_canvas(self):
+        """배경(과 그리드)만 그려진 새 캔버스 (캐시된 배경의 복사본)"""
+        return background_image(self._background).copy()
+
+    def draw_stroke(self, draw, stroke, color):
+        """획 하나를 선 하나로 그리기 (끝은 둥글게), 붓 모드면 다각형 하나를 채우기"""
+        with instrumentation.span("render_stroke"):
+            self._draw_stroke(draw, stroke, color)
+
+    def _draw_stroke(self, draw, stroke, color):
+        width = self.stroke_width or float(stroke.get("strokeWidth", 2.5))
+        if self.brush:
+            outline = outline_for_path(stroke["path"], width * self.scale, self.scale, self.brush,
+                                       self.tolerance, path_cache=self.path_cache)
+            polygon = outline.polygon()
+            if len(polygon) >= 3:
+                draw.polygon([tuple(p) for p in polygon.tolist()], fill=color)
+            return
+
+        points = self.path_cache.get_points(stroke["path"], self.tolerance, self.scale)
+        if len(points) == 0:
+            return
+        width = max(1, round(width * self.scale))
+        xy = [tuple(p) for p in points.tolist()]
+
+        if len(xy) > 1:
+            draw.line(xy, fill=color, width=width, joint="curve")
+        # 둥근 끝 처리
+        r = width / 2
+        for x, y in (xy[0], xy[-1]):
+            draw.ellipse([x - r, y - r, x + r, y + r], fill=color)
+
+    def finish(self, image):
+        """내부 캔버스를 출력 크기로 줄이기"""
+        if self.supersample == 1:
+            return image
+        # 정수배 축소는 박스 필터(reduce)가 LANCZOS 보다 훨씬 빠르고 품질도 충분하다
+        return image.reduce(self.supersample)
+
+    def render_character(self, strokes):
+        """모든 획이 그려진 완성 이미지"""
+        image = self.new_canvas()
+        draw = ImageDraw.Draw(image)
+        for stroke in strokes:
+            self.draw_stroke(draw, stroke, self.color)
+        return self.finish(image)
+
+    def render_frames(self, strokes):
+        """획순 프레임 목록 (i 번째 프레임은 i 번째 획까지, 현재 획은 강조색)"""
+        base = self.new_canvas()
+        base_draw = ImageDraw.Draw(base)
+        frames = []
+        for stroke in strokes:
+            frame = base.copy()
+            self.draw_stroke(ImageDraw.Draw(frame), stroke, self.highlight)
+            frames.append(self.finish(frame))
+            self.draw_stroke(base_draw, stroke, self.color)
+        return frames
+
+    def render_frame(self, strokes, count):
+        """count 번째 프레임 한 장 (count 번째 획까지, 그 획은 강조색)"""
+        image = self.new_canvas()
+        draw = ImageDraw.Draw(image)
+        for i, stroke in enumerate(strokes[:count]):
+            self.draw_stroke(draw, stroke, self.highlight if i == count - 1 else self.color)
+        return self.finish(image)
+
+    def render_strip(self, strokes, columns=None):
+        """획순 프레임을 한 장에 이어 붙인 이미지 (기본은 가로 한 줄)"""
+        frames = self.render_frames(strokes)
+        if not frames:
+            return self.finish(self.new_canvas())
+        columns = columns or len(frames)
+        rows = (len(frames) + columns - 1) // columns
+        strip = Image.new("RGB", (columns * self.size, rows * self.size), self.background)
+        for i, frame in enumerate(frames):
+            strip.paste(frame, ((i % columns) * self.size, (i // columns) * self.size))
+        return strip
+
+
+def render_to_files(renderer, character, strokes, output_dir, mode="strip", columns=None,
+                    name=None):
+    """한 글자를 렌더링하여 PNG 로 저장하고 저장한 파일 경로 목록을 반환
+
+    파일 이름(name)을 주지 않으면 data/strokes/ 와 같이 한자 자체를 쓴다.
+    - final: <출력>/<이름>.png
+    - strip: <출력>/<이름>.png (획순 프레임을 이어 붙인 한 장)
+    - frames: <출력>/<이름>/<획 번호 2자리>.png
+    """
+    name = name or character
+    if mode == "frames":
+        char_dir = os.path.join(output_dir, name)
+        os.makedirs(char_dir, exist_ok=True)
+        paths = []
+        for i, frame in enumerate(renderer.render_frames(strokes), 1):
+            path = os.path.join(char_dir, f"{i:02d}.png")
+            frame.save(path)
+            paths.append(path)
+        return paths
+
+    os.makedirs(output_dir, exist_ok=True)
+    if mode == "final":
+        image = renderer.render_character(strokes)
+    else:
+        image = renderer.render_strip(strokes, columns)
+    path = os.path.join(output_dir, f"{name}.png")
+    image.save(path)
+    return [path]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한자 획순 이미지 일괄 생성 (화면 없이)")
+    parser.add_argument("sources", nargs="+",
+                        help="획 데이터 파일 또는 디렉터리 (예: data/strokes data/all_strokes.json)")
+    parser.add_argument("--output", "-o", default="build/stroke-order", help="출력 디렉터리")
+    parser.add_argument("--mode", choices=["strip", "frames", "final"], default="strip",
+                        help="strip: 획순을 이어 붙인 한 장, frames: 획마다 한 장, final: 완성 모습")
+    parser.add_argument("--size", type=int, default=256, help="프레임 한 장의 크기 (픽셀)")
+    parser.add_argument("--columns", type=int, help="strip 모드에서 한 줄에 넣을 프레임 수")
+    parser.add_argument("--no-grid", action="store_true", help="그리드 없이 그리기")
+    parser.add_argument("--brush", choices=sorted(PRESSURE_PROFILES),
+                        help="붓 압력 곡선으로 굵기가 변하는 획 그리기")
+    parser.add_argument("--chars", help="이 문자열에 포함된 한자만 렌더링")
+
+    args = parser.parse_args()
+
+    renderer = HeadlessRenderer(size=args.size, grid=not args.no_grid, brush=args.brush)
+    seen = set()
+    rendered = 0
+    start = time.perf_counter()
+
+    for source in args.sources:
+        if not os.path.exists(source):
+            print(f"Error: '{source}' 경로를 찾을 수 없습니다.")
+            sys.exit(1)
+        for character, strokes in load_stroke_records(source):
+            # 여러 소스에 같은 한자가 있으면 먼저 나온 것을 사용
+            if character in seen or (args.chars and character not in args.chars):
+                continue
+            seen.add(character)
+            if not strokes:
+                print(f"Warning: '{character}' 한자에 경로 데이터가 없어 건너뜁니다.")
+                continue
+            render_to_files(renderer, character, strokes, args.output, args.mode, args.columns)
+            rendered += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"{rendered}자 렌더링 완료 ({elapsed:.2f}초) → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
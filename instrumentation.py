@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""렌더링 경로 계측 (켰을 때만 기록하는 구간 타이머와 카운터)
+
+드로어들은 데이터 읽기, 경로 파싱/평탄화, 획 좌표 계산, 캔버스 항목 만들기,
+프레임 갱신 같은 단계를 span() 으로 감싸고, 처리한 양을 count() 로 센다.
+enable() 하기 전에는 span() 이 아무것도 하지 않는 공용 객체를 돌려주고
+count() 는 바로 돌아가므로 비용이 거의 없다.
+
+    import instrumentation
+    recorder = instrumentation.enable()
+    with instrumentation.span("flatten_path"):
+        ...
+    instrumentation.count("points_generated", 51)
+    recorder.save_trace("build/trace.json")   # chrome://tracing, Perfetto
+    print(recorder.summary())
+
+명령줄 도구는 --profile 로 켜면 끝날 때 요약 표를 표준 오류로 출력하고,
+--trace 파일.json 을 주면 Chrome trace-event JSON 으로 저장한다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+_recorder = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "args", "start")
+
+    def __init__(self, recorder, name, args):
+        self.recorder = recorder
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+class Recorder:
+    """구간(이름, 시작, 길이)과 카운터 기록"""
+
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        # (이름, 시작 ns, 길이 ns, 스레드, args)
+        self.spans = []
+        # (이름, 시각 ns, 누적 값) - trace 의 카운터 그래프용
+        self.samples = []
+        self.counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, name, start, duration, args=None):
+        self.spans.append((name, start, duration, threading.get_ident(), args))
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+            self.samples.append((name, time.perf_counter_ns(), self.counters[name]))
+
+    # 내보내기
+
+    def stages(self):
+        """이름 → {"calls", "total_ms", "mean_us", "max_us"} (총 시간이 긴 순서)"""
+        totals = defaultdict(lambda: [0, 0, 0])
+        for name, _, duration, _, _ in self.spans:
+            entry = totals[name]
+            entry[0] += 1
+            entry[1] += duration
+            entry[2] = max(entry[2], duration)
+        return {name: {"calls": calls, "total_ms": round(total / 1e6, 3),
+                       "mean_us": round(total / calls / 1e3, 2), "max_us": round(longest / 1e3, 2)}
+                for name, (calls, total, longest) in sorted(totals.items(), key=lambda kv: -kv[1][1])}
+
+    def summary(self):
+        """단계별 시간과 카운터를 표 문자열로"""
+        wall = (time.perf_counter_ns() - self.origin) / 1e6
+        lines = [f"{'단계':<22}{'호출':>8}{'합계 ms':>12}{'평균 µs':>12}{'최대 µs':>12}{'비율':>8}"]
+        for name, stage in self.stages().items():
+            share = stage["total_ms"] / wall * 100 if wall else 0
+            lines.append(f"{name:<22}{stage['calls']:>8}{stage['total_ms']:>12.2f}"
+                         f"{stage['mean_us']:>12.1f}{stage['max_us']:>12.1f}{share:>7.1f}%")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'카운터':<22}{'값':>8}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<22}{value:>8}")
+        lines.append(f"\n전체 {wall:.1f} ms")
+        return "\n".join(lines)
+
+    def trace_events(self):
+        """Chrome trace-event 형식의 이벤트 목록 (시각은 µs)"""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "hanjaro"}}]
+        for name, start, duration, tid, args in self.spans:
+            event = {"name": name, "cat": "render", "ph": "X", "pid": pid, "tid": tid,
+                     "ts": (start - self.origin) / 1e3, "dur": duration / 1e3}
+            if args:
+                event["args"] = args
+            events.append(event)
+        for name, moment, value in self.samples:
+            events.append({"name": name, "cat": "counter", "ph": "C", "pid": pid,
+                           "ts": (moment - self.origin) / 1e3, "args": {name: value}})
+        return events
+
+    def save_trace(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms",
+                       "otherData": {"counters": dict(self.counters), "stages": self.stages()}},
+                      f, ensure_ascii=False)
+
+
+def enable():
+    """기록 시작 (이미 켜져 있으면 그 기록을 그대로 씀)"""
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder()
+    return _recorder
+
+
+def disable():
+    """기록을 멈추고 지금까지의 기록을 반환"""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def recorder():
+    return _recorder
+
+
+def span(name, **args):
+    """with 로 감싼 구간의 시간을 기록 (꺼져 있으면 아무것도 하지 않음)"""
+    current = _recorder
+    if current is None:
+        return _NULL_SPAN
+    return _Span(current, name, args or None)
+
+
+def count(name, n=1):
+    """카운터 증가 (꺼져 있으면 아무것도 하지 않음)"""
+    current = _recorder
+    if current is not None:
+        current.count(name, n)
+
+
+def add_profile_argument(parser):
+    parser.add_argument("--profile", action="store_true",
+                        help="단계별 시간/카운터를 기록해 끝날 때 요약 표 출력")
+    parser.add_argument("--trace", metavar="TRACE.json",
+                        help="기록을 Chrome trace-event JSON 으로 저장 (--profile 없이도 기록)")
+
+
+def start(args):
+    """--profile/--trace 가 있으면 기록 시작"""
+    if args.profile or args.trace:
+        enable()
+
+
+def report(args):
+    """--trace 면 trace 파일을, --profile 이면 요약 표를 쓰고 기록을 끝냄"""
+    current = disable()
+    if current is None:
+        return
+    if args.trace:
+        current.save_trace(args.trace)
+        print(f"프로파일 저장: {args.trace}", file=sys.stderr)
+    if args.profile:
+        print(current.summary(), file=sys.stderr)
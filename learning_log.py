@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""학습 기록용 덧붙이기 전용 이벤트 로그와 요약 스냅숏
+
+답 하나를 기록할 때마다 이벤트 로그(<학습자>.events.jsonl)에 한 줄을 덧붙이고
+메모리의 한자별 요약만 고친다. 학습자 JSON(스냅숏)은 압축(compact) 때만
+다시 쓰며, 어디까지 반영했는지를 "eventLog": {"offset": 바이트} 로 남긴다.
+다시 열 때는 그 위치 이후의 로그만 재생한다.
+
+로그 한 줄 형식:
+    {"character": "人", "state": {요약 필드...}, "event": {"timestamp", "type", ...}}
+state 는 이벤트를 반영한 뒤의 요약 필드 값이고, event 는 studyHistory 에 들어간다.
+스냅숏의 studyHistory 는 최근 history_limit 개만 남긴다 (전체 기록은 로그에 있다).
+
+    log = LearningLog("data/learning/default_user.json", compact_interval=30)
+    log.append({"character": "人", "state": {...}, "event": {...}})
+    log.close()    # 마지막으로 압축하고 백그라운드 스레드 종료
+"""
+
+import json
+import os
+import threading
+
+# 스냅숏에 남길 한자별 studyHistory 개수
+HISTORY_LIMIT = 100
+# 이만큼 이벤트가 쌓이면 백그라운드에서 압축
+COMPACT_EVENTS = 1000
+
+
+class LearningLog:
+    """학습자 스냅숏 + 이벤트 로그
+
+    compact_interval(초)을 주면 백그라운드 스레드가 주기적으로, 그리고 압축하지
+    않은 이벤트가 compact_events 개 쌓일 때마다 스냅숏을 다시 쓴다.
+    """
+
+    def __init__(self, path, log_path=None, history_limit=HISTORY_LIMIT,
+                 compact_interval=None, compact_events=COMPACT_EVENTS):
+        self.path = path
+        self.log_path = log_path or os.path.splitext(path)[0] + ".events.jsonl"
+        self.history_limit = history_limit
+        self.compact_events = compact_events
+        with open(path, "r", encoding="utf-8") as f:
+            self.data = json.load(f)
+        self.characters = self.data.setdefault("characters", {})
+
+        self._lock = threading.Lock()
+        # 스냅숏 파일 쓰기는 한 번에 하나만
+        self._compact_lock = threading.Lock()
+        self._snapshot_offset = self.data.get("eventLog", {}).get("offset", 0)
+        self.replayed = self._replay()
+        # 로그 파일은 첫 append() 때 연다 (읽기만 할 때는 파일을 만들지 않음)
+        self._file = None
+        self._offset = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        self._pending = self.replayed
+
+        self._wake = threading.Event()
+        self._closing = False
+        self._thread = None
+        if compact_interval is not None:
+            self._thread = threading.Thread(target=self._compact_loop, args=(compact_interval,),
+                                            name="learning-log-compact", daemon=True)
+            self._thread.start()
+
+    # 재생
+
+    def _replay(self):
+        """스냅숏 이후의 로그를 적용하고 적용한 줄 수를 반환 (로그가 없으면 0)
+
+        끝이 잘린 마지막 줄(기록 중 종료)은 잘라 내서 다음 기록과 섞이지 않게 한다.
+        """
+        if not os.path.exists(self.log_path):
+            self._snapshot_offset = 0
+            return 0
+        if os.path.getsize(self.log_path) < self._snapshot_offset:
+            # 로그가 스냅숏보다 짧으면 다른 로그다. 처음부터 다시 적용하지 않는다
+            raise ValueError(f"{self.log_path}: 로그가 스냅숏({self._snapshot_offset}바이트)보다 짧습니다")
+        count = 0
+        with open(self.log_path, "rb") as f:
+            f.seek(self._snapshot_offset)
+            position = self._snapshot_offset
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("끝나지 않은 줄")
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(entry)
+                position += len(line)
+                count += 1
+        if position < os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(position)
+        return count
+
+    def _apply(self, entry):
+        state = self.characters.setdefault(entry["character"], {"character": entry["character"]})
+        state.update(entry["state"])
+        history = state.setdefault("studyHistory", [])
+        history.append(entry["event"])
+        if len(history) > self.history_limit:
+            del history[:len(history) - self.history_limit]
+
+    # 기록
+
+    def append(self, entry):
+        """이벤트 하나를 로그에 덧붙이고 요약에 반영 (파일 쓰기는 한 줄뿐)"""
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                self._file = open(self.log_path, "ab")
+            self._file.write(line)
+            self._file.flush()
+            self._offset += len(line)
+            self._apply(entry)
+            self._pending += 1
+            pending = self._pending
+        if self._thread is not None and pending >= self.compact_events:
+            self._wake.set()
+
+    # 압축
+
+    def compact(self):
+        """지금까지의 요약을 스냅숏에 쓰고 반영한 로그 위치를 기록
+
+        요약은 기록 잠금 안에서 문자열로 만들고, 파일 쓰기는 그 밖에서 하므로
+        압축하는 동안에도 append() 는 막히지 않는다.
+        """
+        with self._compact_lock:
+            with self._lock:
+                if self._pending == 0 and self._snapshot_offset == self._offset:
+                    return False
+                self.data["eventLog"] = {"offset": self._offset}
+                text = json.dumps(self.data, ensure_ascii=False, indent=2)
+                offset, self._pending = self._offset, 0
+            tmp_file = self.path + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_file, self.path)
+            self._snapshot_offset = offset
+            return True
+
+    def _compact_loop(self, interval):
+        while not self._closing:
+            self._wake.wait(interval)
+            self._wake.clear()
+            if not self._closing:
+                self.compact()
+
+    def close(self):
+        """백그라운드 압축을 멈추고 마지막으로 압축한 뒤 로그를 닫음"""
+        self._closing = True
+        if self._thread is not None:
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.compact()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
 import json
-import time
 import sys
 import os
 import turtle
 from turtle import Screen, Turtle
 
+import instrumentation
+from animation import FrameScheduler, TurtleReveal, turtle_scheduler
+from background_layer import set_turtle_background
+
 # 한자 획순 데이터 로드
 def load_hanja_data(file_path='hanja_strokes.json'):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with instrumentation.span("load_data", path=file_path), open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
         print(f"Error: '{file_path}' 파일을 찾을 수 없습니다.")
@@ -33,40 +37,8 @@ def draw_hanja(hanja_char, hanja_data, delay=0.5, pen_size=5, grid=True):
     screen.setup(400, 400)
     screen.bgcolor("white")
 
-    # 그리드 그리기 (옵션)
-    if grid:
-        grid_drawer = Turtle()
-        grid_drawer.hideturtle()
-        grid_drawer.speed(0)
-        grid_drawer.pencolor("lightgray")
-        grid_drawer.pensize(1)
-        
-        # 세로선
-        for x in range(-100, 101, 20):
-            grid_drawer.penup()
-            grid_drawer.goto(x, -100)
-            grid_drawer.pendown()
-            grid_drawer.goto(x, 100)
-        
-        # 가로선
-        for y in range(-100, 101, 20):
-            grid_drawer.penup()
-            grid_drawer.goto(-100, y)
-            grid_drawer.pendown()
-            grid_drawer.goto(100, y)
-
-    # 한자 테두리 그리기
-    border = Turtle()
-    border.hideturtle()
-    border.speed(0)
-    border.pencolor("black")
-    border.pensize(2)
-    border.penup()
-    border.goto(-100, -100)
-    border.pendown()
-    for _ in range(4):
-        border.forward(200)
-        border.left(90)
+    # 그리드와 테두리는 캐시된 배경 그림 한 장으로 깐다
+    set_turtle_background(screen, 400, 400, grid, "white", border="black")
 
     # 획순 정보 표시
     info = Turtle()
@@ -80,56 +52,83 @@ def draw_hanja(hanja_char, hanja_data, delay=0.5, pen_size=5, grid=True):
     # 획 그리기 준비
     t = Turtle()
     t.hideturtle()
-    t.speed(6)  # 적당한 속도
     t.pensize(pen_size)
     t.pencolor("black")
 
-    # 획순대로 그리기
+    # 획순대로 그리기 (좌표계 변환)
     strokes = hanja_data[hanja_char]['strokes']
-    for i, stroke in enumerate(strokes, 1):
-        # 획 정보 표시
+    polylines = [[(s['x1'] - 100, 100 - s['y1']), (s['x2'] - 100, 100 - s['y2'])]
+                 for s in strokes]
+
+    # 획 정보 표시
+    def on_stroke(index):
         info.clear()
-        info.write(f"{hanja_char} ({hanja_data[hanja_char]['meaning']}) - {i}/{hanja_data[hanja_char]['stroke_count']}획: {stroke['desc']}", 
+        info.goto(0, -140)
+        info.write(f"{hanja_char} ({hanja_data[hanja_char]['meaning']}) - {index + 1}/{hanja_data[hanja_char]['stroke_count']}획: {strokes[index]['desc']}", 
                   align="center", font=("Arial", 12, "bold"))
-        
-        # 획 그리기
-        t.penup()
-        t.goto(stroke['x1'] - 100, 100 - stroke['y1'])  # 좌표계 변환
-        t.pendown()
-        t.goto(stroke['x2'] - 100, 100 - stroke['y2'])  # 좌표계 변환
-        
-        # 각 획을 그린 후 지연
-        time.sleep(delay)
-
-    # 최종 정보 표시
-    info.clear()
-    info.write(f"{hanja_char} ({hanja_data[hanja_char]['meaning']}) - 완성 (총 {hanja_data[hanja_char]['stroke_count']}획)", 
-              align="center", font=("Arial", 12, "bold"))
 
-    # 클릭 시 종료 메시지
-    info.goto(0, -160)
-    info.write("클릭하여 종료하세요", align="center", font=("Arial", 10, "normal"))
+    reveal = TurtleReveal(t, polylines, on_stroke)
+
+    def on_frame(progress):
+        reveal.show(progress)
+        with instrumentation.span("screen_update"):
+            screen.update()
+
+    def on_finish():
+        # 최종 정보 표시
+        info.clear()
+        info.write(f"{hanja_char} ({hanja_data[hanja_char]['meaning']}) - 완성 (총 {hanja_data[hanja_char]['stroke_count']}획)", 
+                  align="center", font=("Arial", 12, "bold"))
+
+        # 클릭 시 종료 메시지
+        info.goto(0, -160)
+        info.write("클릭하여 종료하세요", align="center", font=("Arial", 10, "normal"))
+        screen.update()
+
+    # 획마다 delay 초씩, 이벤트 루프의 타이머로 애니메이션
+    screen.tracer(0)
+    scheduler = FrameScheduler(turtle_scheduler(screen), max(delay, 0.01) * len(polylines),
+                               on_frame, on_finish)
+    screen.onkey(scheduler.toggle_pause, "space")
+    screen.listen()
+    scheduler.start()
     
     screen.exitonclick()
 
-# 사용 가능한 한자 목록 출력
-def list_available_hanja(hanja_data):
+# 사용 가능한 한자 목록 출력 (query 가 있으면 독음/뜻/예시 단어로 찾은 한자만)
+def list_available_hanja(hanja_data, query=None):
+    if query:
+        from hanja_search import suggest
+        found = suggest(query, hanja_data)
+        if found:
+            print(f"'{query}' 로 찾은 한자: {', '.join(found)}")
+            return
     print("사용 가능한 한자:")
     for char, data in hanja_data.items():
         print(f"  {char} - {data['meaning']} ({data['stroke_count']}획)")
 
 def main():
+    parser = argparse.ArgumentParser(description="한자 획순 그리기 (turtle)")
+    parser.add_argument("hanja", nargs="?", help="그릴 한자 (없으면 목록을 보여 주고 입력 받음)")
+    instrumentation.add_profile_argument(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+    try:
+        run(args.hanja)
+    finally:
+        instrumentation.report(args)
+
+def run(hanja_char=None):
     # 한자 데이터 로드
     hanja_data = load_hanja_data()
     
     # 명령줄 인자 확인
-    if len(sys.argv) > 1:
-        hanja_char = sys.argv[1]
+    if hanja_char:
         if hanja_char in hanja_data:
             draw_hanja(hanja_char, hanja_data)
         else:
             print(f"Error: '{hanja_char}' 한자의 데이터가 없습니다.")
-            list_available_hanja(hanja_data)
+            list_available_hanja(hanja_data, hanja_char)
     else:
         # 인자가 없으면 사용 가능한 한자 목록 출력 후 선택 받기
         list_available_hanja(hanja_data)
@@ -141,6 +140,7 @@ def main():
                 draw_hanja(hanja_char, hanja_data)
             else:
                 print(f"Error: '{hanja_char}' 한자의 데이터가 없습니다.")
+                list_available_hanja(hanja_data, hanja_char)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
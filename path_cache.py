@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""컴파일된 획 경로 캐시
+
+같은 경로 문자열을 매번 정규식으로 파싱하고 평탄화하지 않도록
+(경로, 허용 오차, 배율) 별로 좌표 배열을 LRU 방식으로 보관한다.
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+import instrumentation
+from path_flattener import flatten_path
+
+DEFAULT_MAXSIZE = 4096
+
+
+class PathCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, steps=50, cache_file=None):
+        self.maxsize = maxsize
+        self.steps = steps
+        self.cache_file = cache_file
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if cache_file and os.path.exists(cache_file):
+            self.load(cache_file)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_points(self, path_str, tolerance=None, scale=1.0):
+        """경로의 (N, 2) 좌표 배열 반환 (읽기 전용, 배율 적용됨)"""
+        key = (path_str, tolerance, float(scale))
+        points = self._entries.get(key)
+        if points is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            instrumentation.count("path_cache_hits")
+            return points
+
+        self.misses += 1
+        points = flatten_path(path_str, self.steps, tolerance)
+        if scale != 1:
+            points *= scale
+        points.flags.writeable = False
+        self._put(key, points)
+        return points
+
+    def _put(self, key, points):
+        self._entries[key] = points
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """히트/미스/제거 횟수"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def save(self, cache_file=None):
+        """캐시 내용을 .npz 파일로 저장 (오래된 항목부터)"""
+        cache_file = cache_file or self.cache_file
+        if not cache_file:
+            return
+        keys = [json.dumps(key, ensure_ascii=False) for key in self._entries]
+        arrays = list(self._entries.values())
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(a) for a in arrays])
+        points = np.concatenate(arrays) if arrays else np.empty((0, 2))
+
+        # 저장 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(f, steps=np.array([self.steps]), keys=np.array(keys, dtype=str),
+                     offsets=offsets, points=points)
+        os.replace(tmp_file, cache_file)
+
+    def load(self, cache_file=None):
+        """저장된 캐시 파일을 읽어 미리 채움 (단계 수가 다르면 무시)"""
+        cache_file = cache_file or self.cache_file
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                if int(data["steps"][0]) != self.steps:
+                    return 0
+                # 좌표를 단순화해 저장하던 예전 캐시 파일은 쓰지 않음
+                if "simplify" in data and float(data["simplify"][0]):
+                    return 0
+                keys, offsets, points = data["keys"], data["offsets"], data["points"]
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: 경로 캐시 파일 '{cache_file}' 을 읽을 수 없습니다: {e}")
+            return 0
+
+        for i, key in enumerate(keys):
+            path_str, tolerance, scale = json.loads(str(key))
+            entry = points[offsets[i]:offsets[i + 1]]
+            entry.flags.writeable = False
+            self._put((path_str, tolerance, scale), entry)
+        return len(keys)
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """프로세스 전체에서 공유하는 기본 캐시"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PathCache()
+    return _default_cache
+
+
+def set_default_cache(cache):
+    global _default_cache
+    _default_cache = cache
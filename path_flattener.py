@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""SVG 획 경로 평탄화 엔진
+
+경로 문자열을 한 번 컴파일해 모든 선분을 3차 베지어 제어점 배열로 바꾼 뒤,
+NumPy 로 한꺼번에 계산하여 (N, 2) 좌표 배열을 만든다.
+"""
+
+import re
+from collections import namedtuple
+
+import numpy as np
+
+import instrumentation
+
+# 선분 종류
+SEG_MOVE, SEG_LINE, SEG_QUAD, SEG_CUBIC = range(4)
+
+# 곡선 하나를 나눌 수 있는 최대 개수 (잘못된 허용 오차로 인한 폭주 방지)
+MAX_SUBDIVISIONS = 1024
+
+_COMMAND_PATTERN = re.compile(r'([MLHVCQZmlhvcqz])([^MLHVCSQTAZmlhvcsqtaz]*)')
+_NUMBER_PATTERN = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_ARITY = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'Q': 4, 'C': 6}
+
+# segments: (S, 4, 2) 3차 베지어 제어점, kinds: (S,) 원래 선분 종류
+CompiledPath = namedtuple("CompiledPath", ["segments", "kinds"])
+
+
+def _line_segment(p0, p3):
+    """직선을 3차 베지어로 표현 (제어점을 1/3, 2/3 지점에 둔다)"""
+    (x0, y0), (x3, y3) = p0, p3
+    return ((x0, y0),
+            (x0 + (x3 - x0) / 3, y0 + (y3 - y0) / 3),
+            (x0 + 2 * (x3 - x0) / 3, y0 + 2 * (y3 - y0) / 3),
+            (x3, y3))
+
+
+def compile_path(path_str):
+    """SVG 경로 문자열을 3차 베지어 제어점 배열로 컴파일
+
+    직선과 2차 베지어는 차수를 올려 3차 베지어로 표현하고, M 은 네 제어점이
+    모두 같은 점인 선분으로 넣어 평탄화 결과에 시작점이 포함되도록 한다.
+    """
+    return _compile((match.group(1), [float(x) for x in _NUMBER_PATTERN.findall(match.group(2))])
+                    for match in _COMMAND_PATTERN.finditer(path_str))
+
+
+def compile_commands(ops, values):
+    """명령 글자 코드 배열과 인자 배열로 컴파일 (문자열 파싱 없음)
+
+    stroke_pack 의 ops (u8) 와 배율을 나눈 numbers 를 그대로 받는다. 명령마다
+    인자는 한 벌씩 들어 있어야 한다.
+    """
+    values = np.asarray(values, dtype=np.float64).tolist()
+    commands = []
+    position = 0
+    for op in np.asarray(ops).tolist():
+        arity = int(_OP_ARITY[op])
+        if arity < 0:
+            raise ValueError(f"지원하지 않는 경로 명령: {chr(op)}")
+        commands.append((chr(op), values[position:position + arity]))
+        position += arity
+    return _compile(commands)
+
+
+def compile_command_groups(ops, values, offsets):
+    """여러 경로의 명령을 이어 붙인 배열을 한꺼번에 컴파일해 경로별 CompiledPath 목록으로
+
+    i 번째 경로의 명령은 ops[offsets[i]:offsets[i + 1]] 이다 (stroke_pack 의 한 글자).
+    절대 좌표 M/L/Q/C 만 있으면 모든 경로를 NumPy 로 한 번에 계산해 잘라 나누고,
+    그 밖의 명령이 섞여 있으면 경로마다 compile_commands 로 처리한다.
+    """
+    ops = np.asarray(ops, dtype=np.uint8)
+    values = np.asarray(values, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if _ABSOLUTE_KIND[ops].min(initial=0) < 0:
+        arity = _OP_ARITY[ops]
+        value_offsets = np.concatenate([[0], np.cumsum(arity)])[offsets]
+        return [compile_commands(ops[a:b], values[c:d])
+                for a, b, c, d in zip(offsets[:-1], offsets[1:], value_offsets[:-1], value_offsets[1:])]
+
+    kinds = _ABSOLUTE_KIND[ops].astype(np.uint8)
+    arity = _OP_ARITY[ops]
+    first = np.cumsum(arity) - arity
+    # 명령마다 끝점, 시작점은 앞 명령의 끝점 (경로의 처음은 원점)
+    end = np.column_stack([values[first + arity - 2], values[first + arity - 1]])
+    current = np.zeros_like(end)
+    current[1:] = end[:-1]
+    current[offsets[:-1][offsets[:-1] < len(ops)]] = 0.0
+
+    # 기본은 직선 (제어점을 1/3, 2/3 지점에)
+    p1 = current + (end - current) / 3
+    p2 = current + 2 * (end - current) / 3
+    quad = kinds == SEG_QUAD
+    if quad.any():
+        q = np.column_stack([values[first[quad]], values[first[quad] + 1]])
+        p1[quad] = current[quad] + 2 * (q - current[quad]) / 3
+        p2[quad] = end[quad] + 2 * (q - end[quad]) / 3
+    cubic = kinds == SEG_CUBIC
+    if cubic.any():
+        f = first[cubic]
+        p1[cubic] = np.column_stack([values[f], values[f + 1]])
+        p2[cubic] = np.column_stack([values[f + 2], values[f + 3]])
+    move = kinds == SEG_MOVE
+    segments = np.stack([current, p1, p2, end], axis=1)
+    segments[move] = end[move][:, None]
+
+    bounds = offsets.tolist()
+    return [CompiledPath(segments[a:b], kinds[a:b]) for a, b in zip(bounds, bounds[1:])]
+
+
+# 명령 글자 코드 → 인자 수 (지원하지 않는 명령은 -1)
+_OP_ARITY = np.full(256, -1, dtype=np.int64)
+for _cmd, _arity in list(_ARITY.items()) + [('Z', 0)]:
+    _OP_ARITY[ord(_cmd)] = _OP_ARITY[ord(_cmd.lower())] = _arity
+# 명령 글자 코드 → 선분 종류 (절대 좌표 M/L/Q/C 만, 나머지는 -1)
+_ABSOLUTE_KIND = np.full(256, -1, dtype=np.int8)
+for _cmd, _kind in (('M', SEG_MOVE), ('L', SEG_LINE), ('Q', SEG_QUAD), ('C', SEG_CUBIC)):
+    _ABSOLUTE_KIND[ord(_cmd)] = _kind
+
+
+def _compiled(path):
+    """경로 문자열의 CompiledPath (compiled() 가 있는 경로, 예: 팩의 PackedPath 는 그것을 씀)"""
+    compiled = getattr(path, "compiled", None)
+    return compiled() if compiled is not None else compile_path(path)
+
+
+def _compile(commands):
+    """(명령, 인자 목록) 들을 CompiledPath 로"""
+    segments = []
+    kinds = []
+    current = (0.0, 0.0)
+    start = current
+
+    for cmd, values in commands:
+        relative = cmd.islower()
+        cmd = cmd.upper()
+
+        if cmd == 'Z':
+            if current != start:
+                segments.append(_line_segment(current, start))
+                kinds.append(SEG_LINE)
+            current = start
+            continue
+
+        # 좌표가 반복되면 같은 명령을 이어서 적용 (SVG 규칙)
+        arity = _ARITY[cmd]
+        for i in range(0, len(values) - arity + 1, arity):
+            args = values[i:i + arity]
+            ox, oy = current if relative else (0.0, 0.0)
+
+            if cmd == 'H':
+                args = [args[0] + ox, current[1]]
+            elif cmd == 'V':
+                args = [current[0], args[0] + oy]
+            else:
+                args = [v + (ox if j % 2 == 0 else oy) for j, v in enumerate(args)]
+            pts = [(args[j], args[j + 1]) for j in range(0, len(args), 2)]
+
+            if cmd == 'M' and i == 0:
+                segments.append((pts[0],) * 4)
+                kinds.append(SEG_MOVE)
+                start = pts[0]
+            elif cmd in ('M', 'L', 'H', 'V'):
+                segments.append(_line_segment(current, pts[0]))
+                kinds.append(SEG_LINE)
+            elif cmd == 'Q':
+                (x0, y0), (qx, qy), (x3, y3) = current, pts[0], pts[1]
+                segments.append(((x0, y0),
+                                 (x0 + 2 * (qx - x0) / 3, y0 + 2 * (qy - y0) / 3),
+                                 (x3 + 2 * (qx - x3) / 3, y3 + 2 * (qy - y3) / 3),
+                                 (x3, y3)))
+                kinds.append(SEG_QUAD)
+            else:  # 'C'
+                segments.append((current, pts[0], pts[1], pts[2]))
+                kinds.append(SEG_CUBIC)
+            current = pts[-1]
+
+    return CompiledPath(np.array(segments, dtype=np.float64).reshape(-1, 4, 2),
+                        np.array(kinds, dtype=np.uint8))
+
+
+def subdivision_counts(compiled, steps=50, tolerance=None):
+    """선분마다 나눌 개수 계산
+
+    tolerance 가 없으면 기존과 같이 모든 선분을 steps 개로 나눈다. tolerance 를
+    주면 평탄도 기준으로 필요한 만큼만 나누며, 직선은 끝점 하나만 남는다.
+    """
+    segments, kinds = compiled
+    if tolerance is None:
+        counts = np.full(len(kinds), steps, dtype=np.int64)
+    else:
+        # 3차 베지어를 n 개의 직선으로 근사할 때의 오차는 3/4 * d / n^2 이하
+        d1 = segments[:, 0] - 2 * segments[:, 1] + segments[:, 2]
+        d2 = segments[:, 1] - 2 * segments[:, 2] + segments[:, 3]
+        d = np.maximum(np.hypot(d1[:, 0], d1[:, 1]), np.hypot(d2[:, 0], d2[:, 1]))
+        counts = np.ceil(np.sqrt(0.75 * d / tolerance)).astype(np.int64)
+        np.clip(counts, 1, MAX_SUBDIVISIONS, out=counts)
+        counts[kinds == SEG_LINE] = 1
+    counts[kinds == SEG_MOVE] = 1
+    return counts
+
+
+def evaluate_segments(segments, counts):
+    """모든 선분을 한 번에 계산하여 (N, 2) 배열로 반환
+
+    선분 i 는 t = 1/n .. 1 의 n 개 점을 만든다 (시작점은 앞 선분의 끝점).
+    """
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty((0, 2), dtype=np.float64)
+
+    seg_index = np.repeat(np.arange(len(counts)), counts)
+    first = np.cumsum(counts) - counts
+    t = (np.arange(total) - first[seg_index] + 1) / counts[seg_index]
+    mt = 1.0 - t
+
+    p = segments[seg_index]
+    points = ((mt ** 3)[:, None] * p[:, 0]
+              + (3 * mt * mt * t)[:, None] * p[:, 1]
+              + (3 * mt * t * t)[:, None] * p[:, 2]
+              + (t ** 3)[:, None] * p[:, 3])
+    return np.ascontiguousarray(points)
+
+
+def flatten_compiled(compiled, steps=50, tolerance=None):
+    """컴파일된 경로를 (N, 2) 좌표 배열로 평탄화"""
+    return evaluate_segments(compiled.segments,
+                             subdivision_counts(compiled, steps, tolerance))
+
+
+def flatten_path(path_str, steps=50, tolerance=None):
+    """SVG 경로 문자열 하나를 (N, 2) 좌표 배열로 평탄화"""
+    with instrumentation.span("parse_path"):
+        compiled = _compiled(path_str)
+    with instrumentation.span("flatten_path"):
+        points = flatten_compiled(compiled, steps, tolerance)
+    instrumentation.count("paths_parsed")
+    instrumentation.count("points_generated", len(points))
+    return points
+
+
+def flatten_paths(path_strs, steps=50, tolerance=None):
+    """여러 경로(예: 한 글자의 모든 획)를 한 번의 계산으로 평탄화
+
+    (points, offsets) 를 반환한다. i 번째 경로의 점은
+    points[offsets[i]:offsets[i + 1]] 이다.
+    """
+    compiled = [_compiled(p) for p in path_strs]
+    if not compiled:
+        return np.empty((0, 2), dtype=np.float64), np.zeros(1, dtype=np.int64)
+
+    counts = [subdivision_counts(c, steps, tolerance) for c in compiled]
+    offsets = np.zeros(len(compiled) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([int(c.sum()) for c in counts])
+
+    segments = np.concatenate([c.segments for c in compiled])
+    points = evaluate_segments(segments, np.concatenate(counts))
+    return points, offsets
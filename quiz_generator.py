@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""미리 계산한 오답 후보 표로 객관식 한자 퀴즈 만들기
+
+한자마다 헷갈리기 쉬운 한자를 네 가지로 모아 둔다.
+- radical: 부수가 같은 한자
+- strokes: 획수가 가까운 한자 (±NEAR_STROKES)
+- pronunciation: 음이 같거나 비슷한 한자
+- shape: 모양이 비슷한 한자
+메타데이터(뜻, 음, 획수, 부수)와 hanja_relations.json 의 radical_relations,
+similar_pronunciation, similar_shape 에서 만든다. 종류마다 MAX_PER_KIND 개까지만
+두므로, 문제 하나를 만들 때 표를 훑지 않고 몇 번의 무작위 선택으로 끝난다.
+
+    generator = QuizGenerator.build(CharacterStore())
+    for question in generator.questions(10):
+        question.prompt, question.choices, question.answer
+
+사용 예:
+    python quiz_generator.py --build
+    python quiz_generator.py -n 5 --kind meaning
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+from collections import namedtuple
+
+DEFAULT_RELATIONS = "data/new-structure/relations/hanja_relations.json"
+# 표 파일은 데이터마다 따로 (table_file)
+DEFAULT_TABLE_DIR = ".cache"
+TABLE_VERSION = 1
+
+DISTRACTOR_KINDS = ("radical", "strokes", "pronunciation", "shape")
+# 종류별로 남길 오답 후보 수
+MAX_PER_KIND = 12
+# 획수가 이만큼 차이 나는 한자까지 "가까운 획수" 로 본다
+NEAR_STROKES = 2
+
+# 문제 종류
+#   character: 뜻과 음을 보고 한자 고르기
+#   meaning: 한자를 보고 뜻 고르기
+#   stroke_count: 한자를 보고 총 획수 고르기
+QUESTION_KINDS = ("character", "meaning", "stroke_count")
+
+# choices 중 answer 번째(0부터)가 정답
+Question = namedtuple("Question", ["character", "kind", "prompt", "choices", "answer"])
+
+
+def _id_character(hanja_id):
+    """"HJ-15-0001-4E00" → "一" """
+    return chr(int(hanja_id.rsplit("-", 1)[1], 16))
+
+
+def _is_hanja(char):
+    return len(char) == 1 and ord(char) >= 0x3400
+
+
+def load_metadata(hanja_data):
+    """{한자: 레코드} → {한자: {"meaning", "pronunciation", "stroke_count", "radical"}}
+
+    뜻이 있는 한자만 남긴다.
+    """
+    metadata = {}
+    for char in hanja_data:
+        if not _is_hanja(char):
+            continue
+        record = hanja_data[char]
+        if not record.get("meaning"):
+            continue
+        metadata[char] = {
+            "meaning": record["meaning"],
+            "pronunciation": record.get("pronunciation") or "",
+            "stroke_count": int(record.get("stroke_count") or len(record.get("strokes", []))),
+            "radical": record.get("radical") or "",
+        }
+    return metadata
+
+
+def table_file(metadata, directory=DEFAULT_TABLE_DIR):
+    """메타데이터별 표 파일 경로 (데이터가 다르면 파일도 달라 서로 덮어쓰지 않음)"""
+    text = json.dumps(metadata, ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(directory, f"quiz_tables-{digest}.json")
+
+
+def _relation_table(relations, key):
+    """관계 파일의 ID → ID 목록을 한자 → 한자 목록으로 (중복 제거, 순서 유지)"""
+    table = {}
+    for hanja_id, others in relations.get(key, {}).items():
+        char = _id_character(hanja_id)
+        targets = table.setdefault(char, [])
+        for other in others:
+            other_char = _id_character(other)
+            if other_char != char and other_char not in targets:
+                targets.append(other_char)
+    return table
+
+
+def build_tables(metadata, relations=None, shape_index=None, max_per_kind=MAX_PER_KIND):
+    """한자 → {종류: [오답 후보 한자, ...]} 표 만들기
+
+    relations 는 hanja_relations.json 내용, shape_index 는 shape_index.ShapeIndex
+    (있으면 similar_shape 가 모자란 한자를 채운다).
+    """
+    relations = relations or {}
+    by_radical, by_pronunciation, by_strokes = {}, {}, {}
+    for char, info in metadata.items():
+        if info["radical"]:
+            by_radical.setdefault(info["radical"], []).append(char)
+        if info["pronunciation"]:
+            by_pronunciation.setdefault(info["pronunciation"], []).append(char)
+        by_strokes.setdefault(info["stroke_count"], []).append(char)
+
+    related = {
+        "radical": _relation_table(relations, "radical_relations"),
+        "pronunciation": _relation_table(relations, "similar_pronunciation"),
+        "shape": _relation_table(relations, "similar_shape"),
+    }
+    shape_neighbors = {}
+    if shape_index is not None:
+        known = [char for char in metadata if char in shape_index]
+        for char, neighbors in zip(known, shape_index.neighbors_batch(known, max_per_kind)):
+            shape_neighbors[char] = [other for other, _ in neighbors]
+
+    tables = {}
+    for char, info in metadata.items():
+        strokes = info["stroke_count"]
+        # 획수 차이가 작은 것부터
+        near = [other for delta in range(NEAR_STROKES + 1)
+                for count in {strokes - delta, strokes + delta}
+                for other in by_strokes.get(count, ())]
+        candidates = {
+            "radical": related["radical"].get(char, []) + by_radical.get(info["radical"], []),
+            "strokes": near,
+            "pronunciation": related["pronunciation"].get(char, [])
+                             + by_pronunciation.get(info["pronunciation"], []),
+            "shape": related["shape"].get(char, []) + shape_neighbors.get(char, []),
+        }
+        table = {}
+        for kind in DISTRACTOR_KINDS:
+            chosen = []
+            for other in candidates[kind]:
+                if other != char and other in metadata and other not in chosen:
+                    chosen.append(other)
+                    if len(chosen) == max_per_kind:
+                        break
+            table[kind] = chosen
+        tables[char] = table
+    return tables
+
+
+class QuizGenerator:
+    """오답 후보 표로 객관식 문제를 무작위로 생성"""
+
+    def __init__(self, metadata, tables, rng=None, sources=None):
+        self.metadata = metadata
+        self.tables = tables
+        # 표를 만들 때 읽은 파일의 (mtime_ns, 크기). 저장된 표가 최신인지 확인하는 데 쓴다
+        self.sources = sources or {}
+        # 문제를 낼 한자 목록은 한 번만 만든다
+        self.characters = list(metadata)
+        self.rng = rng or random.Random()
+
+    @staticmethod
+    def _stamps(paths):
+        stamps = {}
+        for path in paths:
+            if path and os.path.exists(path):
+                st = os.stat(path)
+                stamps[path] = [st.st_mtime_ns, st.st_size]
+        return stamps
+
+    @classmethod
+    def build(cls, hanja_data, relations_file=DEFAULT_RELATIONS, shape_index=None, rng=None,
+              shape_index_file=None):
+        """표를 새로 만들기 (shape_index_file 은 shape_index 를 읽은 파일, 최신 여부 확인용)"""
+        metadata = load_metadata(hanja_data)
+        relations = None
+        if relations_file and os.path.exists(relations_file):
+            with open(relations_file, "r", encoding="utf-8") as f:
+                relations = json.load(f)
+        return cls(metadata, build_tables(metadata, relations, shape_index), rng,
+                   cls._stamps([relations_file, shape_index_file]))
+
+    @classmethod
+    def load(cls, path, rng=None):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != TABLE_VERSION:
+            raise ValueError(f"{path}: 지원하지 않는 퀴즈 표 버전입니다")
+        return cls(data["metadata"], data["tables"], rng, data.get("sources"))
+
+    def save(self, path=None):
+        """표를 저장하고 경로를 반환 (기본: table_file(메타데이터))"""
+        path = path or table_file(self.metadata)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"version": TABLE_VERSION, "sources": self.sources,
+                       "metadata": self.metadata, "tables": self.tables},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_file, path)
+        return path
+
+    @classmethod
+    def open(cls, hanja_data, path=None, relations_file=DEFAULT_RELATIONS,
+             rng=None, rebuild=False):
+        """저장된 표를 열고, 없거나 낡았으면 다시 만들어 저장
+
+        표 파일은 기본적으로 hanja_data 의 메타데이터별로 따로 둔다 (table_file).
+        관계 파일(과 표를 만들 때 쓴 모양 색인 파일)의 mtime/크기가 그대로이고 저장된
+        메타데이터가 hanja_data 에서 뽑은 것과 같을 때만 저장된 표를 쓴다.
+        """
+        metadata = load_metadata(hanja_data)
+        path = path or table_file(metadata)
+        if not rebuild and os.path.exists(path):
+            try:
+                saved = cls.load(path, rng)
+            except (OSError, ValueError, KeyError):
+                saved = None
+            if (saved is not None and relations_file in saved.sources
+                    and saved.sources == cls._stamps(saved.sources)
+                    and saved.metadata == metadata):
+                return saved
+        generator = cls.build(hanja_data, relations_file, rng=rng)
+        generator.save(path)
+        return generator
+
+    def distractors(self, character, count, kinds=DISTRACTOR_KINDS, key=None):
+        """오답 후보 한자 count 개 (key 로 바꾼 값이 정답이나 서로와 겹치면 건너뜀)
+
+        표의 종류를 무작위 순서로 돌며 하나씩 뽑고, 모자라면 전체에서 뽑는다.
+        시도 횟수는 count 에만 비례한다.
+        """
+        rng = self.rng
+        key = key or (lambda char: char)
+        table = self.tables.get(character, {})
+        seen = {key(character)}
+        chosen = []
+        pools = [table.get(kind, ()) for kind in kinds if table.get(kind)]
+        attempts = 0
+        while len(chosen) < count and attempts < 8 * count:
+            attempts += 1
+            if pools and attempts <= 6 * count:
+                pool = pools[rng.randrange(len(pools))]
+                other = pool[rng.randrange(len(pool))]
+            else:
+                other = self.characters[rng.randrange(len(self.characters))]
+            value = key(other)
+            if value in seen:
+                continue
+            seen.add(value)
+            chosen.append(other)
+        return chosen
+
+    def question(self, character, kind="character", num_choices=4):
+        """한자 하나로 문제 하나 만들기"""
+        info = self.metadata[character]
+        if kind == "character":
+            prompt = f"'{info['meaning']}' 에 해당하는 한자는?"
+            # 뜻이 같은 한자가 오답으로 나오면 정답이 둘이 되므로 뜻으로 중복을 거른다
+            meaning = lambda char: self.metadata[char]["meaning"]
+            wrong = self.distractors(character, num_choices - 1, key=meaning)
+            correct, choices = character, wrong
+        elif kind == "meaning":
+            prompt = f"{character} 의 뜻과 음은?"
+            meaning = lambda char: self.metadata[char]["meaning"]
+            wrong = self.distractors(character, num_choices - 1,
+                                     ("shape", "radical", "strokes"), meaning)
+            correct, choices = info["meaning"], [meaning(c) for c in wrong]
+        elif kind == "stroke_count":
+            prompt = f"{character} ({info['meaning']}) 의 총 획수는?"
+            strokes = info["stroke_count"]
+            # 가까운 획수를 무작위로 섞어 오답으로 쓴다
+            offsets = [d for d in range(-NEAR_STROKES - 1, NEAR_STROKES + 2)
+                       if d and strokes + d > 0]
+            wrong = self.rng.sample(offsets, min(num_choices - 1, len(offsets)))
+            correct, choices = strokes, [strokes + d for d in wrong]
+        else:
+            raise ValueError(f"알 수 없는 문제 종류: {kind}")
+        answer = self.rng.randrange(len(choices) + 1)
+        choices.insert(answer, correct)
+        return Question(character, kind, prompt, choices, answer)
+
+    def questions(self, count, kinds=QUESTION_KINDS, num_choices=4, characters=None, first=()):
+        """문제 count 개를 하나씩 생성 (characters 를 주면 그 안에서만 출제)
+
+        first 의 한자(복습할 한자 등)는 그 순서대로 한 번씩 먼저 내고, 남은 문제는
+        characters 에서 first 를 뺀 한자로 낸다. 남은 문제의 한자와 종류는 매번
+        독립적으로 뽑으므로 같은 한자가 다시 나올 수 있다.
+        """
+        first = list(dict.fromkeys(char for char in first if char in self.metadata))[:count]
+        for character in first:
+            kind = kinds[self.rng.randrange(len(kinds))]
+            yield self.question(character, kind, num_choices)
+
+        asked = set(first)
+        pool = list(characters) if characters is not None else self.characters
+        pool = [char for char in pool if char in self.metadata and char not in asked]
+        if not pool:
+            return
+        for _ in range(count - len(first)):
+            character = pool[self.rng.randrange(len(pool))]
+            kind = kinds[self.rng.randrange(len(kinds))]
+            yield self.question(character, kind, num_choices)
+
+
+def main():
+    from character_store import CharacterStore
+
+    parser = argparse.ArgumentParser(description="객관식 한자 퀴즈 생성")
+    parser.add_argument("--count", "-n", type=int, default=5, help="문제 수")
+    parser.add_argument("--kind", choices=QUESTION_KINDS, action="append",
+                        help="문제 종류 (여러 번 지정 가능, 기본: 모두)")
+    parser.add_argument("--choices", type=int, default=4, help="보기 수")
+    parser.add_argument("--tables",
+                        help="오답 후보 표 파일 (기본: .cache/quiz_tables-<데이터 해시>.json)")
+    parser.add_argument("--build", action="store_true", help="표를 다시 만들어 저장")
+    parser.add_argument("--shape-index", help="shape_index.py 로 만든 색인 (.npz)")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+    parser.add_argument("--json", action="store_true", help="문제를 JSON 줄로 출력")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.build:
+        shape_index = None
+        if args.shape_index:
+            from shape_index import ShapeIndex
+            shape_index = ShapeIndex.load(args.shape_index)
+        generator = QuizGenerator.build(CharacterStore(), shape_index=shape_index, rng=rng,
+                                        shape_index_file=args.shape_index)
+        path = generator.save(args.tables)
+        print(f"오답 후보 표 저장: {path} ({len(generator.characters)}자)", file=sys.stderr)
+    else:
+        generator = QuizGenerator.open(CharacterStore(), args.tables, rng=rng)
+
+    kinds = tuple(args.kind) if args.kind else QUESTION_KINDS
+    for i, question in enumerate(generator.questions(args.count, kinds, args.choices), 1):
+        if args.json:
+            print(json.dumps(question._asdict(), ensure_ascii=False))
+            continue
+        print(f"{i}. {question.prompt}")
+        for n, choice in enumerate(question.choices, 1):
+            print(f"   {n}) {choice}")
+        print(f"   정답: {question.answer + 1}")
+
+
+if __name__ == "__main__":
+    main()
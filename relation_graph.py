@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""hanja_relations.json 의 관계를 배열 기반 그래프 (CSR) 로 만들어 학습 경로 찾기
+
+관계 파일은 관계 종류마다 ID → ID 목록이다 (compound_words 는 단어 목록).
+한자 하나에 급수별 ID 가 여러 개 있고 목록에 중복도 있으므로, 노드는 한자
+(정수 번호) 로 합치고 (출발, 도착, 종류) 가 같은 간선은 하나만 남긴다.
+
+    indptr[i]:indptr[i + 1]   노드 i 의 간선 범위
+    indices[e]                 간선 e 의 도착 노드
+    kinds[e]                   간선 e 의 관계 종류 (KINDS 의 번호)
+
+문자열 목록 dict 대신 정수 배열 세 개만 들고 있으므로 메모리는 간선 수에
+비례한다. 만든 그래프는 .cache/relation_graph.npz 에 저장하고 관계 파일의
+(mtime, 크기) 가 바뀌었을 때만 다시 만든다.
+
+    graph = RelationGraph.open()
+    graph.neighbors("一")                  # [("三", "radical"), ...]
+    graph.k_hop("一", 2)                   # {"三": 1, ..., "二": 2, ...}
+    graph.shortest_path("一", "水")        # ["一", "下", "水"]
+    graph.recommend("一二三", limit=5)     # 다음에 배울 한자 [("月", 6.0), ...]
+
+사용 예:
+    python relation_graph.py 一 --hops 2
+    python relation_graph.py 一 --path 水 --kinds radical shape
+    python relation_graph.py --recommend 一二三人
+"""
+
+import argparse
+import array
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+GRAPH_VERSION = 1
+DEFAULT_RELATIONS = os.path.join("data", "new-structure", "relations", "hanja_relations.json")
+DEFAULT_GRAPH_FILE = os.path.join(".cache", "relation_graph.npz")
+
+# 관계 종류 (번호 순서) 와 관계 파일의 키
+KINDS = ("radical", "shape", "pronunciation", "compound")
+RELATION_KEYS = {
+    "radical": "radical_relations",
+    "shape": "similar_shape",
+    "pronunciation": "similar_pronunciation",
+    "compound": "compound_words",
+}
+# 추천 점수에서 관계 종류별 가중치 (같은 단어에 나오는 한자를 먼저)
+RECOMMEND_WEIGHTS = {"compound": 3.0, "radical": 2.0, "shape": 1.0, "pronunciation": 1.0}
+
+
+def _id_character(hanja_id):
+    """"HJ-15-0001-4E00" → "一" """
+    return chr(int(hanja_id.rsplit("-", 1)[1], 16))
+
+
+def _is_hanja(char):
+    return ord(char) >= 0x3400 and not 0xAC00 <= ord(char) < 0xD7A4
+
+
+def relation_edges(relations):
+    """관계 파일 내용 → (한자 목록, 출발 배열, 도착 배열, 종류 배열), 중복 간선 포함
+
+    compound_words 는 단어에 함께 나오는 다른 한자로 간선을 만든다.
+    """
+    positions = {}
+    # 간선마다 파이썬 객체를 만들지 않도록 정수 배열에 바로 쌓는다
+    src, dst, kind = array.array("i"), array.array("i"), array.array("B")
+
+    def node(char):
+        position = positions.get(char)
+        if position is None:
+            position = positions[char] = len(positions)
+        return position
+
+    for code, name in enumerate(KINDS):
+        for hanja_id, targets in relations.get(RELATION_KEYS[name], {}).items():
+            char = _id_character(hanja_id)
+            start = node(char)
+            for target in targets:
+                if name == "compound":
+                    others = [c for c in target.get("word", "") if c != char and _is_hanja(c)]
+                else:
+                    others = [_id_character(target)]
+                for other in others:
+                    if other != char:
+                        src.append(start)
+                        dst.append(node(other))
+                        kind.append(code)
+    return (list(positions), np.frombuffer(src, dtype=np.int32), np.frombuffer(dst, dtype=np.int32),
+            np.frombuffer(kind, dtype=np.uint8))
+
+
+def _kind_mask(kinds):
+    """관계 종류 이름들 → 비트 마스크 (None 이면 모든 종류)"""
+    if kinds is None:
+        return (1 << len(KINDS)) - 1
+    mask = 0
+    for name in [kinds] if isinstance(kinds, str) else kinds:
+        if name not in KINDS:
+            raise ValueError(f"알 수 없는 관계 종류: {name}")
+        mask |= 1 << KINDS.index(name)
+    return mask
+
+
+class RelationGraph:
+    """정수 노드 번호의 CSR 인접 배열과 이웃/k-hop/최단 경로/추천 질의"""
+
+    def __init__(self, characters, indptr, indices, kinds, source=None):
+        self.characters = list(characters)
+        self.indptr = np.ascontiguousarray(indptr, dtype=np.int64)
+        self.indices = np.ascontiguousarray(indices, dtype=np.int32)
+        self.kinds = np.ascontiguousarray(kinds, dtype=np.uint8)
+        # 관계 파일의 [mtime_ns, 크기] (저장된 그래프가 최신인지 확인용)
+        self.source = source
+        self._positions = {char: i for i, char in enumerate(self.characters)}
+
+    @classmethod
+    def from_relations(cls, relations, source=None):
+        """관계 파일 내용으로 그래프 만들기 (중복 간선 제거, 출발 → 종류 → 도착 순 정렬)"""
+        characters, src, dst, kind = relation_edges(relations)
+        n = len(characters)
+        # (출발, 종류, 도착) 을 정수 하나로 묶어 정렬과 중복 제거를 한 번에
+        keys = np.unique((src.astype(np.int64) * len(KINDS) + kind) * max(n, 1) + dst)
+        dst = (keys % max(n, 1)).astype(np.int32)
+        kind = (keys // max(n, 1) % len(KINDS)).astype(np.uint8)
+        src = keys // max(n, 1) // len(KINDS)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(characters, indptr, dst, kind, source)
+
+    @classmethod
+    def build(cls, path=DEFAULT_RELATIONS):
+        with open(path, "r", encoding="utf-8") as f:
+            relations = json.load(f)
+        return cls.from_relations(relations, _stamp(path))
+
+    @classmethod
+    def load(cls, path=DEFAULT_GRAPH_FILE):
+        with np.load(path) as data:
+            if int(data["version"]) != GRAPH_VERSION:
+                raise ValueError(f"{path}: 지원하지 않는 그래프 버전입니다")
+            return cls(data["characters"].tolist(), data["indptr"], data["indices"], data["kinds"],
+                       data["source"].tolist())
+
+    def save(self, path=DEFAULT_GRAPH_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_file = path + ".tmp.npz"
+        np.savez(tmp_file, version=GRAPH_VERSION, characters=np.array(self.characters),
+                 indptr=self.indptr, indices=self.indices, kinds=self.kinds,
+                 source=np.array(self.source or [0, 0], dtype=np.int64))
+        os.replace(tmp_file, path)
+
+    @classmethod
+    def open(cls, path=DEFAULT_GRAPH_FILE, relations_path=DEFAULT_RELATIONS, rebuild=False):
+        """저장된 그래프를 열고, 없거나 관계 파일이 바뀌었으면 다시 만들어 저장"""
+        if not rebuild and os.path.exists(path):
+            try:
+                graph = cls.load(path)
+            except (OSError, ValueError, KeyError):
+                graph = None
+            if graph is not None and graph.source == _stamp(relations_path):
+                return graph
+        graph = cls.build(relations_path)
+        graph.save(path)
+        return graph
+
+    def __len__(self):
+        return len(self.characters)
+
+    def __contains__(self, character):
+        return character in self._positions
+
+    @property
+    def edge_count(self):
+        return len(self.indices)
+
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.kinds.nbytes
+
+    def _node(self, character):
+        position = self._positions.get(character)
+        if position is None:
+            raise KeyError(f"관계 그래프에 없는 한자: {character}")
+        return position
+
+    def _edges(self, nodes):
+        """노드 번호 배열 → (간선 번호 배열, 각 간선의 출발 노드 배열)"""
+        starts = self.indptr[nodes]
+        lengths = self.indptr[nodes + 1] - starts
+        # 노드마다 [start, start + length) 범위의 간선 번호를 한 번에 펼친다
+        offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(starts, lengths) + offsets, np.repeat(nodes, lengths)
+
+    def _expand(self, frontier, mask):
+        """노드 번호 배열 → (출발 노드, 도착 노드) 간선 배열 (mask 에 맞는 종류만)"""
+        edges, sources = self._edges(frontier)
+        if mask != (1 << len(KINDS)) - 1:
+            keep = (mask >> self.kinds[edges].astype(np.int64)) & 1 == 1
+            edges, sources = edges[keep], sources[keep]
+        return sources, self.indices[edges].astype(np.int64)
+
+    # 질의
+
+    def neighbors(self, character, kinds=None):
+        """바로 이어진 한자 [(한자, 관계 종류), ...] (종류 순서, 같은 한자가 여러 종류로 나올 수 있음)"""
+        node = self._node(character)
+        mask = _kind_mask(kinds)
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return [(self.characters[other], KINDS[kind])
+                for other, kind in zip(self.indices[start:end].tolist(), self.kinds[start:end].tolist())
+                if mask >> kind & 1]
+
+    def _bfs(self, sources, hops, mask, target=-1):
+        """너비 우선 탐색 → (거리 배열 (못 가면 -1), 부모 배열)"""
+        distance = np.full(len(self.characters), -1, dtype=np.int32)
+        parent = np.full(len(self.characters), -1, dtype=np.int32)
+        frontier = np.unique(np.asarray(sources, dtype=np.int64))
+        distance[frontier] = 0
+        level = 0
+        while len(frontier) and (hops is None or level < hops):
+            level += 1
+            origins, reached = self._expand(frontier, mask)
+            new = distance[reached] < 0
+            origins, reached = origins[new], reached[new]
+            # 같은 노드에 여러 부모가 닿으면 처음 것만
+            reached, first = np.unique(reached, return_index=True)
+            distance[reached] = level
+            parent[reached] = origins[first]
+            frontier = reached
+            if target >= 0 and distance[target] >= 0:
+                break
+        return distance, parent
+
+    def k_hop(self, character, k=2, kinds=None):
+        """k 단계 안에 닿는 한자 {한자: 거리} (자기 자신 제외, 가까운 순)"""
+        distance, _ = self._bfs([self._node(character)], k, _kind_mask(kinds))
+        reached = np.flatnonzero(distance > 0)
+        reached = reached[np.argsort(distance[reached], kind="stable")]
+        return {self.characters[i]: int(distance[i]) for i in reached}
+
+    def shortest_path(self, start, goal, kinds=None, max_hops=None):
+        """start 에서 goal 까지 간선 수가 가장 적은 경로 [start, ..., goal] (없으면 None)"""
+        source, target = self._node(start), self._node(goal)
+        distance, parent = self._bfs([source], max_hops, _kind_mask(kinds), target)
+        if distance[target] < 0:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(int(parent[path[-1]]))
+        return [self.characters[i] for i in reversed(path)]
+
+    def recommend(self, known, limit=10, kinds=None, weights=None, available=None):
+        """이미 아는 한자들과 많이, 강하게 이어진 한자부터 "다음에 배울 한자" [(한자, 점수), ...]
+
+        점수는 아는 한자에서 들어오는 간선의 종류별 가중치 (RECOMMEND_WEIGHTS) 합이다.
+        available 을 주면 그 안의 한자만 추천한다 (예: 획순 데이터가 있는 한자).
+        """
+        weights = weights or RECOMMEND_WEIGHTS
+        nodes = np.array(sorted({self._positions[c] for c in known if c in self._positions}),
+                         dtype=np.int64)
+        if not len(nodes):
+            return []
+        mask = _kind_mask(kinds)
+        edges, _ = self._edges(nodes)
+        kind_codes = self.kinds[edges]
+        edge_weights = np.array([weights.get(name, 0.0) if mask >> code & 1 else 0.0
+                                 for code, name in enumerate(KINDS)])[kind_codes]
+        scores = np.bincount(self.indices[edges], weights=edge_weights, minlength=len(self.characters))
+        scores[nodes] = 0
+        if available is not None:
+            scores[[i for i, char in enumerate(self.characters) if char not in available]] = 0
+        candidates = np.flatnonzero(scores > 0)
+        # 점수 내림차순, 같으면 노드 번호 (관계 파일 순서) 순
+        order = np.lexsort((candidates, -scores[candidates]))[:limit]
+        return [(self.characters[i], float(scores[i])) for i in candidates[order]]
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한자 관계 그래프 (이웃, k-hop, 최단 경로, 학습 추천)")
+    parser.add_argument("character", nargs="?", help="기준 한자")
+    parser.add_argument("--hops", type=int, default=1, help="이 단계 안에 닿는 한자 출력")
+    parser.add_argument("--path", metavar="한자", help="기준 한자에서 이 한자까지의 최단 경로")
+    parser.add_argument("--recommend", metavar="아는한자들", help="다음에 배울 한자 추천")
+    parser.add_argument("--limit", "-n", type=int, default=10, help="추천 수")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, help="쓸 관계 종류 (기본: 모두)")
+    parser.add_argument("--relations", default=DEFAULT_RELATIONS, help="관계 파일")
+    parser.add_argument("--graph", default=DEFAULT_GRAPH_FILE, help="그래프 캐시 파일 (.npz)")
+    parser.add_argument("--rebuild", action="store_true", help="그래프를 다시 만들기")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = RelationGraph.open(args.graph, args.relations, rebuild=args.rebuild)
+    print(f"그래프: {len(graph)}자, 간선 {graph.edge_count}개, {graph.nbytes() / 1024:.1f} KiB "
+          f"({(time.perf_counter() - start) * 1000:.1f} ms)", file=sys.stderr)
+
+    if args.recommend:
+        for char, score in graph.recommend(args.recommend, args.limit, args.kinds):
+            print(f"{char}\t{score:.1f}")
+        return
+    if not args.character:
+        return
+    if args.character not in graph:
+        print(f"Error: '{args.character}' 한자가 관계 그래프에 없습니다.")
+        sys.exit(1)
+    if args.path:
+        if args.path not in graph:
+            print(f"Error: '{args.path}' 한자가 관계 그래프에 없습니다.")
+            sys.exit(1)
+        path = graph.shortest_path(args.character, args.path, args.kinds)
+        print(" → ".join(path) if path else "경로가 없습니다.")
+    elif args.hops > 1:
+        for char, distance in graph.k_hop(args.character, args.hops, args.kinds).items():
+            print(f"{char}\t{distance}")
+    else:
+        for char, kind in graph.neighbors(args.character, args.kinds):
+            print(f"{char}\t{kind}")
+
+
+if __name__ == "__main__":
+    main()
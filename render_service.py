@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""웹 앱용 로컬 획순 렌더링 서버
+
+Next.js 앱과 Python 드로어가 같은 획 데이터를 쓰므로, 획순 프레임을 HTTP 로
+내어 준다. 외부 네트워크 없이 저장소의 데이터 파일(character_store)만 읽는다.
+
+    GET /render/<한자>?stroke=N&size=S&format=png|svg
+        stroke 를 주면 N 번째 획까지 (N 번째 획은 강조색), 없으면 완성 모습
+    GET /stats
+        캐시 적중 수 등 (JSON)
+
+응답은 메모리 LRU → 디스크 캐시(.cache/render/) → 렌더링 순서로 찾는다.
+ETag 는 획 데이터와 요청 값으로 만든 해시라서, If-None-Match 가 맞으면
+캐시도 보지 않고 304 를 돌려준다. 같은 프레임을 동시에 요청하면 한 번만 그린다.
+
+사용 예:
+    python render_service.py --port 8765
+    curl -o 永.png "http://127.0.0.1:8765/render/%E6%B0%B8?stroke=3&size=256"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from character_store import open_hanja_data
+
+# 렌더링 결과가 바뀌면 올려서 기존 캐시와 ETag 를 모두 무효로 한다
+RENDER_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(".cache", "render")
+DEFAULT_MEMORY_ITEMS = 512
+DEFAULT_SIZE = 256
+MIN_SIZE, MAX_SIZE = 16, 1024
+
+CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+class RenderError(Exception):
+    """요청을 처리할 수 없음 (status 는 HTTP 상태 코드)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RenderService:
+    """(한자, 획 번호, 크기, 형식) → 이미지 바이트, 메모리 LRU 와 디스크 캐시를 거침
+
+    여러 스레드에서 동시에 불러도 된다. 렌더러와 경로 캐시는 스레드 안전하지
+    않으므로 실제 그리기는 한 번에 하나씩 한다.
+    """
+
+    def __init__(self, hanja_data, cache_dir=DEFAULT_CACHE_DIR, memory_items=DEFAULT_MEMORY_ITEMS,
+                 grid=True):
+        self.hanja_data = hanja_data
+        self.cache_dir = cache_dir
+        self.memory_items = memory_items
+        self.grid = grid
+        self._memory = OrderedDict()
+        self._data_hashes = {}
+        self._renderers = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self.stats = {"requests": 0, "not_modified": 0, "memory_hits": 0, "disk_hits": 0,
+                      "renders": 0}
+
+    # 요청 값
+
+    def strokes(self, character):
+        if character not in self.hanja_data:
+            raise RenderError(HTTPStatus.NOT_FOUND, f"'{character}' 한자의 데이터가 없습니다")
+        return self.hanja_data[character]["strokes"]
+
+    def _data_hash(self, character):
+        digest = self._data_hashes.get(character)
+        if digest is None:
+            payload = json.dumps(self.strokes(character), ensure_ascii=False, sort_keys=True,
+                                 separators=(",", ":"))
+            digest = self._data_hashes[character] = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return digest
+
+    def etag(self, character, stroke=None, size=DEFAULT_SIZE, fmt="png"):
+        """이미지를 그리지 않고 알 수 있는 ETag (획 데이터가 바뀌면 달라짐)"""
+        count = len(self.strokes(character))
+        if stroke is not None and not 1 <= stroke <= count:
+            raise RenderError(HTTPStatus.NOT_FOUND, f"'{character}' 는 1~{count}획입니다")
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            raise RenderError(HTTPStatus.BAD_REQUEST, f"size 는 {MIN_SIZE}~{MAX_SIZE} 입니다")
+        if fmt not in CONTENT_TYPES:
+            raise RenderError(HTTPStatus.BAD_REQUEST, f"format 은 {', '.join(CONTENT_TYPES)} 중 하나입니다")
+        key = f"{RENDER_VERSION}:{self._data_hash(character)}:{stroke}:{size}:{fmt}:{self.grid}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+
+    # 캐시
+
+    def _remember(self, etag, data):
+        with self._lock:
+            self._memory[etag] = data
+            self._memory.move_to_end(etag)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _from_memory(self, etag):
+        with self._lock:
+            data = self._memory.get(etag)
+            if data is not None:
+                self._memory.move_to_end(etag)
+                self.stats["memory_hits"] += 1
+            return data
+
+    def _disk_path(self, etag, fmt):
+        return os.path.join(self.cache_dir, etag[:2], f"{etag}.{fmt}")
+
+    def _from_disk(self, etag, fmt):
+        try:
+            with open(self._disk_path(etag, fmt), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.stats["disk_hits"] += 1
+        return data
+
+    def _save_disk(self, etag, fmt, data):
+        path = self._disk_path(etag, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_file = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+
+    # 렌더링
+
+    def _renderer(self, size):
+        renderer = self._renderers.get(size)
+        if renderer is None:
+            from headless_renderer import HeadlessRenderer
+            renderer = self._renderers[size] = HeadlessRenderer(size=size, grid=self.grid)
+        return renderer
+
+    def _draw(self, character, stroke, size, fmt):
+        strokes = self.strokes(character)
+        if fmt == "svg":
+            from animation_export import frame_svg
+            return frame_svg(strokes, stroke, size, grid=self.grid, title=character).encode("utf-8")
+
+        import io
+        with self._render_lock:
+            renderer = self._renderer(size)
+            if stroke is None:
+                image = renderer.render_character(strokes)
+            else:
+                image = renderer.render_frame(strokes, stroke)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
+    def render(self, character, stroke=None, size=DEFAULT_SIZE, fmt="png"):
+        """(이미지 바이트, ETag). 메모리 → 디스크 → 렌더링 순서로 찾음"""
+        etag = self.etag(character, stroke, size, fmt)
+        data = self._from_memory(etag)
+        if data is not None:
+            return data, etag
+
+        # 같은 프레임을 동시에 요청하면 먼저 온 요청만 그리고 나머지는 기다린다
+        with self._lock:
+            flight = self._inflight.setdefault(etag, threading.Lock())
+        with flight:
+            data = self._from_memory(etag)
+            if data is None:
+                data = self._from_disk(etag, fmt)
+                if data is None:
+                    data = self._draw(character, stroke, size, fmt)
+                    self._save_disk(etag, fmt, data)
+                    with self._lock:
+                        self.stats["renders"] += 1
+                self._remember(etag, data)
+            with self._lock:
+                self._inflight.pop(etag, None)
+        return data, etag
+
+
+def parse_render_request(path):
+    """"/render/永?stroke=3&size=128" → (한자, 획 번호 또는 None, 크기, 형식)"""
+    url = urlsplit(path)
+    if not url.path.startswith("/render/"):
+        raise RenderError(HTTPStatus.NOT_FOUND, "경로는 /render/<한자> 입니다")
+    character = unquote(url.path[len("/render/"):])
+    if len(character) != 1:
+        raise RenderError(HTTPStatus.BAD_REQUEST, "한자 한 글자를 지정하세요")
+    query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    try:
+        stroke = int(query["stroke"]) if query.get("stroke") else None
+        size = int(query.get("size", DEFAULT_SIZE))
+    except ValueError:
+        raise RenderError(HTTPStatus.BAD_REQUEST, "stroke 와 size 는 정수입니다")
+    return character, stroke, size, query.get("format", "png")
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server_version = "HanjaroRender/1"
+    # 이미지는 브라우저가 한 시간 동안 쓰고, 그 뒤에는 ETag 로 다시 확인한다
+    cache_control = "public, max-age=3600"
+
+    def do_GET(self):
+        self.handle_request(send_body=True)
+
+    def do_HEAD(self):
+        self.handle_request(send_body=False)
+
+    def handle_request(self, send_body):
+        service = self.server.service
+        try:
+            if urlsplit(self.path).path == "/stats":
+                with service._lock:
+                    body = json.dumps(dict(service.stats, memory_items=len(service._memory)))
+                self.send_body(HTTPStatus.OK, "application/json", body.encode("utf-8"), send_body)
+                return
+
+            character, stroke, size, fmt = parse_render_request(self.path)
+            with service._lock:
+                service.stats["requests"] += 1
+            etag = service.etag(character, stroke, size, fmt)
+            if etag in self.requested_etags():
+                with service._lock:
+                    service.stats["not_modified"] += 1
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", f'"{etag}"')
+                self.send_header("Cache-Control", self.cache_control)
+                self.end_headers()
+                return
+            data, etag = service.render(character, stroke, size, fmt)
+            self.send_body(HTTPStatus.OK, CONTENT_TYPES[fmt], data, send_body, etag)
+        except RenderError as e:
+            self.send_body(e.status, "text/plain; charset=utf-8", str(e).encode("utf-8"), send_body)
+
+    def requested_etags(self):
+        header = self.headers.get("If-None-Match", "")
+        return {tag.strip().removeprefix("W/").strip('"') for tag in header.split(",") if tag.strip()}
+
+    def send_body(self, status, content_type, data, send_body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        # 다른 포트에서 도는 Next.js 개발 서버에서도 불러 쓸 수 있게
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if etag:
+            self.send_header("ETag", f'"{etag}"')
+            self.send_header("Cache-Control", self.cache_control)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(service, host="127.0.0.1", port=8765, verbose=False):
+    """요청마다 스레드 하나로 처리하는 서버 (serve_forever() 로 시작)"""
+    server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def serve(data_path=".", host="127.0.0.1", port=8765, cache_dir=DEFAULT_CACHE_DIR,
+          memory_items=DEFAULT_MEMORY_ITEMS, grid=True, verbose=False):
+    hanja_data = open_hanja_data(data_path)
+    # 색인은 첫 요청 전에 만들어 둔다
+    print(f"{len(hanja_data)}자 데이터 로드 ({data_path})", file=sys.stderr)
+    service = RenderService(hanja_data, cache_dir, memory_items, grid)
+    server = make_server(service, host, port, verbose)
+    print(f"http://{host}:{server.server_address[1]}/render/<한자>?stroke=N&size=S", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="획순 프레임 PNG/SVG 를 내어 주는 로컬 HTTP 서버")
+    parser.add_argument("--data", "-d", default=".",
+                        help="한자 데이터 (데이터 디렉터리, .json 또는 .hjsp 팩)")
+    parser.add_argument("--host", default="127.0.0.1", help="받을 주소")
+    parser.add_argument("--port", "-p", type=int, default=8765, help="포트")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="디스크 캐시 디렉터리")
+    parser.add_argument("--memory", type=int, default=DEFAULT_MEMORY_ITEMS,
+                        help="메모리에 둘 이미지 수")
+    parser.add_argument("--no-grid", action="store_true", help="그리드 없이 그리기")
+    parser.add_argument("--verbose", "-v", action="store_true", help="요청마다 로그 출력")
+    args = parser.parse_args()
+
+    try:
+        serve(args.data, args.host, args.port, args.cache_dir, args.memory, not args.no_grid,
+              args.verbose)
+    except FileNotFoundError:
+        print(f"Error: '{args.data}' 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""학습자 복습 일정 관리 (간격 반복)
+
+data/learning/default_user.json 의 한자별 상태(masteryLevel, correctCount,
+nextReviewDue, studyHistory ...)를 읽고 nextReviewDue 를 키로 하는 힙을 만든다.
+복습할 한자를 꺼내는 데 O(log n) 이 든다.
+
+퀴즈/연습 결과는 JSON 을 다시 쓰지 않고 이벤트 로그(learning_log.py,
+default_user.events.jsonl) 에 한 줄씩 덧붙인다. 다음에 열 때는 마지막 압축
+이후의 로그만 재생하며, compact() 나 close() 때 요약을 JSON 에 쓴다.
+
+    scheduler = ReviewScheduler()
+    for char in scheduler.peek_due(limit=10):
+        scheduler.record(char, correct=True, kind="quiz")
+
+사용 예:
+    python review_scheduler.py                 # 지금 복습할 한자
+    python review_scheduler.py --compact       # 로그를 JSON 에 합치기
+"""
+
+import argparse
+import heapq
+import os
+from datetime import datetime, timedelta, timezone
+
+from learning_log import LearningLog
+
+DEFAULT_LEARNER_FILE = os.path.join("data", "learning", "default_user.json")
+# settings.reviewInterval 이 없을 때 쓰는 복습 간격 (일)
+DEFAULT_INTERVALS = [1, 3, 7, 14, 30, 90]
+
+# 정답/오답일 때 숙련도 변화 (0~100)
+MASTERY_STEP_CORRECT = 10
+MASTERY_STEP_INCORRECT = 15
+# 이 숙련도 이상이면 completed
+MASTERY_COMPLETED = 90
+
+
+def parse_time(value):
+    """"2025-04-01T12:00:00.000Z" → UTC datetime"""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def format_time(moment):
+    """UTC datetime → 학습 데이터와 같은 "....T..:..:...000Z" 형식"""
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + \
+        f"{moment.microsecond // 1000:03d}Z"
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class ReviewScheduler:
+    """학습자 한 명의 복습 일정 (한자별 상태 + nextReviewDue 힙 + 이벤트 로그)
+
+    compact_interval(초)을 주면 이벤트 로그가 백그라운드에서 주기적으로 압축된다.
+    """
+
+    def __init__(self, path=DEFAULT_LEARNER_FILE, log_path=None, compact_interval=None):
+        self.path = path
+        self.log = LearningLog(path, log_path, compact_interval=compact_interval)
+        self.data = self.log.data
+        self.characters = self.log.characters
+        self.intervals = self.data.get("settings", {}).get("reviewInterval") or DEFAULT_INTERVALS
+
+        # (복습 시각, 순번, 한자). 일정이 바뀌면 새 항목을 넣고 옛 항목은 꺼낼 때 버린다
+        self._heap = []
+        self._due_at = {}
+        self._counter = 0
+        for char, state in self.characters.items():
+            if state.get("nextReviewDue"):
+                self._schedule(char, parse_time(state["nextReviewDue"]))
+
+    @property
+    def replayed(self):
+        """열 때 재생한 (아직 스냅숏에 없던) 이벤트 수"""
+        return self.log.replayed
+
+    def compact(self):
+        """이벤트 로그를 반영한 요약을 JSON 에 쓰기"""
+        return self.log.compact()
+
+    def close(self):
+        self.log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # 힙
+
+    def _schedule(self, char, due):
+        timestamp = due.timestamp()
+        self._due_at[char] = timestamp
+        self._counter += 1
+        heapq.heappush(self._heap, (timestamp, self._counter, char))
+
+    def _discard_stale(self):
+        heap = self._heap
+        while heap and self._due_at.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def peek(self):
+        """가장 먼저 복습할 (한자, 복습 시각), 없으면 None"""
+        self._discard_stale()
+        if not self._heap:
+            return None
+        timestamp, _, char = self._heap[0]
+        return char, datetime.fromtimestamp(timestamp, timezone.utc)
+
+    def pop_due(self, now=None):
+        """now 까지 복습할 때가 된 한자 하나를 꺼냄 (없으면 None)
+
+        꺼낸 한자는 record() 로 결과를 남길 때 다시 일정에 들어간다.
+        """
+        now = (now or _now()).timestamp()
+        self._discard_stale()
+        if not self._heap or self._heap[0][0] > now:
+            return None
+        _, _, char = heapq.heappop(self._heap)
+        del self._due_at[char]
+        return char
+
+    def due(self, now=None, limit=None):
+        """now 까지 복습할 때가 된 한자를 이른 순서로 생성 (힙에서 꺼냄)"""
+        count = 0
+        while limit is None or count < limit:
+            char = self.pop_due(now)
+            if char is None:
+                return
+            count += 1
+            yield char
+
+    def peek_due(self, now=None, limit=None):
+        """now 까지 복습할 때가 된 한자를 이른 순서로 나열 (힙에서 꺼내지 않음)
+
+        힙 배열을 작은 것부터 따라가는 보조 힙으로 훑으므로, limit 개를 보는 데
+        O(limit log limit) 가 들고 now 보다 늦은 항목을 만나면 멈춘다.
+        """
+        now = (now or _now()).timestamp()
+        heap = self._heap
+        chars, seen = [], set()
+        # (힙 항목, 힙 배열 번호). 꺼낸 항목의 자식만 후보에 넣는다
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and (limit is None or len(chars) < limit):
+            entry, i = heapq.heappop(frontier)
+            if entry[0] > now:
+                break
+            char = entry[2]
+            if self._due_at.get(char) == entry[0] and char not in seen:
+                seen.add(char)
+                chars.append(char)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return chars
+
+    def __len__(self):
+        return len(self._due_at)
+
+    # 결과 반영
+
+    def _stage(self, state):
+        """현재 복습 간격 단계 (없으면 lastStudied ~ nextReviewDue 간격에서 추정)"""
+        if "reviewStage" in state:
+            return state["reviewStage"]
+        if state.get("lastStudied") and state.get("nextReviewDue"):
+            days = (parse_time(state["nextReviewDue"]) - parse_time(state["lastStudied"])).days
+            return min(range(len(self.intervals)), key=lambda i: abs(self.intervals[i] - days))
+        return -1
+
+    def record(self, character, correct, kind="quiz", score=None, now=None):
+        """퀴즈/연습 결과를 반영하고 이벤트 로그에 한 줄 추가, 다음 복습 시각을 반환
+
+        정답이면 다음 간격 단계로, 오답이면 첫 단계로 돌아간다.
+        """
+        now = now or _now()
+        state = self.characters.get(character) or {"character": character, "masteryLevel": 0,
+                                                   "correctCount": 0, "incorrectCount": 0}
+        stage = self._stage(state)
+        mastery = state.get("masteryLevel", 0)
+        if correct:
+            stage = min(stage + 1, len(self.intervals) - 1)
+            mastery = min(100, mastery + MASTERY_STEP_CORRECT)
+            status = "completed" if mastery >= MASTERY_COMPLETED else "reviewing"
+        else:
+            stage = 0
+            mastery = max(0, mastery - MASTERY_STEP_INCORRECT)
+            status = "needs_review"
+        due = now + timedelta(days=self.intervals[stage])
+
+        counter = "correctCount" if correct else "incorrectCount"
+        event_type = f"{kind}_correct" if correct else f"{kind}_incorrect"
+        if kind == "practice":
+            event_type = "practice"
+        event = {"timestamp": format_time(now), "type": event_type}
+        if score is not None:
+            event["score"] = score
+        entry = {
+            "character": character,
+            "state": {
+                "status": status,
+                "masteryLevel": mastery,
+                counter: state.get(counter, 0) + 1,
+                "lastStudied": format_time(now),
+                "nextReviewDue": format_time(due),
+                "reviewStage": stage,
+            },
+            "event": event,
+        }
+        self.log.append(entry)
+        self._schedule(character, due)
+        return due
+
+    def record_seen(self, character, kind="practice", now=None):
+        """채점하지 않은 학습(획순 보기 등)을 studyHistory 에만 기록
+
+        숙련도, 복습 단계, lastStudied/nextReviewDue 는 그대로 둔다 (lastStudied 는
+        reviewStage 가 없는 상태에서 복습 단계를 추정하는 데 쓰인다).
+        """
+        now = now or _now()
+        self.log.append({
+            "character": character,
+            "state": {},
+            "event": {"timestamp": format_time(now), "type": f"{kind}_seen"},
+        })
+
+
+def show_due(scheduler, now=None, limit=None):
+    """복습할 한자를 이른 순서로, 없으면 다음 복습 예정을 출력"""
+    due = scheduler.peek_due(now, limit)
+    for char in due:
+        state = scheduler.characters[char]
+        print(f"{char}\t숙련도 {state.get('masteryLevel', 0)}\t{state.get('nextReviewDue')}")
+    if not due:
+        upcoming = scheduler.peek()
+        print("지금 복습할 한자가 없습니다." +
+              (f" 다음 복습: {upcoming[0]} ({format_time(upcoming[1])})" if upcoming else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="복습할 한자 확인 / 이벤트 로그 압축")
+    parser.add_argument("--learner", "-l", default=DEFAULT_LEARNER_FILE, help="학습자 상태 파일")
+    parser.add_argument("--at", help="이 시각 기준으로 확인 (예: 2025-04-03T00:00:00Z)")
+    parser.add_argument("--compact", action="store_true", help="이벤트 로그를 상태 파일에 합치기")
+    args = parser.parse_args()
+
+    with ReviewScheduler(args.learner) as scheduler:
+        if args.compact:
+            print(f"이벤트 {scheduler.replayed}개를 {args.learner} 에 합쳤습니다.")
+            return
+        show_due(scheduler, parse_time(args.at) if args.at else None)
+
+
+if __name__ == "__main__":
+    main()
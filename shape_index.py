@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""획 모양으로 "비슷하게 생긴 한자" 를 찾는 색인
+
+한자마다 획 중심선으로 특징 벡터 하나를 만든다.
+- 저해상도 비트맵 (GRID × GRID, 중심선 점을 찍고 흐리게 한 것)
+- 획 방향 히스토그램 (길이로 가중, 방향 구분 없이 DIRECTION_BINS 개)
+벡터는 L2 정규화해 (N, D) 행렬 하나에 쌓고, 질의는 행렬 곱 한 번으로 모든
+한자와의 코사인 유사도를 구한다. 여러 질의를 한 번에 보낼 수도 있다.
+
+    index = ShapeIndex.build(CharacterStore(require_strokes=True))
+    index.neighbors("大", k=5)      # [("太", 0.93), ("犬", 0.91), ...]
+
+사용 예:
+    python shape_index.py 大 木 -k 5
+    python shape_index.py --write-relations build/hanja_relations.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from character_store import STROKE_SOURCES
+from stroke_matcher import centerlines
+
+GRID = 16
+DIRECTION_BINS = 8
+# 방향 히스토그램의 비중 (비트맵 부분의 노름을 1 로 볼 때)
+DIRECTION_WEIGHT = 0.5
+# 중심선 위에 찍는 점 간격 (데이터 좌표)
+SAMPLE_SPACING = 1.0
+DEFAULT_INDEX_FILE = os.path.join(".cache", "shape_index.npz")
+DEFAULT_RELATIONS = "data/new-structure/relations/hanja_relations.json"
+
+
+def _blur_kernel():
+    kernel = np.array([1.0, 4.0, 6.0, 4.0, 1.0])
+    return kernel / kernel.sum()
+
+
+def shape_features(lines, grid=GRID, bins=DIRECTION_BINS):
+    """중심선 목록 ([[x, y], ...] 들, 0~100 좌표) → 정규화된 특징 벡터 (grid*grid + bins,)"""
+    bitmap = np.zeros((grid, grid))
+    directions = np.zeros(bins)
+    for line in lines:
+        points = np.asarray(line, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 2:
+            continue
+        deltas = np.diff(points, axis=0)
+        lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+        # 획 방향 (0~π, 시작/끝 방향은 구분하지 않음)
+        angles = np.mod(np.arctan2(deltas[:, 1], deltas[:, 0]), np.pi)
+        np.add.at(directions, np.minimum((angles / np.pi * bins).astype(int), bins - 1), lengths)
+
+        # 선분마다 일정 간격으로 점을 찍어 비트맵에 더한다
+        counts = np.maximum(np.ceil(lengths / SAMPLE_SPACING).astype(int), 1)
+        starts = np.repeat(points[:-1], counts, axis=0)
+        steps = np.repeat(deltas / counts[:, None], counts, axis=0)
+        offsets = np.concatenate([np.arange(c) for c in counts])[:, None]
+        samples = starts + steps * offsets
+        cells = np.clip((samples / 100.0 * grid).astype(int), 0, grid - 1)
+        np.add.at(bitmap, (cells[:, 1], cells[:, 0]), 1.0)
+
+    kernel = _blur_kernel()
+    bitmap = np.apply_along_axis(np.convolve, 0, bitmap, kernel, "same")
+    bitmap = np.apply_along_axis(np.convolve, 1, bitmap, kernel, "same")
+    bitmap = bitmap.ravel()
+    norm = np.linalg.norm(bitmap)
+    if norm:
+        bitmap /= norm
+    norm = np.linalg.norm(directions)
+    if norm:
+        directions *= DIRECTION_WEIGHT / norm
+    vector = np.concatenate((bitmap, directions))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def source_stamps(root=".", sources=STROKE_SOURCES):
+    """획 데이터 소스 → [mtime_ns, 크기]
+
+    디렉터리는 안의 파일 가운데 가장 늦은 mtime, 크기 합, 파일 수로 잰다
+    (파일 내용만 고쳐서는 디렉터리 mtime 이 바뀌지 않으므로).
+    """
+    stamps = {}
+    for path in sorted(sources):
+        full = os.path.join(root, path)
+        if os.path.isdir(full):
+            files = [entry.stat() for entry in os.scandir(full) if entry.is_file()]
+            stamps[path] = [max((st.st_mtime_ns for st in files), default=0),
+                            sum(st.st_size for st in files), len(files)]
+        elif os.path.exists(full):
+            st = os.stat(full)
+            stamps[path] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+class ShapeIndex:
+    """한자 → 특징 벡터 행렬과 k-최근접 질의"""
+
+    def __init__(self, characters, vectors, sources=None):
+        self.characters = list(characters)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._positions = {char: i for i, char in enumerate(self.characters)}
+        # 색인을 만들 때의 획 데이터 stamp (source_stamps). 저장된 색인이 최신인지 확인용
+        self.sources = sources
+
+    @classmethod
+    def build(cls, hanja_data, path_cache=None):
+        """{한자: 레코드} 매핑의 획이 있는 모든 한자로 색인 만들기"""
+        characters, vectors = [], []
+        for char in hanja_data:
+            lines = centerlines(hanja_data[char], path_cache)
+            if lines:
+                characters.append(char)
+                vectors.append(shape_features(lines))
+        dim = GRID * GRID + DIRECTION_BINS
+        return cls(characters, np.array(vectors) if vectors else np.empty((0, dim)))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            sources = json.loads(str(data["sources"])) if "sources" in data else None
+            return cls(data["characters"].tolist(), data["vectors"], sources)
+
+    @classmethod
+    def load_fresh(cls, path=DEFAULT_INDEX_FILE, root="."):
+        """저장된 색인이 있고 root 의 획 데이터가 그 뒤로 바뀌지 않았으면 읽기 (아니면 None)"""
+        if not os.path.exists(path):
+            return None
+        try:
+            index = cls.load(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return index if index.sources == source_stamps(root) else None
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        extra = {"sources": np.array(json.dumps(self.sources))} if self.sources is not None else {}
+        np.savez(path, characters=np.array(self.characters), vectors=self.vectors, **extra)
+
+    def __len__(self):
+        return len(self.characters)
+
+    def __contains__(self, character):
+        return character in self._positions
+
+    def query(self, vectors, k=10, exclude=None):
+        """특징 벡터 (Q, D) 들의 최근접 (Q, k) 번호와 유사도
+
+        exclude 는 질의마다 결과에서 뺄 행 번호 (자기 자신, 없으면 -1) 이다.
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        similarity = vectors @ self.vectors.T
+        if exclude is not None:
+            rows = np.flatnonzero(np.asarray(exclude) >= 0)
+            similarity[rows, np.asarray(exclude)[rows]] = -np.inf
+        k = min(k, len(self.characters) - (0 if exclude is None else 1))
+        if k <= 0:
+            return np.empty((len(vectors), 0), dtype=int), np.empty((len(vectors), 0))
+        # 상위 k 개만 골라 그 안에서 정렬
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def neighbors_batch(self, characters, k=10):
+        """여러 한자의 비슷한 한자를 한 번에: [[(한자, 유사도), ...], ...]"""
+        rows = np.array([self._positions[char] for char in characters], dtype=int)
+        indices, scores = self.query(self.vectors[rows], k, exclude=rows)
+        return [[(self.characters[i], float(s)) for i, s in zip(row_i, row_s)]
+                for row_i, row_s in zip(indices, scores)]
+
+    def neighbors(self, character, k=10):
+        """비슷하게 생긴 한자 k 개 [(한자, 유사도), ...] (유사도 내림차순)"""
+        return self.neighbors_batch([character], k)[0]
+
+
+def _id_character(hanja_id):
+    """"HJ-15-0001-4E00" → "一" """
+    return chr(int(hanja_id.rsplit("-", 1)[1], 16))
+
+
+def _relation_ids(relations):
+    """relations 에 나오는 모든 한자 ID 를 한자별로 (관계 항목의 키와 ID 목록 값 모두)"""
+    ids_by_char = {}
+    for section in relations.values():
+        if not isinstance(section, dict):
+            continue
+        for hanja_id, value in section.items():
+            ids = [hanja_id] + [v for v in value if isinstance(v, str)] if isinstance(value, list) else [hanja_id]
+            for item in ids:
+                if item.startswith("HJ-"):
+                    known = ids_by_char.setdefault(_id_character(item), [])
+                    if item not in known:
+                        known.append(item)
+    return ids_by_char
+
+
+def regenerate_similar_shape(index, relations, k=8, min_similarity=0.6):
+    """relations 의 similar_shape 를 색인으로 다시 만든 사본 반환
+
+    색인에 있고 relations 어디에든 ID 가 있는 모든 한자를 다시 계산한다 (similar_shape
+    에 없던 한자도 항목이 새로 생긴다). 나머지 항목은 그대로 둔다.
+    이웃 한자의 ID 는 relations 에 있는 그 한자의 모든 ID 이다.
+    """
+    ids_by_char = _relation_ids(relations)
+    targets = [char for char in ids_by_char if char in index]
+    similar = dict(relations.get("similar_shape", {}))
+    for char, neighbors in zip(targets, index.neighbors_batch(targets, k)):
+        ids = [hanja_id for other, score in neighbors if score >= min_similarity
+               for hanja_id in ids_by_char.get(other, ())]
+        for hanja_id in ids_by_char[char]:
+            similar[hanja_id] = ids
+    return dict(relations, similar_shape=similar)
+
+
+def main():
+    from character_store import CharacterStore
+
+    parser = argparse.ArgumentParser(description="획 모양이 비슷한 한자 찾기")
+    parser.add_argument("characters", nargs="*", help="찾을 한자들")
+    parser.add_argument("-k", type=int, default=5, help="한자마다 찾을 개수")
+    parser.add_argument("--data-root", default=".", help="CharacterStore 로 읽을 데이터 위치")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE, help="색인 파일 (.npz)")
+    parser.add_argument("--rebuild", action="store_true", help="색인을 다시 만들기")
+    parser.add_argument("--write-relations", metavar="OUTPUT",
+                        help="similar_shape 를 다시 만든 hanja_relations.json 사본 저장")
+    parser.add_argument("--relations", default=DEFAULT_RELATIONS, help="원본 관계 파일")
+    parser.add_argument("--min-similarity", type=float, default=0.6, help="관계에 넣을 최소 유사도")
+    args = parser.parse_args()
+
+    # 색인이 없거나 그 뒤로 획 데이터가 바뀌었으면 다시 만든다
+    index = None if args.rebuild else ShapeIndex.load_fresh(args.index, args.data_root)
+    if index is None:
+        start = time.perf_counter()
+        stamps = source_stamps(args.data_root)
+        index = ShapeIndex.build(CharacterStore(args.data_root, require_strokes=True))
+        index.sources = stamps
+        index.save(args.index)
+        print(f"색인 생성: {len(index)}자 ({time.perf_counter() - start:.2f}초)", file=sys.stderr)
+
+    characters = [char for char in "".join(args.characters)]
+    missing = [char for char in characters if char not in index]
+    if missing:
+        print(f"Error: '{''.join(missing)}' 한자의 획 데이터가 없습니다.")
+        sys.exit(1)
+    if characters:
+        start = time.perf_counter()
+        results = index.neighbors_batch(characters, args.k)
+        elapsed = time.perf_counter() - start
+        for char, neighbors in zip(characters, results):
+            print(f"{char}\t" + " ".join(f"{other}({score:.2f})" for other, score in neighbors))
+        print(f"질의 {len(characters)}개: {elapsed * 1000:.2f} ms", file=sys.stderr)
+
+    if args.write_relations:
+        with open(args.relations, "r", encoding="utf-8") as f:
+            relations = json.load(f)
+        relations = regenerate_similar_shape(index, relations, args.k, args.min_similarity)
+        os.makedirs(os.path.dirname(os.path.abspath(args.write_relations)), exist_ok=True)
+        with open(args.write_relations, "w", encoding="utf-8") as f:
+            json.dump(relations, f, ensure_ascii=False, indent=2)
+        print(f"저장: {args.write_relations}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""사용자가 그린 획을 기준 중심선(medians)과 비교해 채점
+
+그린 획과 기준 획을 모두 호 길이 기준으로 같은 개수의 점으로 다시 나누고,
+데이터 좌표계(0~100)에서 폭을 제한한 DTW(Sakoe-Chiba) 거리를 구한다.
+기준 획은 한자마다 한 번만 계산해 LRU 로 보관한다. medians 가 없으면
+획 경로를 평탄화한 중심선을 쓴다 (hanja_strokes.json 의 경로는 중심선이다).
+
+    matcher = StrokeMatcher(hanja_data)
+    match = matcher.score_stroke("永", 0, canvas_points, scale=3.0)
+    match.passed, match.score
+
+사용 예 (기준 획끼리 채점해 속도 확인):
+    python stroke_matcher.py --data data/all_strokes.json
+"""
+
+import argparse
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from path_cache import get_default_cache
+
+# 획 하나를 나누는 점 개수
+DEFAULT_SAMPLES = 32
+# DTW 에서 대응시킬 수 있는 점 번호 차이 (Sakoe-Chiba 폭)
+DEFAULT_BAND = 4
+# 점 하나당 평균 거리가 이 값(데이터 좌표) 이하면 통과
+DEFAULT_THRESHOLD = 10.0
+
+# index: 비교한 기준 획 번호, distance: 점 하나당 평균 DTW 거리,
+# score: 0~1 점수, passed: 통과 여부, reversed: 획을 반대 방향으로 그렸는지
+StrokeMatch = namedtuple("StrokeMatch", ["index", "distance", "score", "passed", "reversed"])
+
+
+def resample(points, samples=DEFAULT_SAMPLES):
+    """점 목록을 호 길이가 같은 간격인 samples 개의 점 (samples, 2) 으로 변환"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) == 0:
+        raise ValueError("빈 획입니다")
+    lengths = np.hypot(*np.diff(points, axis=0).T)
+    distance = np.concatenate(([0.0], np.cumsum(lengths)))
+    if distance[-1] == 0:
+        return np.repeat(points[:1], samples, axis=0)
+    targets = np.linspace(0.0, distance[-1], samples)
+    return np.column_stack((np.interp(targets, distance, points[:, 0]),
+                            np.interp(targets, distance, points[:, 1])))
+
+
+def dtw_distance(a, b, band=DEFAULT_BAND):
+    """같은 길이의 두 점 배열 사이의 점 하나당 평균 DTW 거리 (|i - j| <= band)"""
+    n = len(a)
+    cost = np.hypot(*(a[:, None, :] - b[None, :, :]).transpose(2, 0, 1)).tolist()
+    inf = float("inf")
+    previous = [inf] * n
+    for i in range(n):
+        row = cost[i]
+        current = [inf] * n
+        lo, hi = max(0, i - band), min(n, i + band + 1)
+        for j in range(lo, hi):
+            if i == 0 and j == 0:
+                best = 0.0
+            else:
+                best = previous[j]
+                if j > 0:
+                    best = min(best, previous[j - 1], current[j - 1])
+            current[j] = row[j] + best
+        previous = current
+    return previous[n - 1] / n
+
+
+def centerlines(record, path_cache=None):
+    """레코드의 획별 중심선 목록 (medians 가 획마다 있으면 그것, 없으면 평탄화한 경로)"""
+    medians = record.get("medians") or []
+    strokes = record.get("strokes", [])
+    if len(medians) == len(strokes) and all(len(m) for m in medians):
+        return medians
+    cache = path_cache or get_default_cache()
+    return [cache.get_points(stroke["path"] if isinstance(stroke, dict) else stroke,
+                             tolerance=0.25) for stroke in strokes]
+
+
+class StrokeMatcher:
+    """한자 데이터의 기준 획으로 그린 획을 채점 (기준 획은 한자마다 캐시)"""
+
+    def __init__(self, hanja_data, samples=DEFAULT_SAMPLES, band=DEFAULT_BAND,
+                 threshold=DEFAULT_THRESHOLD, max_characters=256, path_cache=None):
+        self.hanja_data = hanja_data
+        self.samples = samples
+        self.band = band
+        self.threshold = threshold
+        self.max_characters = max_characters
+        self.path_cache = path_cache
+        self._references = OrderedDict()
+
+    def references(self, character):
+        """한자의 기준 획 (획 수, samples, 2) 배열"""
+        refs = self._references.get(character)
+        if refs is not None:
+            self._references.move_to_end(character)
+            return refs
+        lines = centerlines(self.hanja_data[character], self.path_cache)
+        refs = np.stack([resample(line, self.samples) for line in lines]) if lines else \
+            np.empty((0, self.samples, 2))
+        refs.flags.writeable = False
+        self._references[character] = refs
+        while len(self._references) > self.max_characters:
+            self._references.popitem(last=False)
+        return refs
+
+    def _prepare(self, points, scale):
+        # 캔버스 좌표 → 데이터 좌표 (HanjaDrawer 는 데이터 좌표에 scale 을 곱해 그린다)
+        return resample(np.asarray(points, dtype=np.float64) / scale, self.samples)
+
+    def _match(self, index, drawn, ref):
+        distance = dtw_distance(drawn, ref, self.band)
+        # 시작점과 끝점이 기준 획의 반대쪽에 더 가까우면 거꾸로 그린 것
+        forward = np.hypot(*(drawn[0] - ref[0])) + np.hypot(*(drawn[-1] - ref[-1]))
+        backward = np.hypot(*(drawn[0] - ref[-1])) + np.hypot(*(drawn[-1] - ref[0]))
+        is_reversed = bool(backward < forward)
+        score = max(0.0, 1.0 - distance / (2 * self.threshold))
+        return StrokeMatch(index, distance, score, distance <= self.threshold and not is_reversed,
+                           is_reversed)
+
+    def score_stroke(self, character, index, points, scale=1.0):
+        """그린 점 목록(캔버스 좌표)을 index 번째 기준 획과 비교"""
+        refs = self.references(character)
+        return self._match(index, self._prepare(points, scale), refs[index])
+
+    def best_match(self, character, points, scale=1.0):
+        """그린 획과 가장 가까운 기준 획 (획순이 틀렸는지 확인할 때 사용)"""
+        refs = self.references(character)
+        drawn = self._prepare(points, scale)
+        # 평균 점 거리로 후보를 추린 뒤 가까운 몇 개만 DTW 로 비교
+        rough = np.hypot(*(refs - drawn).transpose(2, 0, 1)).mean(axis=1)
+        candidates = np.argsort(rough)[:3]
+        return min((self._match(int(i), drawn, refs[i]) for i in candidates),
+                   key=lambda match: match.distance)
+
+
+def main():
+    from character_store import open_hanja_data
+
+    parser = argparse.ArgumentParser(description="기준 획끼리 채점해 채점 속도 측정")
+    parser.add_argument("--data", "-d", default="data/all_strokes.json", help="한자 데이터")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="획 하나의 점 개수")
+    parser.add_argument("--band", type=int, default=DEFAULT_BAND, help="DTW 폭")
+    args = parser.parse_args()
+
+    hanja_data = open_hanja_data(args.data)
+    matcher = StrokeMatcher(hanja_data, args.samples, args.band)
+    characters = list(hanja_data)
+
+    start = time.perf_counter()
+    for char in characters:
+        matcher.references(char)
+    prepared = time.perf_counter() - start
+
+    graded = passed = 0
+    start = time.perf_counter()
+    for char in characters:
+        for i, line in enumerate(centerlines(hanja_data[char])):
+            # 중심선을 약간 흔들어 손으로 그린 획처럼 만든다
+            line = np.asarray(line, dtype=np.float64)
+            wobble = np.sin(np.linspace(0, np.pi, len(line)))[:, None] * 1.5
+            passed += matcher.score_stroke(char, i, line + wobble).passed
+            graded += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"기준 획 준비: {len(characters)}자 {prepared * 1000:.1f} ms")
+    print(f"채점: {graded}획, 획당 {elapsed / max(graded, 1) * 1e6:.0f} µs, 통과 {passed}/{graded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""획 데이터를 담는 간결한 바이너리 형식 (.hjsp)
+
+JSON 획 데이터를 고정소수점 정수 좌표로 묶어 한 파일에 저장하고, 읽을 때는
+파일을 mmap 해서 한 글자의 구간만 numpy 배열 뷰로 잘라 쓴다 (복사나 JSON 파싱 없음).
+
+파일 구조 (리틀 엔디언):
+    헤더    magic "HJSP", 버전 u16, 좌표 배율 u16, 글자 수 u32, 예약 u32
+    색인    (코드포인트 u32, 블록 위치 u32, 블록 길이 u32) × 글자 수, 코드포인트 순
+    블록    글자마다 하나 (4바이트 정렬)
+        획 수 u16, 뜻 길이 u16, 획수 u16, 획 설명 길이 u16
+        명령 위치 u32 × (획 수 + 1)    - 획마다 ops 의 시작 위치
+        숫자 위치 u32 × (획 수 + 1)    - 획마다 numbers 의 시작 위치
+        중심선 위치 u32 × (획 수 + 1)  - 획마다 medians 점의 시작 위치
+        ops      u8   (SVG 명령 글자, 'M', 'L', ...)
+        numbers  i16  (명령 인자, 좌표 × 배율)
+        medians  i16  (x, y 쌍, 좌표 × 배율)
+        뜻       UTF-8
+        획 설명  UTF-8, 획마다 \x1f 로 구분 (없으면 길이 0)
+
+사용 예:
+    python stroke_pack.py build -o build/strokes.hjsp
+    python stroke_pack.py info build/strokes.hjsp
+"""
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+from collections.abc import Mapping
+
+import numpy as np
+
+from path_flattener import compile_command_groups, compile_path
+
+MAGIC = b"HJSP"
+VERSION = 1
+# 좌표 1 단위를 64 로 나눈 고정소수점 (int16 이므로 -512~511 범위, 0~100 좌표계에 충분)
+DEFAULT_SCALE = 64
+
+_HEADER = struct.Struct("<4sHHII")
+_BLOCK_HEADER = struct.Struct("<HHHH")
+INDEX_DTYPE = np.dtype([("codepoint", "<u4"), ("offset", "<u4"), ("length", "<u4")])
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+# 명령별 인자 수
+_ARITY = {"M": 2, "L": 2, "H": 1, "V": 1, "Q": 4, "T": 2, "C": 6, "S": 4, "A": 7, "Z": 0}
+
+
+def _split_commands(path_str):
+    """경로를 (명령, 인자 목록) 으로 나누기
+
+    인자를 이어 쓴 명령("L 1 2 3 4")은 명령 하나에 인자 한 벌씩이 되도록 펼친다
+    (M 뒤에 이어진 좌표는 SVG 규칙대로 L).
+    """
+    command, args = None, []
+    result = []
+
+    def flush():
+        if command is None:
+            return
+        arity = _ARITY.get(command.upper())
+        if arity is None:
+            raise ValueError(f"지원하지 않는 경로 명령: {command}")
+        if arity == 0 or not args:
+            result.append((command, []))
+            return
+        current = command
+        for i in range(0, len(args) - arity + 1, arity):
+            result.append((current, args[i:i + arity]))
+            if current in "Mm":
+                current = "L" if current == "M" else "l"
+
+    for token in _TOKEN_PATTERN.findall(path_str):
+        if token.isalpha():
+            flush()
+            command, args = token, []
+        else:
+            args.append(float(token))
+    flush()
+    return result
+
+
+def _align(size):
+    return (size + 3) & ~3
+
+
+def _fixed(values, scale):
+    array = np.round(np.asarray(values, dtype=np.float64) * scale)
+    if array.size and (array.min() < -32768 or array.max() > 32767):
+        raise ValueError(f"좌표가 int16 범위를 벗어납니다 (배율 {scale})")
+    return array.astype("<i2")
+
+
+def encode_character(record, scale=DEFAULT_SCALE):
+    """레코드 하나({"strokes": [...], "medians": [...], ...})를 블록 바이트로 변환"""
+    strokes = record.get("strokes", [])
+    medians = record.get("medians") or []
+    op_offsets, number_offsets, median_offsets = [0], [0], [0]
+    ops, numbers, median_points = [], [], []
+
+    for i, stroke in enumerate(strokes):
+        path = stroke["path"] if isinstance(stroke, dict) else stroke
+        for command, args in _split_commands(path):
+            ops.append(ord(command))
+            numbers.extend(args)
+        median = medians[i] if i < len(medians) else []
+        median_points.extend(median)
+        op_offsets.append(len(ops))
+        number_offsets.append(len(numbers))
+        median_offsets.append(len(median_points))
+
+    meaning = record.get("meaning", "").encode("utf-8")
+    descs = [stroke.get("desc", "") if isinstance(stroke, dict) else "" for stroke in strokes]
+    desc = "\x1f".join(descs).encode("utf-8") if any(descs) else b""
+    stroke_count = int(record.get("stroke_count") or len(strokes))
+    parts = [
+        _BLOCK_HEADER.pack(len(strokes), len(meaning), stroke_count, len(desc)),
+        np.asarray(op_offsets, dtype="<u4").tobytes(),
+        np.asarray(number_offsets, dtype="<u4").tobytes(),
+        np.asarray(median_offsets, dtype="<u4").tobytes(),
+    ]
+    body = b"".join(parts)
+    body += np.asarray(ops, dtype=np.uint8).tobytes()
+    body += b"\0" * (_align(len(body)) - len(body))
+    body += _fixed(numbers, scale).tobytes()
+    body += _fixed(np.reshape(median_points, (-1, 2)) if median_points else [], scale).tobytes()
+    body += meaning + desc
+    return body + b"\0" * (_align(len(body)) - len(body))
+
+
+def write_pack(records, output, scale=DEFAULT_SCALE):
+    """{한자: 레코드} 를 .hjsp 파일로 저장하고 저장한 글자 수를 반환"""
+    characters = sorted((c for c in records if len(c) == 1), key=ord)
+    blocks = [encode_character(records[c], scale) for c in characters]
+
+    index = np.zeros(len(characters), dtype=INDEX_DTYPE)
+    offset = _HEADER.size + index.nbytes
+    for i, (character, block) in enumerate(zip(characters, blocks)):
+        index[i] = (ord(character), offset, len(block))
+        offset += len(block)
+
+    tmp_file = output + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, scale, len(characters), 0))
+        f.write(index.tobytes())
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp_file, output)
+    return len(characters)
+
+
+def is_pack_file(path):
+    """파일이 .hjsp 형식인지 (magic 으로 확인)"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class CharacterGeometry:
+    """한 글자의 획 데이터 (mmap 된 파일 위의 numpy 뷰)
+
+    ops/numbers/medians 는 읽기 전용 뷰이며 좌표는 scale 배 된 정수이다.
+    """
+
+    def __init__(self, buffer, offset, scale):
+        self.scale = scale
+        count, meaning_length, self.stroke_count, desc_length = _BLOCK_HEADER.unpack_from(buffer, offset)
+        pos = offset + _BLOCK_HEADER.size
+        self.op_offsets = np.frombuffer(buffer, "<u4", count + 1, pos)
+        pos += 4 * (count + 1)
+        self.number_offsets = np.frombuffer(buffer, "<u4", count + 1, pos)
+        pos += 4 * (count + 1)
+        self.median_offsets = np.frombuffer(buffer, "<u4", count + 1, pos)
+        pos += 4 * (count + 1)
+        self.ops = np.frombuffer(buffer, np.uint8, int(self.op_offsets[-1]), pos)
+        pos = offset + _align(pos - offset + self.ops.size)
+        self.numbers = np.frombuffer(buffer, "<i2", int(self.number_offsets[-1]), pos)
+        pos += self.numbers.nbytes
+        self.medians = np.frombuffer(buffer, "<i2", 2 * int(self.median_offsets[-1]), pos).reshape(-1, 2)
+        pos += self.medians.nbytes
+        self._meaning = bytes(buffer[pos:pos + meaning_length])
+        pos += meaning_length
+        self._desc = bytes(buffer[pos:pos + desc_length])
+
+    def __len__(self):
+        return len(self.op_offsets) - 1
+
+    @property
+    def meaning(self):
+        return self._meaning.decode("utf-8")
+
+    def path(self, i):
+        """i 번째 획의 SVG 경로 문자열"""
+        ops = self.ops[self.op_offsets[i]:self.op_offsets[i + 1]]
+        numbers = self.numbers[self.number_offsets[i]:self.number_offsets[i + 1]]
+        values = iter(numbers.tolist())
+        parts = []
+        for op in ops.tolist():
+            parts.append(chr(op))
+            parts.extend(_format(next(values), self.scale) for _ in range(_ARITY[chr(op).upper()]))
+        return " ".join(parts)
+
+    def compiled(self):
+        """획마다 평탄화할 CompiledPath 목록 (명령/숫자 배열에서 한 번에, 문자열 파싱 없음)"""
+        return compile_command_groups(self.ops, self.numbers / self.scale, self.op_offsets)
+
+    def median(self, i):
+        """i 번째 획의 중심선 (float 배열, 데이터 좌표계)"""
+        return self.medians[self.median_offsets[i]:self.median_offsets[i + 1]] / self.scale
+
+    def record(self, pack=None, character=None):
+        """hanja_strokes.json 과 같은 형식의 사전
+
+        pack 과 character 를 주면 경로를 PackedPath 로 담아, 평탄화할 때 팩의 배열을
+        그대로 쓰게 한다.
+        """
+        descs = self._desc.decode("utf-8").split("\x1f") if self._desc else [""] * len(self)
+        paths = [self.path(i) for i in range(len(self))]
+        if pack is not None:
+            paths = [PackedPath(path, pack, character, i) for i, path in enumerate(paths)]
+        strokes = [{"path": paths[i], "desc": descs[i] or f"{i + 1}번째 획"}
+                   for i in range(len(self))]
+        record = {"meaning": self.meaning, "stroke_count": self.stroke_count, "strokes": strokes}
+        if self.medians.size:
+            record["medians"] = [self.median(i).tolist() for i in range(len(self))]
+        return record
+
+
+def _format(value, scale):
+    if value % scale == 0:
+        return str(value // scale)
+    return repr(value / scale)
+
+
+class PackedPath(str):
+    """팩에서 읽은 획 경로 문자열
+
+    path_flattener 는 compiled() 로 팩의 명령/숫자 배열에서 바로 CompiledPath 를
+    만들므로 문자열을 다시 파싱하지 않는다. 문자열 값은 캐시 키와 JSON 출력용이다.
+    """
+
+    def __new__(cls, text, pack, character, index):
+        path = super().__new__(cls, text)
+        path._source = (pack, character, index)
+        return path
+
+    def __reduce__(self):
+        # 다른 프로세스로 보낼 때는 보통 문자열로
+        return str, (str(self),)
+
+    def compiled(self):
+        pack, character, index = self._source
+        if pack.index is None:
+            # 팩을 닫은 뒤에는 문자열을 파싱
+            return compile_path(self)
+        return pack.compiled(character)[index]
+
+
+class StrokePack(Mapping):
+    """.hjsp 파일을 mmap 해서 한자 → 레코드 매핑으로 제공
+
+    pack.geometry(c) 는 복사 없는 배열 뷰를, pack[c] 는 드로어가 쓰는
+    hanja_strokes.json 형식의 레코드를 반환한다. 레코드의 경로(PackedPath)를
+    평탄화할 때는 경로 문자열 대신 팩의 명령/숫자 배열을 쓴다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.scale, count, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' 는 획 데이터 팩 파일이 아닙니다")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 팩 버전: {version}")
+        self.index = np.frombuffer(self._map, INDEX_DTYPE, count, _HEADER.size)
+        self._records = {}
+        self._compiled = {}
+
+    def close(self):
+        self.index = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _find(self, character):
+        if not isinstance(character, str) or len(character) != 1:
+            return -1
+        codepoints = self.index["codepoint"]
+        i = int(np.searchsorted(codepoints, ord(character)))
+        if i < len(codepoints) and codepoints[i] == ord(character):
+            return i
+        return -1
+
+    def geometry(self, character):
+        i = self._find(character)
+        if i < 0:
+            raise KeyError(character)
+        return CharacterGeometry(self._map, int(self.index["offset"][i]), self.scale)
+
+    def compiled(self, character):
+        """글자의 획별 CompiledPath 목록 (처음 요청할 때 글자 전체를 한 번에 컴파일)"""
+        compiled = self._compiled.get(character)
+        if compiled is None:
+            compiled = self._compiled[character] = self.geometry(character).compiled()
+        return compiled
+
+    def __getitem__(self, character):
+        record = self._records.get(character)
+        if record is None:
+            record = self._records[character] = self.geometry(character).record(self, character)
+        return record
+
+    def __contains__(self, character):
+        return self._find(character) >= 0
+
+    def __iter__(self):
+        return (chr(c) for c in self.index["codepoint"].tolist())
+
+    def __len__(self):
+        return len(self.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="획 데이터 바이너리 팩(.hjsp) 만들기/확인")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="JSON 획 데이터를 팩 파일로 변환")
+    build.add_argument("--root", default=".", help="데이터를 찾을 저장소 루트 (character_store 사용)")
+    build.add_argument("--output", "-o", default="build/strokes.hjsp", help="출력 파일")
+    build.add_argument("--scale", type=int, default=DEFAULT_SCALE, help="고정소수점 배율")
+
+    info = sub.add_parser("info", help="팩 파일 정보 출력")
+    info.add_argument("pack", help="팩 파일")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from character_store import CharacterStore
+
+        store = CharacterStore(args.root, require_strokes=True)
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        try:
+            count = write_pack(store, args.output, args.scale)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"{count}자 저장 → {args.output} ({os.path.getsize(args.output):,} 바이트)")
+    else:
+        if not is_pack_file(args.pack):
+            print(f"Error: '{args.pack}' 는 획 데이터 팩 파일이 아닙니다.")
+            sys.exit(1)
+        with StrokePack(args.pack) as pack:
+            strokes = sum(len(pack.geometry(c)) for c in pack)
+            print(f"{len(pack)}자, {strokes}획, 배율 {pack.scale}, "
+                  f"{os.path.getsize(args.pack):,} 바이트")
+
+
+if __name__ == "__main__":
+    main()
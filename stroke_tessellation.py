@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""붓 압력을 반영한 획 외곽선 계산
+
+획의 중심선(경로를 평탄화한 점)과 압력 곡선으로 굵기가 변하는
+외곽선 다각형을 한 번 계산해 둔다. 그리는 쪽에서는 펜 굵기를 점마다 바꾸지
+않고 다각형 하나를 채우기만 하면 된다.
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from path_cache import get_default_cache
+
+# 둥근 끝을 표현할 반원의 분할 수
+CAP_SEGMENTS = 8
+
+# 외곽선 캐시 크기
+OUTLINE_CACHE_SIZE = 2048
+
+
+def taper_pressure(t):
+    """HanjaDrawer 의 붓 효과: 처음과 끝 20% 에서 굵기가 0.5 배까지 줄어듦"""
+    return np.where(t < 0.2, 0.5 + 2.5 * t, np.where(t > 0.8, 0.5 + 2.5 * (1 - t), 1.0))
+
+
+def brush_pressure(t):
+    """turtle 곡선 획의 붓 효과: 가운데가 가장 굵고 양 끝은 0.3 배"""
+    return 1 - 0.7 * (2 * t - 1) ** 2
+
+
+def uniform_pressure(t):
+    return np.ones_like(t)
+
+
+PRESSURE_PROFILES = {
+    "taper": taper_pressure,
+    "brush": brush_pressure,
+    "uniform": uniform_pressure,
+}
+
+
+def resample(points, spacing):
+    """중심선을 호 길이 기준으로 거의 같은 간격(spacing 이하)의 점들로 다시 나누기"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2:
+        return points
+    seg = np.hypot(*np.diff(points, axis=0).T)
+    keep = np.concatenate([[True], seg > 1e-9])
+    points, seg = points[keep], seg[seg > 1e-9]
+    if len(points) < 2:
+        return points
+
+    arc = np.concatenate([[0.0], np.cumsum(seg)])
+    count = max(2, int(math.ceil(arc[-1] / spacing)) + 1)
+    target = np.linspace(0.0, arc[-1], count)
+    return np.column_stack([np.interp(target, arc, points[:, 0]),
+                            np.interp(target, arc, points[:, 1])])
+
+
+def _cap(center, normal, radius, forward):
+    """중심점에서 normal 방향 → forward 방향 → -normal 방향으로 도는 반원 (양 끝점 제외)"""
+    angles = np.linspace(0.0, math.pi, CAP_SEGMENTS + 1)[1:-1]
+    return (center + np.outer(np.cos(angles), normal) * radius
+            + np.outer(np.sin(angles), forward) * radius)
+
+
+class StrokeOutline:
+    """굵기가 변하는 획의 외곽선
+
+    centerline 의 i 번째 점에 대해 left[i], right[i] 가 양쪽 외곽 점이다.
+    polygon(count) 는 처음 count 개 점까지만 그린 획의 외곽선이므로, 미리 계산한
+    좌표를 잘라 쓰는 것만으로 획을 그리는 애니메이션을 만들 수 있다.
+    """
+
+    def __init__(self, centerline, width, profile="taper"):
+        self.centerline = centerline
+        n = len(centerline)
+        if n >= 2:
+            t = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(centerline, axis=0).T))])
+            t /= t[-1] if t[-1] > 0 else 1.0
+        else:
+            t = np.zeros(n)
+        self.radii = PRESSURE_PROFILES[profile](t) * (width / 2.0)
+
+        # 접선은 이웃 점의 차이, 법선은 접선을 90도 돌린 방향
+        tangents = np.gradient(centerline, axis=0) if n >= 2 else np.tile([1.0, 0.0], (n, 1))
+        lengths = np.hypot(tangents[:, 0], tangents[:, 1])
+        lengths[lengths == 0] = 1.0
+        self.tangents = tangents / lengths[:, None]
+        self.normals = np.column_stack([-self.tangents[:, 1], self.tangents[:, 0]])
+
+        offsets = self.normals * self.radii[:, None]
+        self.left = centerline + offsets
+        self.right = centerline - offsets
+        self._full = None
+
+    def __len__(self):
+        return len(self.centerline)
+
+    def polygon(self, count=None):
+        """처음 count 개 점까지의 외곽선 다각형 (M, 2). 양 끝은 둥글게 처리"""
+        n = len(self.centerline)
+        if count is None or count >= n:
+            if self._full is None:
+                self._full = self._polygon(n)
+                self._full.flags.writeable = False
+            return self._full
+        return self._polygon(max(count, 0))
+
+    def _polygon(self, count):
+        if count == 0:
+            return np.empty((0, 2))
+        last = count - 1
+        c, nrm, r = self.centerline, self.normals, self.radii
+        end_cap = _cap(c[last], nrm[last], r[last], self.tangents[last])
+        start_cap = _cap(c[0], -nrm[0], r[0], -self.tangents[0])
+        return np.concatenate([self.left[:count], end_cap, self.right[:count][::-1], start_cap])
+
+
+def tessellate(centerline, width, profile="taper", spacing=2.0):
+    """중심선 점들로 외곽선 계산 (spacing: 압력 변화를 표현할 표본 간격)"""
+    points = resample(centerline, spacing) if spacing else np.asarray(centerline, dtype=np.float64)
+    return StrokeOutline(points, width, profile)
+
+
+_outline_cache = OrderedDict()
+
+
+def _cached(key, build):
+    outline = _outline_cache.get(key)
+    if outline is None:
+        outline = build()
+        _outline_cache[key] = outline
+        if len(_outline_cache) > OUTLINE_CACHE_SIZE:
+            _outline_cache.popitem(last=False)
+    else:
+        _outline_cache.move_to_end(key)
+    return outline
+
+
+def outline_for_path(path_str, width, scale=1.0, profile="taper", tolerance=0.1, spacing=2.0,
+                     path_cache=None):
+    """SVG 경로 획의 외곽선 (배율 적용 좌표, 같은 인자면 캐시된 결과 반환)
+
+    tolerance 와 spacing 은 데이터 좌표계(0~100) 기준이다.
+    """
+    def build():
+        cache = path_cache or get_default_cache()
+        points = cache.get_points(path_str, tolerance, scale)
+        return tessellate(points, width, profile, spacing * scale)
+    return _cached(("path", path_str, width, float(scale), profile, tolerance, spacing), build)
+
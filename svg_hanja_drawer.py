@@ -1,14 +1,32 @@
-import json
-import time
 import sys
 import os
-import tkinter as tk
-from tkinter import messagebox
 import argparse
 import random
 import math
-from PIL import Image, ImageDraw, ImageTk
 import re
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+
+import instrumentation
+from animation import FrameScheduler, tk_scheduler
+from character_store import open_hanja_data
+from geometry_simplify import rdp_mask, simplify_points
+from path_cache import PathCache, get_default_cache
+from path_flattener import flatten_path
+from stroke_tessellation import StrokeOutline, outline_for_path
+
+# tkinter 는 창을 만들 때 가져온다 (_load_tk). 내보내기(-o)만 할 때는 필요 없다.
+tk = None
+messagebox = None
+
+def _load_tk():
+    global tk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import messagebox as tk_messagebox
+        tk, messagebox = tkinter, tk_messagebox
 
 # SVG 경로 파서
 class SVGPathParser:
@@ -26,56 +44,69 @@ class SVGPathParser:
         return commands
 
     @staticmethod
-    def get_path_points(path_str, steps=50):
+    def get_path_points(path_str, steps=50, tolerance=None, simplify=None):
         """SVG 경로로부터 점들의 배열을 생성"""
-        commands = SVGPathParser.parse_path(path_str)
-        points = []
-        current_point = (0, 0)
-        
-        for cmd, coords in commands:
-            if cmd == 'M':  # Move to
-                current_point = (coords[0], coords[1])
-                points.append(current_point)
-            elif cmd == 'L':  # Line to
-                end_point = (coords[0], coords[1])
-                # 선형 보간으로 점들 생성
-                for t in range(1, steps + 1):
-                    t_val = t / steps
-                    x = current_point[0] * (1 - t_val) + end_point[0] * t_val
-                    y = current_point[1] * (1 - t_val) + end_point[1] * t_val
-                    points.append((x, y))
-                current_point = end_point
-            elif cmd == 'Q':  # Quadratic Bezier
-                control_point = (coords[0], coords[1])
-                end_point = (coords[2], coords[3])
-                # 2차 베지어 곡선 계산
-                for t in range(1, steps + 1):
-                    t_val = t / steps
-                    x = (1 - t_val)**2 * current_point[0] + 2 * (1 - t_val) * t_val * control_point[0] + t_val**2 * end_point[0]
-                    y = (1 - t_val)**2 * current_point[1] + 2 * (1 - t_val) * t_val * control_point[1] + t_val**2 * end_point[1]
-                    points.append((x, y))
-                current_point = end_point
-            elif cmd == 'C':  # Cubic Bezier
-                control_point1 = (coords[0], coords[1])
-                control_point2 = (coords[2], coords[3])
-                end_point = (coords[4], coords[5])
-                # 3차 베지어 곡선 계산
-                for t in range(1, steps + 1):
-                    t_val = t / steps
-                    x = (1 - t_val)**3 * current_point[0] + 3 * (1 - t_val)**2 * t_val * control_point1[0] + \
-                        3 * (1 - t_val) * t_val**2 * control_point2[0] + t_val**3 * end_point[0]
-                    y = (1 - t_val)**3 * current_point[1] + 3 * (1 - t_val)**2 * t_val * control_point1[1] + \
-                        3 * (1 - t_val) * t_val**2 * control_point2[1] + t_val**3 * end_point[1]
-                    points.append((x, y))
-                current_point = end_point
-            
-        return points
+        return [tuple(p) for p in SVGPathParser.get_path_array(path_str, steps, tolerance, simplify).tolist()]
+
+    @staticmethod
+    def get_path_array(path_str, steps=50, tolerance=None, simplify=None):
+        """SVG 경로로부터 (N, 2) 좌표 배열을 생성
+
+        tolerance 를 지정하면 고정 steps 대신 평탄도 기준으로 적응적으로 나눈다.
+        simplify 를 지정하면 그 허용 오차로 거의 일직선인 점을 뺀다 (RDP).
+        """
+        return simplify_points(flatten_path(path_str, steps, tolerance), simplify)
+
+# 획의 굵기 구간: 점 번호 [start, end], 굵기, 캔버스 좌표 (x0, y0, x1, y1, ...),
+# 단순화했을 때 캔버스에 넘길 점의 구간 내 번호 (단순화하지 않으면 None)
+StrokeBand = namedtuple("StrokeBand", ["start", "end", "width", "coords", "keep"],
+                        defaults=(None,))
+
+
+def band_coords(band, count):
+    """구간의 처음 count 개 점까지 그릴 캔버스 좌표
+
+    단순화한 구간이면 남긴 점과 지금 그리는 마지막 점만 넘긴다. 굵기 구간과
+    드러내는 순서는 단순화 전의 점 번호를 그대로 쓰므로 바뀌지 않는다.
+    """
+    if band.keep is None:
+        return band.coords[:2 * count]
+    indices = list(band.keep[:bisect_left(band.keep, count)])
+    if indices[-1] != count - 1:
+        indices.append(count - 1)
+    return [v for i in indices for v in band.coords[2 * i:2 * i + 2]]
 
 class HanjaDrawer:
-    def __init__(self, width=500, height=500, scale=3):
+    def __init__(self, width=500, height=500, scale=3, path_cache=None, pressure_bands=4,
+                 animate=True, stroke_duration=1.0, brush="bands", data_path="hanja_strokes.json",
+                 hanja_data=None, practice=False, simplify=None):
+        # 한자 데이터 로드 (창을 만들기 전에 읽어서, 데이터 오류면 창 없이 종료)
+        self.hanja_data = hanja_data if hanja_data is not None else self.load_hanja_data(data_path)
+        
         self.width = width
         self.height = height
         self.scale = scale
+        # 시작/끝 부분의 굵기 구간 수 (0 이면 획 하나를 같은 굵기의 선 하나로 그림)
+        self.pressure_bands = pressure_bands
+        # 붓 표현 방식: "bands" 는 굵기 구간별 선, "outline" 은 획 하나를 채운 다각형 하나
+        self.brush = brush
+        # 굵기 구간 선을 캔버스에 넘기기 전에 줄일 RDP 허용 오차 (0~100 데이터 좌표 기준)
+        self.simplify = simplify or None
+        self.animate = animate
+        # 획 하나를 그리는 데 걸리는 시간 (초)
+        self.stroke_duration = stroke_duration
+        self.scheduler = None
+        self._animation = None
+        # 연습 모드: 마우스로 그린 획을 기준 획과 비교해 채점
+        self.practice = practice
+        self.matcher = None
+        self._practice = None
+        self._band_cache = {}
+        # 배경 그림 (tk 가 이미지를 놓치지 않도록 참조를 들고 있음)
+        self._background = None
+        # 같은 획 경로를 다시 그릴 때는 파싱/평탄화를 건너뛴다
+        self.path_cache = path_cache if path_cache is not None else get_default_cache()
+        _load_tk()
         self.root = tk.Tk()
         self.root.title("한자 획순 - SVG 표현")
         
@@ -87,91 +118,178 @@ class HanjaDrawer:
         self.status_label = tk.Label(self.root, text="", font=("Arial", 12))
         self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
         
-        # 한자 데이터 로드
-        self.hanja_data = self.load_hanja_data()
-        
-        # 이미지와 드로잉 컨텍스트
-        self.image = Image.new("RGBA", (width, height), (255, 255, 255, 0))
-        self.draw = ImageDraw.Draw(self.image)
-        
         # 키보드 이벤트 바인딩
         self.root.bind("<Key>", self.on_key_press)
         
-    def load_hanja_data(self):
-        """한자 획순 데이터 로드"""
+    @staticmethod
+    def load_hanja_data(data_path="hanja_strokes.json"):
+        """한자 획순 데이터 로드
+
+        디렉터리를 주면 그 아래 모든 데이터를 묶은 저장소를, .hjsp 팩 파일을 주면
+        mmap 으로 여는 팩을 사용한다.
+        """
         try:
-            with open("hanja_strokes.json", "r", encoding="utf-8") as f:
-                return json.load(f)
+            return open_hanja_data(data_path)
         except FileNotFoundError:
-            print("Error: hanja_strokes.json 파일을 찾을 수 없습니다.")
+            print(f"Error: {data_path} 파일을 찾을 수 없습니다.")
             sys.exit(1)
-        except json.JSONDecodeError:
-            print("Error: hanja_strokes.json 파일 형식이 잘못되었습니다.")
+        except ValueError:
+            print(f"Error: {data_path} 파일 형식이 잘못되었습니다.")
             sys.exit(1)
     
     def draw_grid(self):
-        """그리드 그리기"""
-        # 주요 그리드 라인
-        for i in range(0, self.width + 1, 50):
-            # 수직선
-            self.canvas.create_line(i, 0, i, self.height, fill="#E0E0E0")
-            # 수평선
-            self.canvas.create_line(0, i, self.width, i, fill="#E0E0E0")
-        
-        # 중심선
-        center_x, center_y = self.width // 2, self.height // 2
-        self.canvas.create_line(center_x, 0, center_x, self.height, fill="#C0C0C0", width=1.5)
-        self.canvas.create_line(0, center_y, self.width, center_y, fill="#C0C0C0", width=1.5)
-    
-    def draw_stroke_path(self, stroke, delay=True, color="black"):
-        """한 획을 그리는 함수"""
-        if "path" not in stroke:
+        """그리드 배경 깔기 (창마다 한 번만, 글자를 바꿔도 다시 그리지 않음)
+
+        background_layer 가 캐시한 그림 하나를 "background" 태그로 두고 맨 아래로
+        내린다. PIL 이 없으면 같은 선을 캔버스 선으로 한 번 그린다.
+        """
+        if self.canvas.find_withtag("background"):
             return
-        
+        try:
+            from background_layer import background_png, background_spec
+            spec = background_spec(self.width, self.height, divisions=max(1, self.width // 50))
+            self._background = tk.PhotoImage(data=background_png(spec))
+            self.canvas.create_image(0, 0, image=self._background, anchor="nw", tags="background")
+        except ImportError:
+            for i in range(0, self.width + 1, 50):
+                self.canvas.create_line(i, 0, i, self.height, fill="#E0E0E0", tags="background")
+                self.canvas.create_line(0, i, self.width, i, fill="#E0E0E0", tags="background")
+            center_x, center_y = self.width // 2, self.height // 2
+            self.canvas.create_line(center_x, 0, center_x, self.height, fill="#C0C0C0", width=1.5,
+                                    tags="background")
+            self.canvas.create_line(0, center_y, self.width, center_y, fill="#C0C0C0", width=1.5,
+                                    tags="background")
+        self.canvas.tag_lower("background")
+    
+    def clear_strokes(self):
+        """획과 연습 선만 지우기 (배경은 그대로)"""
+        self.canvas.delete("stroke", "practice")
+    
+    def stroke_bands(self, stroke):
+        """획을 붓 압력(굵기) 구간별 폴리라인으로 미리 계산
+
+        시작 20% 와 끝 20% 는 pressure_bands 개 구간으로 나누어 굵기를 바꾸고,
+        가운데는 한 구간으로 둔다. 이웃한 구간은 경계 점을 공유한다.
+        simplify 가 있으면 구간을 나눈 뒤 구간마다 캔버스에 넘길 점만 고른다.
+        """
         path_str = stroke["path"]
         stroke_width = float(stroke.get("strokeWidth", 2.5)) * self.scale
+        key = (path_str, stroke_width)
+        if key in self._band_cache:
+            return self._band_cache[key]
         
-        # SVG 경로를 해석하여 점들의 배열로 변환
-        points = SVGPathParser.get_path_points(path_str)
-        
-        if not points:
-            return
-        
-        # 획의 경로를 따라 그리기
-        last_point = None
-        for i, point in enumerate(points):
-            # 점 좌표를 조정 (중앙 정렬)
-            x, y = point[0] * self.scale, point[1] * self.scale
-            
-            if last_point:
-                # 획의 두께를 점점 변화시켜 붓의 압력 효과 표현
-                progress = i / len(points)
+        # SVG 경로를 해석하여 점들의 배열로 변환 (배율 적용, 캐시 사용)
+        points = self.path_cache.get_points(path_str, scale=self.scale)
+        n = len(points)
+        bands = []
+        if n >= 2:
+            k = self.pressure_bands
+            if k > 0:
+                # [0, ..., 0.2] 와 [0.8, ..., 1.0] 을 각각 k 개 구간으로 (가운데는 0.2 ~ 0.8 하나)
+                edges = ([0.2 * i / k for i in range(k + 1)]
+                         + [0.8 + 0.2 * i / k for i in range(k + 1)])
+            else:
+                edges = [0.0, 1.0]
+            for lo, hi in zip(edges, edges[1:]):
+                start, end = int(lo * n), min(n - 1, int(hi * n))
+                if end <= start:
+                    continue
+                # 획의 두께를 점점 변화시켜 붓의 압력 효과 표현 (구간 가운데 기준)
+                progress = (lo + hi) / 2
                 thickness = stroke_width
-                if progress < 0.2:  # 시작 부분
+                if k > 0 and progress < 0.2:  # 시작 부분
                     thickness = stroke_width * (0.5 + 2.5 * progress)
-                elif progress > 0.8:  # 끝 부분
+                elif k > 0 and progress > 0.8:  # 끝 부분
                     thickness = stroke_width * (0.5 + 2.5 * (1 - progress))
-                
-                # 캔버스에 선 그리기
-                line_id = self.canvas.create_line(
-                    last_point[0], last_point[1], x, y, 
-                    fill=color, width=thickness, 
-                    capstyle=tk.ROUND, joinstyle=tk.ROUND
+                segment = points[start:end + 1]
+                keep = None
+                if self.simplify:
+                    keep = tuple(np.flatnonzero(rdp_mask(segment, self.simplify * self.scale)).tolist())
+                bands.append(StrokeBand(start, end, thickness, segment.ravel().tolist(), keep))
+        
+        self._band_cache[key] = bands
+        return bands
+    
+    def reveal_stroke(self, bands, items, count, color, previous=1):
+        """획의 처음 count 개 점까지 보이도록 캔버스 항목을 만들거나 늘림
+
+        items 는 구간 번호 → 캔버스 항목 ID. 직전에 previous 개 점까지 그려져
+        있었다면 그 뒤로 점이 늘어난 구간만 갱신한다.
+        """
+        last, previous_last = count - 1, previous - 1
+        for i, band in enumerate(bands):
+            if band.start >= last:
+                break
+            if band.end <= previous_last and i in items:
+                continue
+            upto = min(band.end, last)
+            coords = band_coords(band, upto - band.start + 1)
+            if i in items:
+                instrumentation.count("canvas_items_updated")
+                self.canvas.coords(items[i], *coords)
+            else:
+                instrumentation.count("canvas_items_created")
+                items[i] = self.canvas.create_line(
+                    *coords, fill=color, width=band.width,
+                    capstyle=tk.ROUND, joinstyle=tk.ROUND, tags="stroke"
                 )
-                
-                if delay:
-                    self.canvas.update()
-                    time.sleep(0.02)  # 획 애니메이션 속도 조절
-            
-            last_point = (x, y)
+    
+    def stroke_outline(self, stroke):
+        """획 전체의 굵기 변화를 담은 외곽선 다각형 (미리 계산되어 캐시됨)"""
+        stroke_width = float(stroke.get("strokeWidth", 2.5)) * self.scale
+        return outline_for_path(stroke["path"], stroke_width, self.scale, "taper",
+                                path_cache=self.path_cache)
+    
+    def reveal_outline(self, outline, items, count, color):
+        """외곽선의 처음 count 개 점까지를 채운 다각형 하나로 그리기"""
+        if count < 2:
+            return
+        coords = outline.polygon(count).ravel().tolist()
+        if 0 in items:
+            instrumentation.count("canvas_items_updated")
+            self.canvas.coords(items[0], *coords)
+        else:
+            instrumentation.count("canvas_items_created")
+            items[0] = self.canvas.create_polygon(*coords, fill=color, outline="", tags="stroke")
+    
+    def stroke_geometry(self, stroke):
+        """붓 표현 방식에 맞는 획 좌표 (굵기 구간 목록 또는 외곽선)"""
+        if "path" not in stroke:
+            return []
+        with instrumentation.span("stroke_geometry"):
+            if self.brush == "outline":
+                return self.stroke_outline(stroke)
+            return self.stroke_bands(stroke)
+    
+    @staticmethod
+    def geometry_length(geometry):
+        """획 좌표의 점 개수"""
+        if isinstance(geometry, StrokeOutline):
+            return len(geometry)
+        return geometry[-1].end + 1 if geometry else 0
+    
+    def reveal_geometry(self, geometry, items, count, color, previous=1):
+        with instrumentation.span("canvas_items"):
+            if isinstance(geometry, StrokeOutline):
+                self.reveal_outline(geometry, items, count, color)
+            elif geometry:
+                self.reveal_stroke(geometry, items, count, color, previous)
+    
+    def draw_stroke_path(self, stroke, color="black"):
+        """한 획을 바로 그리는 함수 (굵기 구간마다 폴리라인 하나, 또는 외곽선 하나)"""
+        geometry = self.stroke_geometry(stroke)
+        self.reveal_geometry(geometry, {}, self.geometry_length(geometry), color)
     
     def draw_hanja(self, character, delay=True):
-        """한자 그리기"""
+        """한자 그리기 (delay 가 참이면 이벤트 루프에서 애니메이션)"""
         if character not in self.hanja_data:
             messagebox.showerror("오류", f"'{character}' 한자에 대한 데이터가 없습니다.")
             return False
         
-        self.canvas.delete("all")  # 캔버스 초기화
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
+        self.clear_strokes()
         self.draw_grid()
         
         # 타이틀 설정
@@ -181,16 +299,137 @@ class HanjaDrawer:
         # 획순 정보 가져오기
         strokes = self.hanja_data[character]["strokes"]
         
-        # 각 획을 순서대로 그리기
-        for i, stroke in enumerate(strokes):
-            self.status_label.config(text=f"{i+1}/{len(strokes)}획: {stroke['desc']}")
-            self.draw_stroke_path(stroke, delay)
-            self.root.update()
+        if not delay:
+            for stroke in strokes:
+                self.draw_stroke_path(stroke)
+            self.show_complete(character)
+            return True
+        
+        # 획마다 stroke_duration 초씩, 경과 시간에 맞춰 미리 계산한 좌표를 드러낸다
+        self._animation = {
+            "character": character,
+            "strokes": strokes,
+            "geometry": [self.stroke_geometry(s) for s in strokes],
+            "items": [{} for _ in strokes],
+            "shown": [0] * len(strokes),
+            "current": -1,
+        }
+        self.scheduler = FrameScheduler(
+            tk_scheduler(self.root), len(strokes) * self.stroke_duration,
+            self.show_progress, on_finish=lambda: self.show_complete(character)
+        )
+        self.scheduler.start()
+        return True
+    
+    def show_progress(self, progress):
+        """애니메이션 진행률(0~1)에 해당하는 모습으로 캔버스 갱신"""
+        anim = self._animation
+        strokes = anim["strokes"]
+        position = progress * len(strokes)
+        
+        for i, geometry in enumerate(anim["geometry"]):
+            total = self.geometry_length(geometry)
+            fraction = min(max(position - i, 0.0), 1.0)
+            count = 1 + round(fraction * (total - 1)) if fraction > 0 and total else 0
+            shown = anim["shown"][i]
+            if count == shown:
+                continue
+            if count < shown:
+                # 뒤로 탐색한 경우 이 획을 지우고 다시 드러냄
+                for item in anim["items"][i].values():
+                    self.canvas.delete(item)
+                anim["items"][i] = {}
+                shown = 1
+            if count >= 2:
+                self.reveal_geometry(geometry, anim["items"][i], count, "black", max(shown, 1))
+            anim["shown"][i] = count
+        
+        current = min(int(position), len(strokes) - 1)
+        if current != anim["current"] and progress < 1:
+            anim["current"] = current
+            self.status_label.config(
+                text=f"{current+1}/{len(strokes)}획: {strokes[current]['desc']}")
+    
+    def start_practice(self, character):
+        """연습 모드 시작: 흐린 안내 획 위에 마우스로 한 획씩 따라 그린다"""
+        if character not in self.hanja_data:
+            messagebox.showerror("오류", f"'{character}' 한자에 대한 데이터가 없습니다.")
+            return False
+        if self.matcher is None:
+            from stroke_matcher import StrokeMatcher
+            self.matcher = StrokeMatcher(self.hanja_data, path_cache=self.path_cache)
         
-        # 완성 메시지
+        self.clear_strokes()
+        self.draw_grid()
+        meaning = self.hanja_data[character]["meaning"]
+        self.root.title(f"한자 획순 연습 - {character} ({meaning})")
+        strokes = self.hanja_data[character]["strokes"]
+        for stroke in strokes:
+            self.draw_stroke_path(stroke, color="#DDDDDD")
+        
+        self._practice = {"character": character, "index": 0, "points": [], "item": None}
+        self.canvas.bind("<ButtonPress-1>", self.on_practice_press)
+        self.canvas.bind("<B1-Motion>", self.on_practice_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_practice_release)
+        self.status_label.config(text=f"1/{len(strokes)}획: {strokes[0]['desc']} - 따라 그려 보세요")
+        return True
+    
+    def on_practice_press(self, event):
+        if self._practice is None:
+            return
+        self._practice["points"] = [(event.x, event.y)]
+        self._practice["item"] = None
+    
+    def on_practice_drag(self, event):
+        practice = self._practice
+        if practice is None or not practice["points"]:
+            return
+        practice["points"].append((event.x, event.y))
+        coords = [c for point in practice["points"] for c in point]
+        # 그리는 동안에도 선 하나의 좌표만 갱신한다
+        if practice["item"] is None:
+            practice["item"] = self.canvas.create_line(*coords, fill="#3070D0", width=3,
+                                                       capstyle="round", tags="practice")
+        else:
+            self.canvas.coords(practice["item"], *coords)
+    
+    def on_practice_release(self, event):
+        practice = self._practice
+        if practice is None or len(practice["points"]) < 2:
+            return
+        character, index = practice["character"], practice["index"]
+        strokes = self.hanja_data[character]["strokes"]
+        points, practice["points"] = practice["points"], []
+        self.canvas.delete("practice")
+        match = self.matcher.score_stroke(character, index, points, self.scale)
+        
+        if match.passed:
+            self.draw_stroke_path(strokes[index], color="black")
+            practice["index"] = index = index + 1
+            if index == len(strokes):
+                self.show_complete(character)
+                self._practice = None
+                return
+            self.status_label.config(
+                text=f"좋아요 ({match.score:.0%}). {index+1}/{len(strokes)}획: {strokes[index]['desc']}")
+            return
+        
+        if match.reversed:
+            hint = "획의 방향이 반대입니다."
+        else:
+            # 다른 획과 더 비슷하면 획순이 틀린 것
+            closest = self.matcher.best_match(character, points, self.scale)
+            if closest.passed and closest.index != index:
+                hint = f"{closest.index+1}번째 획을 먼저 그렸습니다."
+            else:
+                hint = f"다시 그려 보세요 ({match.score:.0%})."
+        self.status_label.config(text=f"{hint} {index+1}/{len(strokes)}획: {strokes[index]['desc']}")
+    
+    def show_complete(self, character):
+        """완성 메시지"""
+        meaning = self.hanja_data[character]["meaning"]
         stroke_count = self.hanja_data[character]["stroke_count"]
         self.status_label.config(text=f"{character}({meaning}) - 완성 (총 {stroke_count}획)")
-        return True
     
     def list_available_hanja(self):
         """사용 가능한 한자 목록 표시"""
@@ -206,6 +445,19 @@ class HanjaDrawer:
             self.root.quit()
         elif key == 'l':
             self.list_available_hanja()
+        elif self.scheduler is None:
+            return
+        # 애니메이션 제어: 스페이스 일시정지, 좌우 화살표 한 획씩 이동, +/- 속도
+        elif key == ' ':
+            self.scheduler.toggle_pause()
+        elif event.keysym == 'Left':
+            self.scheduler.seek_by(-self.stroke_duration)
+        elif event.keysym == 'Right':
+            self.scheduler.seek_by(self.stroke_duration)
+        elif key in ('+', '='):
+            self.scheduler.set_speed(self.scheduler.speed * 1.5)
+        elif key == '-':
+            self.scheduler.set_speed(self.scheduler.speed / 1.5)
     
     def run(self, character=None):
         """프로그램 실행"""
@@ -221,8 +473,10 @@ class HanjaDrawer:
             def on_submit():
                 char = entry.get()
                 input_window.destroy()
-                if char in self.hanja_data:
-                    self.draw_hanja(char)
+                if char in self.hanja_data and self.practice:
+                    self.start_practice(char)
+                elif char in self.hanja_data:
+                    self.draw_hanja(char, self.animate)
                 else:
                     messagebox.showerror("오류", f"'{char}' 한자에 대한 데이터가 없습니다.")
                     self.list_available_hanja()
@@ -230,11 +484,52 @@ class HanjaDrawer:
             tk.Button(input_window, text="확인", command=on_submit).pack(pady=10)
             entry.focus_set()
             entry.bind("<Return>", lambda event: on_submit())
+        elif self.practice:
+            self.start_practice(character)
         else:
-            self.draw_hanja(character)
+            self.draw_hanja(character, self.animate)
         
         # 메인 루프 실행
         self.root.mainloop()
+        self.path_cache.save()
+
+def export_images(character, output_dir, size, data_path="hanja_strokes.json"):
+    """Tk 없이 획순 이미지를 PNG 로 저장 (character 가 없으면 모든 한자)"""
+    from headless_renderer import HeadlessRenderer, render_to_files
+    
+    hanja_data = HanjaDrawer.load_hanja_data(data_path)
+    if character is not None and character not in hanja_data:
+        print(f"Error: '{character}' 한자에 대한 데이터가 없습니다.")
+        sys.exit(1)
+    
+    renderer = HeadlessRenderer(size=size)
+    for char in [character] if character else hanja_data:
+        for path in render_to_files(renderer, char, hanja_data[char]["strokes"], output_dir):
+            print(f"저장: {path}")
+
+def run_cli(args):
+    """명령줄 인자대로 내보내기 또는 창 실행"""
+    if args.output:
+        export_images(args.character, args.output, args.width, args.data)
+        return
+    
+    # 인자를 모두 확인한 뒤에 데이터를 읽고 창을 만든다
+    hanja_data = HanjaDrawer.load_hanja_data(args.data)
+    if args.character and args.character not in hanja_data:
+        print(f"Error: '{args.character}' 한자에 대한 데이터가 없습니다.")
+        from hanja_search import suggest
+        found = suggest(args.character, hanja_data)
+        if found:
+            print(f"'{args.character}' 로 찾은 한자: {', '.join(found)}")
+        sys.exit(1)
+    
+    path_cache = PathCache(cache_file=args.cache_file) if args.cache_file else None
+    drawer = HanjaDrawer(width=args.width, height=args.height, scale=args.scale,
+                         path_cache=path_cache, pressure_bands=args.bands,
+                         animate=not args.nodelay, stroke_duration=args.stroke_time,
+                         brush=args.brush, hanja_data=hanja_data, practice=args.practice,
+                         simplify=args.simplify)
+    drawer.run(args.character)
 
 def main():
     parser = argparse.ArgumentParser(description="한자 획순 시각화 (SVG 패스 적용)")
@@ -243,11 +538,27 @@ def main():
     parser.add_argument("--height", type=int, default=500, help="화면 높이")
     parser.add_argument("--scale", type=float, default=3.0, help="획 크기 배율")
     parser.add_argument("--nodelay", action="store_true", help="획 에니메이션 없음")
+    parser.add_argument("--stroke-time", type=float, default=1.0, help="획 하나를 그리는 시간 (초)")
+    parser.add_argument("--brush", choices=["bands", "outline"], default="bands",
+                        help="붓 표현 (bands: 굵기 구간별 선, outline: 채운 외곽선 다각형)")
+    parser.add_argument("--bands", type=int, default=4, help="획 시작/끝의 굵기 구간 수 (0: 균일한 굵기)")
+    parser.add_argument("--cache-file", help="경로 캐시 파일 (.npz, 재시작 시 재사용)")
+    parser.add_argument("--simplify", type=float, metavar="TOLERANCE",
+                        help="bands 붓의 선 좌표를 캔버스에 넘기기 전에 단순화 "
+                             "(RDP 허용 오차, 0~100 좌표 기준, 예: 0.2). 굵기 구간과 애니메이션은 그대로")
+    parser.add_argument("--practice", "-p", action="store_true",
+                        help="연습 모드 (마우스로 따라 그린 획을 채점)")
+    parser.add_argument("--output", "-o", help="창을 띄우지 않고 이 디렉터리에 획순 PNG 저장")
+    parser.add_argument("--data", "-d", default="hanja_strokes.json",
+                        help="한자 데이터 파일 (.json 또는 .hjsp 팩, 디렉터리를 주면 그 아래 데이터 전체를 색인해서 사용)")
+    instrumentation.add_profile_argument(parser)
     
     args = parser.parse_args()
-    
-    drawer = HanjaDrawer(width=args.width, height=args.height, scale=args.scale)
-    drawer.run(args.character)
+    instrumentation.start(args)
+    try:
+        run_cli(args)
+    finally:
+        instrumentation.report(args)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""batch_render: 작업 프로세스가 죽어도 나머지 글자는 계속 렌더링되는지 확인"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import batch_render  # noqa: E402
+
+CRASH_CHARACTER = "火"
+
+
+def crashing_render_chunk(characters):
+    """CRASH_CHARACTER 가 든 묶음을 맡으면 작업 프로세스를 강제로 끝냄"""
+    if CRASH_CHARACTER in characters:
+        os._exit(1)
+    return batch_render._render_chunk(characters)
+
+
+def test_worker_crash_fails_only_the_crashing_character(tmp_path):
+    characters = ["永", "雨", CRASH_CHARACTER, "水", "山"]
+    results = batch_render.render_all(
+        characters, str(tmp_path), workers=2, chunk_size=2, mode="final",
+        stroke_sources=[os.path.join(ROOT, "hanja_strokes.json")],
+        renderer_options={"size": 64}, worker=crashing_render_chunk)
+
+    assert [r["character"] for r in results] == characters
+    by_character = {r["character"]: r for r in results}
+    crashed = by_character.pop(CRASH_CHARACTER)
+    assert not crashed["ok"]
+    assert "BrokenProcessPool" in crashed["error"]
+    for result in by_character.values():
+        assert result["ok"], result
+        assert all(os.path.exists(path) for path in result["files"])
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unihan 데이터에서 코드포인트별 획수/부수/한글 독음/이체자 색인
+
+data/external/unihan/extracted/ 의 Unihan_*.txt 파일을 한 줄씩 읽어 필요한
+필드만 모아 .cache/unihan_index.json 에 저장한다. 파일마다 (mtime, 크기)를
+기록해 두고, 바뀐 파일만 다시 읽는다. 조회할 때는 텍스트 파일을 읽지 않는다.
+
+    index = UnihanIndex()
+    index["永"]["kTotalStrokes"]      # 5
+    index["永"]["kRSUnicode"]         # "85.1"
+
+kTotalStrokes / kRSUnicode 는 Unihan_IRGSources.txt 에, kHangul / kKorean 은
+Unihan_Readings.txt 에 있다. 이 파일이 없으면 획수와 부수는
+kRSAdobe_Japan1_6 (부수.부수획수.나머지획수) 에서 계산한다.
+
+사용 예:
+    python unihan_index.py 永 學
+    python unihan_index.py --rebuild
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Mapping
+
+INDEX_VERSION = 1
+DEFAULT_UNIHAN_DIR = os.path.join("data", "external", "unihan", "extracted")
+DEFAULT_INDEX_FILE = os.path.join(".cache", "unihan_index.json")
+
+# 이체자 필드 → 결과의 variants 키
+VARIANT_FIELDS = {
+    "kTraditionalVariant": "traditional",
+    "kSimplifiedVariant": "simplified",
+    "kSemanticVariant": "semantic",
+    "kSpecializedSemanticVariant": "specialized_semantic",
+    "kZVariant": "z",
+    "kSpoofingVariant": "spoofing",
+}
+
+# 색인에 남길 필드 (나머지 필드는 읽으면서 버린다)
+FIELDS = {
+    "kTotalStrokes", "kRSUnicode", "kHangul", "kKorean",
+    "kRSAdobe_Japan1_6", "kAlternateTotalStrokes", "kKoreanName", "kKoreanEducationHanja",
+} | set(VARIANT_FIELDS)
+
+
+def ingest_file(path, fields=FIELDS):
+    """Unihan 텍스트 파일 하나를 한 줄씩 읽어 {"U+XXXX": {필드: 값}} 반환
+
+    파일 전체를 메모리에 올리지 않는다. 주석과 빈 줄, fields 에 없는 필드는 건너뛴다.
+    """
+    wanted = {field.encode("ascii") for field in fields}
+    entries = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.startswith(b"U+"):
+                continue
+            parts = line.rstrip(b"\r\n").split(b"\t", 2)
+            if len(parts) != 3 or parts[1] not in wanted:
+                continue
+            code, field, value = (part.decode("utf-8") for part in parts)
+            entries.setdefault(code, {})[field] = value
+    return entries
+
+
+def _parse_codepoints(value):
+    """"U+4E18 U+4E94<kMatthews" → ["丘", "五"] (출처 표시는 버림)"""
+    result = []
+    for item in value.split():
+        code = item.split("<", 1)[0]
+        if code.startswith("U+"):
+            result.append(chr(int(code[2:], 16)))
+    return result
+
+
+def _first_int(value):
+    """"12 13" 이나 "3:J" 처럼 여러 값이 있으면 첫 번째 정수"""
+    head = value.split()[0].split(":", 1)[0]
+    return int(head) if head.isdigit() else None
+
+
+def _adobe_radical_strokes(value):
+    """kRSAdobe_Japan1_6 "C+1260+85.4.1" → (부수 번호, 총 획수)
+
+    C(같은 자형) 항목을 우선하고, 없으면 첫 번째 항목을 쓴다.
+    """
+    items = value.split()
+    items.sort(key=lambda item: not item.startswith("C+"))
+    try:
+        radical, radical_strokes, residual = items[0].rsplit("+", 1)[1].split(".")
+        return int(radical), int(radical_strokes) + int(residual), int(residual)
+    except (IndexError, ValueError):
+        return None
+
+
+def build_properties(raw):
+    """원본 필드 {필드: 값} → 조회 결과
+
+    kTotalStrokes (정수), kRSUnicode ("부수.나머지획수"), kHangul, kKorean (목록),
+    variants ({종류: [한자, ...]}), 그리고 있으면 kKoreanEducationHanja, kKoreanName.
+    """
+    props = {}
+    if "kTotalStrokes" in raw:
+        props["kTotalStrokes"] = _first_int(raw["kTotalStrokes"])
+    if "kRSUnicode" in raw:
+        props["kRSUnicode"] = raw["kRSUnicode"].split()[0]
+
+    adobe = _adobe_radical_strokes(raw["kRSAdobe_Japan1_6"]) if "kRSAdobe_Japan1_6" in raw else None
+    if adobe:
+        radical, total, residual = adobe
+        props.setdefault("kTotalStrokes", total)
+        props.setdefault("kRSUnicode", f"{radical}.{residual}")
+    if props.get("kTotalStrokes") is None and "kAlternateTotalStrokes" in raw:
+        props["kTotalStrokes"] = _first_int(raw["kAlternateTotalStrokes"])
+
+    # kHangul 은 "영:0E" 처럼 출처가 붙는다
+    if "kHangul" in raw:
+        props["kHangul"] = [item.split(":", 1)[0] for item in raw["kHangul"].split()]
+    if "kKorean" in raw:
+        props["kKorean"] = raw["kKorean"].split()
+    for field in ("kKoreanEducationHanja", "kKoreanName"):
+        if field in raw:
+            props[field] = raw[field]
+
+    variants = {}
+    for field, name in VARIANT_FIELDS.items():
+        if field in raw:
+            variants[name] = _parse_codepoints(raw[field])
+    props["variants"] = variants
+    return props
+
+
+class UnihanIndex(Mapping):
+    """한자 → Unihan 속성 매핑 (build_properties 형식)
+
+    처음 접근할 때 색인 파일을 읽고, 원본 파일이 바뀌었으면 그 파일만 다시 읽는다.
+    """
+
+    def __init__(self, directory=DEFAULT_UNIHAN_DIR, index_file=DEFAULT_INDEX_FILE, fields=FIELDS):
+        self.directory = directory
+        self.index_file = index_file
+        self.fields = set(fields)
+        self._raw = None
+        self._properties = {}
+
+    def _source_files(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory)
+                      if name.startswith("Unihan_") and name.endswith(".txt"))
+
+    def _load_cached(self):
+        if not self.index_file or not os.path.exists(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != INDEX_VERSION or data.get("fields") != sorted(self.fields):
+            return {}
+        return data.get("sources", {})
+
+    def _save(self, sources):
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "fields": sorted(self.fields), "sources": sources},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_file, self.index_file)
+
+    def refresh(self, force=False):
+        """바뀐 원본 파일만 다시 읽어 색인을 갱신하고, 다시 읽은 파일 이름 목록을 반환"""
+        cached = {} if force else self._load_cached()
+        sources = {}
+        rebuilt = []
+        for name in self._source_files():
+            st = os.stat(os.path.join(self.directory, name))
+            stamp = [st.st_mtime_ns, st.st_size]
+            entry = cached.get(name)
+            if not entry or entry.get("stamp") != stamp:
+                entry = {"stamp": stamp,
+                         "entries": ingest_file(os.path.join(self.directory, name), self.fields)}
+                rebuilt.append(name)
+            sources[name] = entry
+
+        # 파일이 없어졌을 때도 색인을 다시 쓴다
+        if self.index_file and (rebuilt or set(cached) != set(sources)):
+            self._save(sources)
+
+        raw = {}
+        for name in sorted(sources):
+            for code, values in sources[name]["entries"].items():
+                raw.setdefault(chr(int(code[2:], 16)), {}).update(values)
+        self._raw = raw
+        self._properties = {}
+        return rebuilt
+
+    @property
+    def raw(self):
+        """한자 → 원본 Unihan 필드 {필드: 값}"""
+        if self._raw is None:
+            self.refresh()
+        return self._raw
+
+    def __getitem__(self, character):
+        props = self._properties.get(character)
+        if props is None:
+            props = self._properties[character] = build_properties(self.raw[character])
+        return props
+
+    def __contains__(self, character):
+        return character in self.raw
+
+    def __iter__(self):
+        return iter(sorted(self.raw, key=ord))
+
+    def __len__(self):
+        return len(self.raw)
+
+    def total_strokes(self, character):
+        """총 획수 (모르면 None)"""
+        return self[character].get("kTotalStrokes") if character in self else None
+
+    def radical(self, character):
+        """강희 부수 번호 (모르면 None)"""
+        if character not in self or "kRSUnicode" not in self[character]:
+            return None
+        return int(self[character]["kRSUnicode"].split(".", 1)[0].rstrip("'"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unihan 속성 색인 만들기 / 조회")
+    parser.add_argument("characters", nargs="*", help="조회할 한자들")
+    parser.add_argument("--unihan-dir", default=DEFAULT_UNIHAN_DIR, help="Unihan_*.txt 디렉터리")
+    parser.add_argument("--index", default=DEFAULT_INDEX_FILE, help="색인 파일")
+    parser.add_argument("--rebuild", action="store_true", help="모든 파일을 다시 읽기")
+    args = parser.parse_args()
+
+    index = UnihanIndex(args.unihan_dir, args.index)
+    rebuilt = index.refresh(force=args.rebuild)
+    if rebuilt:
+        print(f"색인 갱신: {', '.join(rebuilt)} ({len(index)}자)", file=sys.stderr)
+
+    for char in "".join(args.characters):
+        if char not in index:
+            print(f"{char}\t(Unihan 데이터 없음)")
+            continue
+        print(f"{char}\tU+{ord(char):04X}\t{json.dumps(index[char], ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()